@@ -2,7 +2,27 @@
 """
 Bee simulation entry point
 """
-from simulation.main import main
+import sys
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if "--colonies" in sys.argv:
+        # Competing colonies, one worker process each
+        from simulation.colonies import main
+    elif "--ensemble" in sys.argv:
+        # Many colonies stepped together on one layout
+        from simulation.ensemble import main
+    elif "--sweep" in sys.argv:
+        # Many headless runs in parallel
+        from simulation.sweep import main
+    elif "--watch" in sys.argv:
+        # Follow a simulation started with --stream
+        from simulation.streaming import main
+    elif "--view" in sys.argv:
+        # Follow a simulation started with --share
+        from simulation.viewer import main
+    elif "--headless" in sys.argv:
+        # Avoid importing the Qt GUI for headless runs
+        from simulation.headless import main
+    else:
+        from simulation.main import main
+    main()
@@ -27,6 +27,8 @@ class CircleMarker:
         
     def move(self, new_x, new_y):
         """Moves the circle marker to a new position."""
+        if new_x == self.x and new_y == self.y:
+            return  # Unchanged: leave the circle clean so it is not redrawn
         self.x = new_x
         self.y = new_y
         if self.circle:
@@ -1,17 +1,17 @@
-import random
 import matplotlib.pyplot as plt
 import math
 import os
+from utils.rng import get_stream
 
 
 class QueenBeeDot:
     def __init__(self, position_x=None, position_y=None):
-        self.position_x = position_x if position_x is not None else random.uniform(0, 15)
-        self.position_y = position_y if position_y is not None else random.uniform(0, 15)
+        self.position_x = position_x if position_x is not None else get_stream("hive").uniform(0, 15)
+        self.position_y = position_y if position_y is not None else get_stream("hive").uniform(0, 15)
 
     def move_randomly(self, max_delta=0.2):
-        delta_x = random.uniform(-max_delta, max_delta)
-        delta_y = random.uniform(-max_delta, max_delta)
+        delta_x = get_stream("hive").uniform(-max_delta, max_delta)
+        delta_y = get_stream("hive").uniform(-max_delta, max_delta)
         self.position_x += delta_x
         self.position_y += delta_y
         self.position_x = max(0, min(self.position_x, 15))
@@ -26,8 +26,8 @@ class QueenBeeDot:
 
 class DroneDot:
     def __init__(self, position_x=None, position_y=None):
-        self.position_x = position_x if position_x is not None else random.uniform(0, 15)
-        self.position_y = position_y if position_y is not None else random.uniform(0, 15)
+        self.position_x = position_x if position_x is not None else get_stream("hive").uniform(0, 15)
+        self.position_y = position_y if position_y is not None else get_stream("hive").uniform(0, 15)
         self.queen_reference = None
         self.target_distance = 5.0
         self.state = "approaching"
@@ -69,8 +69,8 @@ class DroneDot:
             self.state = "waiting"
 
     def move_randomly(self, max_delta=0.3):
-        delta_x = random.uniform(-max_delta, max_delta)
-        delta_y = random.uniform(-max_delta, max_delta)
+        delta_x = get_stream("hive").uniform(-max_delta, max_delta)
+        delta_y = get_stream("hive").uniform(-max_delta, max_delta)
         self.position_x += delta_x
         self.position_y += delta_y
         self.position_x = max(0, min(self.position_x, 15))
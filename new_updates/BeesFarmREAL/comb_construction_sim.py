@@ -4,15 +4,16 @@ matplotlib.use('Qt5Agg')  # Set backend
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
-import random
 import time
 import argparse
 from matplotlib.gridspec import GridSpec
 
 # Import the construction phase functions
 from construction.construction_phase import initialize_comb_construction, update_comb_construction
-from comb.Classhive import CircleMarker, hexagon
+from comb.Classhive import CircleMarker
 from utils.constants import HEX_SIZE, COLS, ROWS, OFFSET_X, OFFSET_Y
+from utils.rng import seed_all, get_stream
+from simulation.simulation_config import SEED
 
 # Default construction simulation constants
 FPS = 30  # Frames per second for animation
@@ -57,6 +58,7 @@ def create_construction_view(fig, num_worker_bees):
 def generate_worker_positions(construction_progress):
     """Generate realistic worker positions inside the honeycomb"""
     global bee_targets
+    rng = get_stream("construction")
     
     # Get the number of worker bees from the construction progress
     num_worker_bees = construction_progress.get('num_worker_bees', DEFAULT_WORKER_BEES)
@@ -86,21 +88,21 @@ def generate_worker_positions(construction_progress):
                     y += OFFSET_Y / 2
                 
                 # Add slight random offset within the cell
-                x += random.uniform(-0.05, 0.05)
-                y += random.uniform(-0.05, 0.05)
+                x += rng.uniform(-0.05, 0.05)
+                y += rng.uniform(-0.05, 0.05)
                 
                 bee_targets[i] = (x, y)
-            elif bee_targets[i] is None or random.random() < 0.05:
+            elif bee_targets[i] is None or rng.random() < 0.05:
                 # Random position for other bees
-                x = random.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
-                y = random.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
+                x = rng.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
+                y = rng.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
                 bee_targets[i] = (x, y)
     else:
         # Random positions if no build order available
         for i in range(num_worker_bees):
-            if bee_targets[i] is None or random.random() < 0.05:
-                x = random.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
-                y = random.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
+            if bee_targets[i] is None or rng.random() < 0.05:
+                x = rng.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
+                y = rng.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
                 bee_targets[i] = (x, y)
     
     # Generate current positions based on targets and gradual movement
@@ -126,8 +128,8 @@ def generate_worker_positions(construction_progress):
             worker_positions.append(bee_targets[i])
         else:
             # Random position if no target
-            x = random.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
-            y = random.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
+            x = rng.uniform(OFFSET_X, (COLS-1) * OFFSET_X)
+            y = rng.uniform(OFFSET_Y, (ROWS-1) * OFFSET_Y)
             worker_positions.append((x, y))
     
     return worker_positions
@@ -187,6 +189,7 @@ def main():
                         help=f"Number of construction worker bees (default: {DEFAULT_WORKER_BEES})")
     parser.add_argument("-s", "--speed", type=int, default=CONSTRUCTION_SPEED,
                         help=f"Construction speed in cells per update (default: {CONSTRUCTION_SPEED})")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed for a reproducible run")
     args = parser.parse_args()
     
     # Validate arguments
@@ -204,6 +207,8 @@ def main():
     print("Starting Honeycomb Construction Mini-Simulation")
     print(f"Construction worker bees: {args.workers}")
     print(f"Construction speed: {CONSTRUCTION_SPEED} cells/update")
+    rng_service = seed_all(args.seed)
+    print(f"🎲 Random seed: {rng_service.entropy}")
     
     # Create figure
     fig = plt.figure(figsize=(10, 8))
@@ -215,10 +220,8 @@ def main():
     # Create list of artists to animate
     all_artists = []
     
-    # Add all hexagon patches to artists
-    for row in hexagon_grid:
-        for hex_patch in row:
-            all_artists.append(hex_patch)
+    # Add the honeycomb collection to artists
+    all_artists.append(hexagon_grid.collection)
     
     # Add status text to artists
     all_artists.append(status_text)
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import time
 from construction.construction_phase import update_comb_construction
 from utils.constants import COLS, ROWS
+from utils.rng import get_stream
 
 def run_construction_animation(fig, hexagon_grid, circle_markers, num_worker_bees, max_frames=500, construction_speed=0.2):
     """
@@ -76,8 +77,8 @@ def run_construction_animation(fig, hexagon_grid, circle_markers, num_worker_bee
     worker_bee_positions = []
     for i in range(num_worker_bees):
         # Position bees around the center with some randomness
-        x = center_col + np.random.uniform(-2, 2)
-        y = center_row + np.random.uniform(-2, 2)
+        x = center_col + get_stream("construction").uniform(-2, 2)
+        y = center_row + get_stream("construction").uniform(-2, 2)
         worker_bee_positions.append((x, y))
         
         # Show the worker markers
@@ -111,8 +112,8 @@ def run_construction_animation(fig, hexagon_grid, circle_markers, num_worker_bee
                 x, y = worker_bee_positions[i]
                 
                 # Add randomness to worker movement
-                rand_x = np.random.uniform(-0.5, 0.5)
-                rand_y = np.random.uniform(-0.5, 0.5)
+                rand_x = get_stream("construction").uniform(-0.5, 0.5)
+                rand_y = get_stream("construction").uniform(-0.5, 0.5)
                 
                 # Calculate direction to target
                 dx = (target_col + rand_x) - x
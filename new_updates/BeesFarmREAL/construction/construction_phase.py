@@ -1,8 +1,8 @@
 import numpy as np
-import random
 import matplotlib.pyplot as plt
-from comb.Classhive import CircleMarker, hexagon
+from comb.Classhive import CircleMarker
 from utils.constants import HEX_SIZE, COLS, ROWS, OFFSET_X, OFFSET_Y
+from visualization.honeycomb import HoneycombGrid
 
 # Construction phase global variables - default values
 CONSTRUCTION_SPEED = 0.1  # Default number of cells to build per update (slower for better visualization)
@@ -17,27 +17,11 @@ def initialize_comb_construction(ax, max_x, max_y):
     - max_y: Maximum y-coordinate
     
     Returns:
-    - hexagon_grid: Grid of hexagon patches
+    - hexagon_grid: HoneycombGrid of the comb cells
     - construction_progress: Dictionary with construction status information
     """
-    # Create the honeycomb grid
-    hexagon_grid = []
-    for row in range(ROWS):
-        row_hexagons = []
-        for col in range(COLS):
-            x = col * OFFSET_X
-            y = row * OFFSET_Y
-            
-            # Stagger odd columns
-            if col % 2 == 1:
-                y += OFFSET_Y / 2
-                
-            x_hexagon, y_hexagon = hexagon(x, y, HEX_SIZE)
-            # Very transparent initial state for unbuilt cells
-            patch = ax.fill(x_hexagon, y_hexagon, edgecolor="black", 
-                          facecolor=(0.9, 0.9, 0.9, 0.2), lw=1)[0]
-            row_hexagons.append(patch)
-        hexagon_grid.append(row_hexagons)
+    # Create the honeycomb grid, very transparent for unbuilt cells
+    hexagon_grid = HoneycombGrid(ax, facecolor=(0.9, 0.9, 0.9, 0.2))
     
     # Create a build order starting from the center and spiraling outward
     center_row = ROWS // 2
@@ -95,7 +79,7 @@ def update_comb_construction(hexagon_grid, construction_progress, worker_positio
     Update the honeycomb construction progress based on worker bee positions.
     
     Parameters:
-    - hexagon_grid: Grid of hexagon patches
+    - hexagon_grid: HoneycombGrid of the comb cells
     - construction_progress: Dictionary with construction status
     - worker_positions: List of worker bee positions (x, y)
     
@@ -0,0 +1,274 @@
+import math
+import numpy as np
+from movement.obstacle_field import ObstacleField
+
+# World units per side of a chunk
+CHUNK_SIZE = 16
+# Terrain value of every cell nobody has changed (the old dense grid was all 5s)
+DEFAULT_TERRAIN = 5
+# Obstacles further than this from a chunk are left out of its distance tile
+OBSTACLE_REACH = 2.0
+
+
+def _chunk_range(x0, y0, x1, y1, size):
+    """Keys of every chunk overlapping the rectangle (x0, y0)-(x1, y1)"""
+    cx0, cy0 = int(math.floor(x0 / size)), int(math.floor(y0 / size))
+    cx1, cy1 = int(math.floor(x1 / size)), int(math.floor(y1 / size))
+    return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+
+def _obstacle_box(obstacle):
+    """Bounding box (x0, y0, x1, y1) of a ("rectangle", position, size) or ("circle", center, radius)"""
+    kind, a, b = obstacle
+    if kind == "rectangle":
+        return (a[0], a[1], a[0] + b[0], a[1] + b[1])
+    return (a[0] - b, a[1] - b, a[0] + b, a[1] + b)
+
+
+class Chunk:
+    """
+    One fixed-size tile of the world.
+
+    Terrain is stored sparsely: only cells whose value differs from
+    DEFAULT_TERRAIN are kept. flowers and obstacles hold the features that
+    overlap the chunk (obstacles including those within OBSTACLE_REACH), so
+    queries never look at the rest of the world.
+    """
+
+    def __init__(self, key, size):
+        self.key = key
+        self.size = size
+        self.origin = (key[0] * size, key[1] * size)
+        self.terrain = {}    # (cell_x, cell_y) -> value, world cell coordinates
+        self.flowers = []    # (id, area dict)
+        self.obstacles = []  # (id, obstacle)
+
+    @property
+    def bounds(self):
+        x, y = self.origin
+        return (x, y, x + self.size, y + self.size)
+
+
+class ChunkedWorld:
+    """
+    Unbounded world made of chunks created on first access.
+
+    Features (flower areas, obstacles) are registered once and filed under
+    every chunk they overlap; chunks that do not exist yet get them when they
+    are created, so registering a feature never allocates empty chunks. An
+    optional generator(world, chunk) fills new chunks procedurally. Memory
+    grows with the chunks that are actually touched, not with the size of
+    the world.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, default_terrain=DEFAULT_TERRAIN, generator=None):
+        self.chunk_size = chunk_size
+        self.default_terrain = default_terrain
+        self.generator = generator
+        self.chunks = {}    # key -> Chunk
+        self._pending = {}  # key -> [("flowers" | "obstacles", (id, feature))] for chunks not created yet
+        self._next_id = 0
+        self.version = 0    # Bumped whenever obstacles change
+        self._obstacle_fields = {}  # resolution -> ChunkedObstacleField of the current version
+
+    def __len__(self):
+        return len(self.chunks)
+
+    # --- Chunks ------------------------------------------------------------------
+
+    def key_of(self, x, y):
+        return (int(math.floor(x / self.chunk_size)), int(math.floor(y / self.chunk_size)))
+
+    def chunk(self, key):
+        """The chunk with this key, created (and generated) on first access"""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = Chunk(key, self.chunk_size)
+            self.chunks[key] = chunk
+            for kind, item in self._pending.pop(key, ()):
+                getattr(chunk, kind).append(item)
+            if self.generator is not None:
+                self.generator(self, chunk)
+        return chunk
+
+    def chunk_at(self, x, y):
+        return self.chunk(self.key_of(x, y))
+
+    def _file(self, kind, feature, box):
+        """Register a feature under every chunk key box overlaps"""
+        item = (self._next_id, feature)
+        self._next_id += 1
+        for key in _chunk_range(*box, self.chunk_size):
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                getattr(chunk, kind).append(item)
+            else:
+                self._pending.setdefault(key, []).append((kind, item))
+
+    # --- Terrain -----------------------------------------------------------------
+
+    def terrain_at(self, x, y):
+        cell = (int(math.floor(x)), int(math.floor(y)))
+        chunk = self.chunks.get(self.key_of(*cell))
+        if chunk is None:
+            return self.default_terrain
+        return chunk.terrain.get(cell, self.default_terrain)
+
+    def set_terrain(self, x, y, value):
+        cell = (int(math.floor(x)), int(math.floor(y)))
+        terrain = self.chunk(self.key_of(*cell)).terrain
+        if value == self.default_terrain:
+            terrain.pop(cell, None)
+        else:
+            terrain[cell] = value
+
+    def terrain_array(self, bounds):
+        """Dense terrain of the integer cells in bounds (x0, y0, x1, y1), indexed [x, y]"""
+        x0, y0, x1, y1 = (int(math.floor(v)) for v in bounds)
+        grid = np.full((x1 - x0, y1 - y0), self.default_terrain, dtype=float)
+        for key in _chunk_range(x0, y0, x1 - 1, y1 - 1, self.chunk_size):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                continue
+            for (cx, cy), value in chunk.terrain.items():
+                if x0 <= cx < x1 and y0 <= cy < y1:
+                    grid[cx - x0, cy - y0] = value
+        return grid
+
+    # --- Flowers -----------------------------------------------------------------
+
+    def add_flower_area(self, area):
+        """Register a flower area dict (position, width, height, name)"""
+        x, y = area["position"]
+        # Areas span [x, x + width); the far edge belongs to the next cell
+        box = (x, y, x + area["width"] - 1e-9, y + area["height"] - 1e-9)
+        self._file("flowers", dict(area), box)
+
+    def flower_areas_in(self, bounds):
+        """Copies of the flower areas overlapping bounds, in registration order"""
+        found = {}
+        for key in _chunk_range(*bounds, self.chunk_size):
+            for flower_id, area in self.chunk(key).flowers:
+                found[flower_id] = area
+        return [dict(found[flower_id]) for flower_id in sorted(found)]
+
+    def flower_area_at(self, x, y):
+        """The flower area containing (x, y), or None"""
+        for _, area in self.chunk_at(x, y).flowers:
+            ax, ay = area["position"]
+            if ax <= x <= ax + area["width"] and ay <= y <= ay + area["height"]:
+                return area
+        return None
+
+    # --- Obstacles ---------------------------------------------------------------
+
+    def _add_obstacle(self, obstacle):
+        x0, y0, x1, y1 = _obstacle_box(obstacle)
+        box = (x0 - OBSTACLE_REACH, y0 - OBSTACLE_REACH, x1 + OBSTACLE_REACH, y1 + OBSTACLE_REACH)
+        self._file("obstacles", obstacle, box)
+        self.version += 1
+        self._obstacle_fields.clear()
+
+    def add_rectangle(self, position, size):
+        """Register a rectangular obstacle (pond)"""
+        self._add_obstacle(("rectangle", tuple(position), tuple(size)))
+
+    def add_circle(self, center, radius):
+        """Register a circular obstacle (forbidden zone)"""
+        self._add_obstacle(("circle", tuple(center), radius))
+
+    def obstacle_field(self, resolution=0.05):
+        """
+        ChunkedObstacleField over the current obstacles. The same object is
+        returned until obstacles are added, then a fresh one.
+        """
+        field = self._obstacle_fields.get(resolution)
+        if field is None:
+            field = ChunkedObstacleField(self, resolution)
+            self._obstacle_fields[resolution] = field
+        return field
+
+
+class ChunkedObstacleField(ObstacleField):
+    """
+    ObstacleField backed by per-chunk distance tiles.
+
+    A chunk's tile is rasterized from the obstacles filed under that chunk
+    the first time a bee looks up a position in it; chunks without nearby
+    obstacles never get a tile and report a far distance. Lookups, steering
+    and is_blocked() work as on the single-raster ObstacleField.
+    """
+
+    def __init__(self, world, resolution=0.05, margin=1.0):
+        self.world = world
+        self.resolution = resolution
+        self.margin = margin
+        self.tiles = {}  # chunk key -> ObstacleField, or None for obstacle-free chunks
+        self.far = np.finfo(float).max / 4
+
+    def tile(self, key):
+        """Distance tile of a chunk, built on first use (None when it has no obstacles)"""
+        if key in self.tiles:
+            return self.tiles[key]
+        chunk = self.world.chunk(key)
+        tile = None
+        if chunk.obstacles:
+            rectangles = [(a, b) for _, (kind, a, b) in chunk.obstacles if kind == "rectangle"]
+            circles = [(a, b) for _, (kind, a, b) in chunk.obstacles if kind == "circle"]
+            tile = ObstacleField(rectangles, circles, bounds=chunk.bounds,
+                                 resolution=self.resolution, margin=self.margin)
+        self.tiles[key] = tile
+        return tile
+
+    def _sample_scalar(self, x, y):
+        tile = self.tile(self.world.key_of(x, y))
+        if tile is None:
+            return self.far, 0.0, 0.0
+        return tile._sample_scalar(x, y)
+
+    def _sample_many(self, x, y, grids):
+        """Look up arrays of points tile by tile; grids picks (sdf, grad_x, grad_y) by index"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        x, y = np.broadcast_arrays(x, y)
+        size = self.world.chunk_size
+        kx = np.floor(x / size).astype(np.int64).ravel()
+        ky = np.floor(y / size).astype(np.int64).ravel()
+        results = [np.zeros(x.size) for _ in grids]
+        if 0 in grids:
+            results[grids.index(0)][:] = self.far
+        if x.size == 0:
+            return [result.reshape(x.shape) for result in results]
+
+        # One integer per chunk, so the points are grouped by a 1-D sort (or
+        # not at all when they share a chunk, as a colony usually does)
+        x0, y0 = int(kx.min()), int(ky.min())
+        span = int(ky.max()) - y0 + 1
+        keys = (kx - x0) * span + (ky - y0)
+        if keys.max() == 0:
+            chunks, inverse = [0], None
+        else:
+            chunks, inverse = np.unique(keys, return_inverse=True)
+            chunks = chunks.tolist()
+        for k, key in enumerate(chunks):
+            tile = self.tile((x0 + key // span, y0 + key % span))
+            if tile is None:
+                continue
+            rows = slice(None) if inverse is None else inverse == k
+            tile_grids = [(tile.sdf, tile.grad_x, tile.grad_y)[g] for g in grids]
+            for result, value in zip(results, tile._bilinear(tile_grids, x.ravel()[rows], y.ravel()[rows])):
+                result[rows] = value
+        return [result.reshape(x.shape) for result in results]
+
+    def distance(self, x, y):
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return self._sample_scalar(float(x), float(y))[0]
+        return self._sample_many(x, y, [0])[0]
+
+    def gradient(self, x, y):
+        return tuple(self._sample_many(x, y, [1, 2]))
+
+    def sample(self, x, y):
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return self._sample_scalar(float(x), float(y))
+        return tuple(self._sample_many(x, y, [0, 1, 2]))
@@ -1,5 +1,3 @@
-import random
-
 class CircleDot:
     def __init__(self, position):
         self.position = list(position)
@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-
 class Spawn:
     def __init__(self, position=(1, 4), height=10, width=9):
         self.position = position
@@ -17,6 +15,7 @@ class House:
         self.width = width
 
     def get_square_patch(self):
+        import matplotlib.pyplot as plt
         x, y = self.pos
         return plt.Rectangle((x, y), self.width, self.height, color='Blue')
 
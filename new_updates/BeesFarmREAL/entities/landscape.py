@@ -1,32 +1,91 @@
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 from entities.object_manager import ObjectManager
 from entities.environment import Spawn, House, Fence, Tree
+from entities.chunks import ChunkedWorld
+from movement.arrays import movement_arrays, silver_positions
+from movement.navigation import NavigationFields
+from utils.constants import FLOWER_AREAS
+
+# Circle-based forbidden (pesticide) zone
+FORBIDDEN_ZONE_CENTER = (5.5, 8.5)
+FORBIDDEN_ZONE_RADIUS = 1.5
+
+# Drawn radii of the dots, in landscape units
+BEE_RADIUS = 0.1
+NECTAR_RADIUS = 0.2
+POLLEN_RADIUS = 0.12
+
+
+def _xy(dots):
+    """x and y coordinate arrays of a list of dots, for scatter()"""
+    positions = np.array([dot.position for dot in dots], dtype=float).reshape(-1, 2)
+    return positions[:, 0], positions[:, 1]
+
 
 class Landscape:
-    def __init__(self, block_size=15, max_gold_collected=5, num_houses=1):
+    def __init__(self, block_size=15, max_gold_collected=5, num_houses=1, world=None):
+        # block_size is the colony area that is drawn and navigated; the world
+        # around it is chunked and only costs memory where it is used
         self.block_size = block_size
-        self.grid = np.ones((block_size, block_size)) * 5
+        if world is None:
+            world = ChunkedWorld()
+            for area in FLOWER_AREAS:
+                world.add_flower_area(area)
+            world.add_circle(FORBIDDEN_ZONE_CENTER, FORBIDDEN_ZONE_RADIUS)
+        self.world = world
         self.max_gold_collected = max_gold_collected
         self.spawn = Spawn(position=(1, 4), height=10, width=9)
 
         # Initialize the objects
-        self.objects = ObjectManager(block_size, self.spawn)
+        self.objects = ObjectManager(block_size, self.spawn, world=self.world)
 
         self.movement = None
         self.house = [House(pos=(0.5 + 2*i, 0.5), height=1, width=1) for i in range(num_houses)]
         self.fence_1 = Fence((11.5, 4.5), (11.5, 15.5), (11.5, 4.5), (15.5, 4.5))
         self.fence_2 = Fence((8.5, 2.5), (8.5, 0), (8.5, 2.5), (0, 2.5))
         self.tree_area = Tree(position=(12, 11), width=3, height=4)
+        self.obstacle_field = None
+        self.navigation = None
+
+    @property
+    def grid(self):
+        """Dense terrain of the colony area, read from the world chunks"""
+        return self.world.terrain_array((0, 0, self.block_size, self.block_size))
 
     def is_inside_forbidden_zone(self, x, y):
         # Circle-based forbidden zone check
-        forbidden_center_x, forbidden_center_y = 5.5, 8.5
-        forbidden_radius = 1.5
+        forbidden_center_x, forbidden_center_y = FORBIDDEN_ZONE_CENTER
+        forbidden_radius = FORBIDDEN_ZONE_RADIUS
         distance_from_center = np.hypot(x - forbidden_center_x, y - forbidden_center_y)
         return distance_from_center <= forbidden_radius
 
+    def build_obstacle_field(self, resolution=0.05):
+        """
+        Signed-distance field of the pond and forbidden zone, rasterized per
+        world chunk on first use. Call again if obstacles change.
+        """
+        self.obstacle_field = self.world.obstacle_field(resolution)
+        # Cached flow fields are only invalidated when the obstacles change
+        if self.navigation is not None:
+            self.navigation.set_obstacle_field(self.obstacle_field)
+        return self.obstacle_field
+
+    def build_navigation(self, resolution=0.25):
+        """
+        Create the shared flow fields bees use to fly around the obstacles.
+        Requires the obstacle field; flower area fields are computed up front.
+        """
+        if self.obstacle_field is None:
+            self.build_obstacle_field()
+        self.navigation = NavigationFields(
+            self.obstacle_field,
+            bounds=(0, 0, self.block_size, self.block_size),
+            resolution=resolution,
+            areas=self.objects.flower_areas()
+        )
+        self.navigation.warm_up()
+        return self.navigation
+
     def is_in_excluded_spawn_area(self, x, y):
         excluded_areas = [
             (range(1, 4), range(7, 10)),
@@ -37,7 +96,16 @@ class Landscape:
         ]
         return any(x in xr and y in yr for xr, yr in excluded_areas)
 
-    def display(self, fig=None, subplot_spec=None, title=None):
+    def display(self, fig=None, subplot_spec=None, title=None, snapshots=None):
+        """
+        Draw the landscape. With snapshots (a SnapshotBuffer) the bees and
+        nectar follow the latest published snapshot instead of reading the
+        live objects, so the engine can run on another thread.
+        """
+        # Imported here so headless runs never load matplotlib
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+
         if fig is None and subplot_spec is None:
             fig, ax = plt.subplots(figsize=(8, 8))
         else:
@@ -72,29 +140,29 @@ class Landscape:
             ax.add_patch(plt.Rectangle((px, py), pw, ph, color='cornflowerblue', label="Pond"))
 
         # Forbidden zone as a circle
-        forbidden_circle = plt.Circle((5.5, 8.5), 1.5, color='lightgreen', label='Pesticide Zone')
+        forbidden_circle = plt.Circle(FORBIDDEN_ZONE_CENTER, FORBIDDEN_ZONE_RADIUS, color='lightgreen', label='Pesticide Zone')
         ax.add_patch(forbidden_circle)
 
-        # Create red dots (worker bees)
-        red_circles = []
-        for i, red_dot in enumerate(self.objects.red_dots):
-            label = "Worker Bee" if i == 0 else "_nolegend_"
-            red_circle = plt.Circle(red_dot.position, radius=0.1, color='red', label=label)
-            ax.add_patch(red_circle)
-            red_circles.append(red_circle)
-
-        # Fix silver dots - only add label to the first one
-        for i, silver_dot in enumerate(self.objects.silver_dots):
-            label = "Pollen" if i == 0 else "_nolegend_"
-            ax.plot(silver_dot.position[0], silver_dot.position[1], 'o', color='silver', markersize=5, label=label)
-
-        gold_circles = []
-        for i, gold_dot in enumerate(self.objects.gold_dots):
-            x, y = gold_dot.position
-            label = "Nectar" if i == 0 else "_nolegend_"
-            circle = plt.Circle((x, y), radius=0.2, color='gold', label=label)
-            ax.add_patch(circle)
-            gold_circles.append(circle)
+        # One scatter collection per kind of dot: a frame updates a few offset
+        # arrays instead of a patch per bee, whatever the number of bees
+        red_collection = ax.scatter(*_xy(self.objects.red_dots), color='red', linewidths=0, label="Worker Bee", zorder=3)
+        silver_collection = ax.scatter(*_xy(self.objects.silver_dots), color='silver', linewidths=0, label="Pollen", zorder=2)
+        gold_collection = ax.scatter(*_xy(self.objects.gold_dots), color='gold', linewidths=0, label="Nectar", zorder=2)
+        # Radii in data units, as the circle patches had
+        marker_radii = ((red_collection, BEE_RADIUS), (silver_collection, POLLEN_RADIUS),
+                        (gold_collection, NECTAR_RADIUS))
+        marker_scale = [None]
+
+        def scale_markers():
+            # Scatter sizes are in points, so they follow the axes' size on screen
+            scale = ax.transData.transform((1, 0))[0] - ax.transData.transform((0, 0))[0]
+            if scale != marker_scale[0]:
+                marker_scale[0] = scale
+                points_per_unit = scale * 72.0 / fig.dpi
+                for collection, radius in marker_radii:
+                    collection.set_sizes([(2 * radius * points_per_unit) ** 2])
+
+        scale_markers()
 
         for i, house in enumerate(self.house):
             square = house.get_square_patch()
@@ -107,27 +175,31 @@ class Landscape:
 
         gold_text = ax.text(0.02, 0.95, f'Nectar Collected: 0/{self.max_gold_collected}', transform=ax.transAxes)
 
+        artists = (red_collection, silver_collection, gold_collection, gold_text)
+
         def update(frame):
-            if self.movement and self.movement.completed:
+            if snapshots is not None:
+                snapshot = snapshots.peek()
+                if snapshot is None or snapshot.complete:
+                    return artists
+                positions, nectar, silver = snapshot.positions, snapshot.nectar, snapshot.silver
+                gold_collected = snapshot.gold_collected
+            elif self.movement and not self.movement.completed:
+                # The SimulationEngine advances the world; this view only redraws it
+                positions, _, _, nectar = movement_arrays(self.movement)
+                silver = silver_positions(self.movement)
+                gold_collected = self.movement.gold_collected
+            else:
                 # Don't call stop() - it can cause animation errors
                 # Just return the artists without updating
-                return *red_circles, *gold_circles, gold_text
-
-            if self.movement:
-                self.movement.update_state()
-                
-                # Update all red dot positions
-                for i, red_dot in enumerate(self.objects.red_dots):
-                    if i < len(red_circles):
-                        red_circles[i].center = red_dot.position
-                
-                # Update gold dot positions
-                for i, gold_dot in enumerate(self.objects.gold_dots):
-                    if i < len(gold_circles):
-                        gold_circles[i].center = gold_dot.position
-                
-                gold_text.set_text(f'Nectar Collected: {self.movement.gold_collected}/{self.max_gold_collected}')
-                return *red_circles, *gold_circles, gold_text
+                return artists
+
+            scale_markers()
+            red_collection.set_offsets(positions)
+            gold_collection.set_offsets(nectar)
+            silver_collection.set_offsets(silver)
+            gold_text.set_text(f'Nectar Collected: {gold_collected}/{self.max_gold_collected}')
+            return artists
 
         ani = animation.FuncAnimation(fig, update, frames=1000, blit=True, interval=200)
         # Store animation reference to prevent garbage collection
@@ -1,10 +1,14 @@
-import random
 from entities.circle_dot import CircleDot
+from entities.spawning import poisson_disk, spawn_positions
+from utils.constants import FLOWER_AREAS, SILVER_AREAS, HIVE_PRESET_POSITIONS, BEE_SPAWN_SPACING
+from utils.rng import get_stream
 
 class ObjectManager:
-    def __init__(self, block_size=15, spawn=None):
+    def __init__(self, block_size=15, spawn=None, world=None):
         self.block_size = block_size
-        self.beehive = None
+        self.world = world  # ChunkedWorld with the flower areas and obstacles
+        self.beehive = None  # The first hive
+        self.hives = []      # One hive per colony
         self.silver_dots = []
         self.red_dots = []
         self.gold_dots = []
@@ -12,23 +16,24 @@ class ObjectManager:
         self.pond = None
 
     def add_beehive(self, position=(5, 5), height=2, width=3):
-        self.beehive = {"position": position, "height": height, "width": width}
+        hive = {"position": position, "height": height, "width": width}
+        self.hives.append(hive)
+        if self.beehive is None:
+            self.beehive = hive
+        return hive
 
-    def add_red_dots(self, count=1):
-        if self.beehive:
-            hive_x, hive_y = self.beehive["position"]
-            hive_width = self.beehive["width"]
-            hive_height = self.beehive["height"]
+    def add_red_dots(self, count=1, hive=None):
+        """Add count worker bees in and around hive (the first hive by default); returns them"""
+        rng = get_stream("placement")
+        hive = hive or self.beehive
+        first_new = len(self.red_dots)
+        if hive:
+            hive_x, hive_y = hive["position"]
+            hive_width = hive["width"]
+            hive_height = hive["height"]
             
             # Expanded positioning for up to 10 bees in a larger grid pattern
-            preset_positions = [
-                # First row (4 positions)
-                (0.2, 0.2), (0.4, 0.2), (0.6, 0.2), (0.8, 0.2),
-                # Second row (3 positions)
-                (0.3, 0.5), (0.5, 0.5), (0.7, 0.5),
-                # Third row (3 positions)
-                (0.3, 0.8), (0.5, 0.8), (0.7, 0.8)
-            ]
+            preset_positions = HIVE_PRESET_POSITIONS
             
             for i in range(min(count, len(preset_positions))):
                 rel_x, rel_y = preset_positions[i]
@@ -37,61 +42,64 @@ class ObjectManager:
                 dot_y = hive_y + rel_y * hive_height
                 
                 # Add some small randomness
-                dot_x += random.uniform(-0.1, 0.1)
-                dot_y += random.uniform(-0.1, 0.1)
+                dot_x += rng.uniform(-0.1, 0.1)
+                dot_y += rng.uniform(-0.1, 0.1)
                 
                 self.red_dots.append(CircleDot((dot_x, dot_y)))
                 
-            # If more bees requested than preset positions, add them with general spacing
+            # If more bees requested than preset positions, fill the hive and its
+            # surroundings outwards with Poisson-disk spacing
             if count > len(preset_positions):
-                for i in range(len(preset_positions), count):
-                    dot_x = hive_x + random.uniform(0.2, 0.8) * hive_width
-                    dot_y = hive_y + random.uniform(0.2, 0.8) * hive_height
+                existing = [tuple(dot.position) for dot in self.red_dots]
+                positions = spawn_positions(
+                    count - len(preset_positions),
+                    center=(hive_x + hive_width / 2, hive_y + hive_height / 2),
+                    bounds=(0, 0, self.block_size, self.block_size),
+                    spacing=BEE_SPAWN_SPACING,
+                    rng=rng,
+                    is_blocked=self._is_blocked,
+                    existing=existing
+                )
+                for dot_x, dot_y in positions.tolist():
                     self.red_dots.append(CircleDot((dot_x, dot_y)))
         else:
             # If no beehive, place dots with spacing across the grid
-            existing_positions = []
             min_distance = 2.0  # Minimum distance between dots
-            
-            for _ in range(count):
-                attempts = 0
-                while attempts < 20:  # Limit attempts to prevent infinite loop
-                    dot_x = random.uniform(1, self.block_size-1)
-                    dot_y = random.uniform(1, self.block_size-1)
-                    
-                    # Check if this position is far enough from other dots
-                    if all(((x-dot_x)**2 + (y-dot_y)**2)**0.5 > min_distance 
-                          for x, y in existing_positions):
-                        existing_positions.append((dot_x, dot_y))
-                        self.red_dots.append(CircleDot((dot_x, dot_y)))
-                        break
-                    
-                    attempts += 1
-                
-                # If we couldn't find a good spot after max attempts, just place it
-                if attempts >= 20 and len(self.red_dots) < count:
-                    dot_x = random.uniform(1, self.block_size-1)
-                    dot_y = random.uniform(1, self.block_size-1)
-                    self.red_dots.append(CircleDot((dot_x, dot_y)))
+            bounds = (1, 1, self.block_size - 1, self.block_size - 1)
+            positions = poisson_disk(bounds, min_distance, rng, self._is_blocked)[:count]
+            for dot_x, dot_y in positions.tolist():
+                self.red_dots.append(CircleDot((dot_x, dot_y)))
+
+            # If the grid is full, just place the rest
+            for _ in range(count - len(positions)):
+                dot_x = rng.uniform(1, self.block_size-1)
+                dot_y = rng.uniform(1, self.block_size-1)
+                self.red_dots.append(CircleDot((dot_x, dot_y)))
+
+        return self.red_dots[first_new:]
+
+    def _is_blocked(self, x, y):
+        if self.world is not None:
+            return self.world.obstacle_field().is_blocked(x, y)
+        if self.pond is None:
+            return False
+        pond_x, pond_y = self.pond["position"]
+        return pond_x <= x <= pond_x + self.pond["width"] and pond_y <= y <= pond_y + self.pond["height"]
 
     def add_red_dot(self):
         self.add_red_dots(1)
         return self.red_dots[0]
 
     def _generate_gold_dot(self, spawn_x, spawn_y, width, height):
-        dot_x = random.randint(spawn_x, spawn_x + width - 1)
-        dot_y = random.randint(spawn_y, spawn_y + height - 1)
+        rng = get_stream("nectar")
+        dot_x = rng.randint(spawn_x, spawn_x + width - 1)
+        dot_y = rng.randint(spawn_y, spawn_y + height - 1)
         return CircleDot((dot_x + 0.5, dot_y + 0.5))
 
     def add_gold_dots(self, count=10):
+        rng = get_stream("nectar")
         # Define flower areas where nectar can spawn
-        flower_areas = [
-            {"position": (4, 7), "width": 3, "height": 3, "name": "Center Flowers"},  # Center flower area
-            {"position": (7, 4), "width": 3, "height": 3, "name": "Right Flowers"},   # Right flowers
-            {"position": (1, 4), "width": 3, "height": 3, "name": "Left Flowers"},    # Left flowers
-            {"position": (7, 11), "width": 3, "height": 3, "name": "Top Flowers"},    # Top flowers
-            {"position": (1, 11), "width": 3, "height": 3, "name": "Upper Left Flowers"}, # Upper left flowers
-        ]
+        flower_areas = self.flower_areas()
         
         # Define forbidden zone - circular area centered at (5.5, 8.5) with radius 1.5
         forbidden_center_x = 5.5
@@ -126,7 +134,7 @@ class ObjectManager:
         
         # Randomly select which flowers will have nectar
         # Shuffle the flower areas to add randomness
-        random.shuffle(flower_areas)
+        rng.shuffle(flower_areas)
         
         # Determine how many flowers will have nectar (at least 1, at most all)
         flowers_with_nectar_count = min(count, len(flower_areas))
@@ -145,8 +153,8 @@ class ObjectManager:
             max_attempts = 10
             for attempt in range(max_attempts):
                 # Generate a random position within the flower area
-                dot_x = x0 + random.randint(0, width - 1) + 0.5
-                dot_y = y0 + random.randint(0, height - 1) + 0.5
+                dot_x = x0 + rng.randint(0, width - 1) + 0.5
+                dot_y = y0 + rng.randint(0, height - 1) + 0.5
                 
                 # Check if this position is in the forbidden zone
                 if not is_in_forbidden_zone(dot_x, dot_y):
@@ -162,7 +170,7 @@ class ObjectManager:
         # Distribute remaining nectar among the selected flowers
         while dots_to_generate > 0:
             # Pick a random flower from the selected ones
-            area = random.choice(flowers_used)
+            area = rng.choice(flowers_used)
             x0, y0 = area["position"]
             width, height = area["width"], area["height"]
             
@@ -170,8 +178,8 @@ class ObjectManager:
             max_attempts = 10
             for attempt in range(max_attempts):
                 # Generate a random position within the flower area
-                dot_x = x0 + random.randint(0, width - 1) + 0.5
-                dot_y = y0 + random.randint(0, height - 1) + 0.5
+                dot_x = x0 + rng.randint(0, width - 1) + 0.5
+                dot_y = y0 + rng.randint(0, height - 1) + 0.5
                 
                 # Check if this position is in the forbidden zone
                 if not is_in_forbidden_zone(dot_x, dot_y):
@@ -213,22 +221,26 @@ class ObjectManager:
         return self.gold_dots
 
     def add_silver_dots(self):
+        rng = get_stream("placement")
         # Define the excluded spawn areas
-        excluded_areas = [
-            (range(1, 4), range(7, 10)),
-            (range(4, 7), range(10, 14)),  # Area 2
-            (range(7, 10), range(7, 10)),
-            (range(4, 7), range(4, 7)),    # Area 4
-        ]
+        excluded_areas = SILVER_AREAS
 
         # Randomly spawn 1 to 5 silver dots in each excluded area
         for area in excluded_areas:
-            num_silver_dots = random.randint(1, 5)
+            num_silver_dots = rng.randint(1, 5)
             for _ in range(num_silver_dots):
                 x_range, y_range = area
-                x = random.choice(x_range)
-                y = random.choice(y_range)
+                x = rng.choice(x_range)
+                y = rng.choice(y_range)
                 self.silver_dots.append(CircleDot((x + 0.5, y + 0.5)))
 
+    def flower_areas(self):
+        """Copies of the flower areas inside the colony grid, looked up in the world chunks"""
+        if self.world is None:
+            return [dict(area) for area in FLOWER_AREAS]
+        return self.world.flower_areas_in((0, 0, self.block_size, self.block_size))
+
     def add_pond(self, position, height, width):
-        self.pond = {"position": position, "height": height, "width": width} 
\ No newline at end of file
+        self.pond = {"position": position, "height": height, "width": width}
+        if self.world is not None:
+            self.world.add_rectangle(position, (width, height)) 
\ No newline at end of file
@@ -0,0 +1,135 @@
+import math
+import numpy as np
+
+# Candidate points tried around each active point before it is retired (Bridson's k)
+POISSON_CANDIDATES = 12
+# Points per radius^2 of area a Poisson-disk set reaches (measured about 0.83
+# with candidates on the edge of the annulus), with some margin
+POISSON_DENSITY = 0.75
+# Times the spacing is shrunk when the bounds cannot fit all requested points
+MAX_SHRINK_STEPS = 8
+
+
+def poisson_disk(bounds, radius, rng, is_blocked=None, existing=(), start=None, candidates=POISSON_CANDIDATES):
+    """
+    Poisson-disk sampling (Bridson): points inside bounds (x0, y0, x1, y1)
+    that are at least radius apart from each other and from the existing
+    points, in O(n) expected time using a background grid with one point per
+    cell. is_blocked(x, y) rejects points inside obstacles. Sampling grows
+    out from start (or the existing points, or a random point).
+    Returns the new points as an (n, 2) array, in generation order.
+    """
+    x0, y0, x1, y1 = bounds
+    cell = radius / math.sqrt(2)  # A cell can hold at most one point
+    cols = max(1, int(math.ceil((x1 - x0) / cell)))
+    rows = max(1, int(math.ceil((y1 - y0) / cell)))
+    grid = [[None] * cols for _ in range(rows)]
+    radius_sq = radius * radius
+    edge = radius * (1 + 1e-7)
+    step_angle = 2 * math.pi / candidates
+
+    def cell_of(x, y):
+        return min(int((y - y0) / cell), rows - 1), min(int((x - x0) / cell), cols - 1)
+
+    def fits(x, y):
+        if not (x0 <= x < x1 and y0 <= y < y1):
+            return False
+        if is_blocked is not None and is_blocked(x, y):
+            return False
+        row, col = cell_of(x, y)
+        for r in range(max(row - 2, 0), min(row + 3, rows)):
+            grid_row = grid[r]
+            for c in range(max(col - 2, 0), min(col + 3, cols)):
+                other = grid_row[c]
+                if other is not None and (other[0] - x) ** 2 + (other[1] - y) ** 2 < radius_sq:
+                    return False
+        return True
+
+    def add(x, y):
+        row, col = cell_of(x, y)
+        grid[row][col] = (x, y)
+        active.append((x, y))
+
+    active = []
+    for x, y in existing:
+        if x0 <= x < x1 and y0 <= y < y1:
+            add(x, y)
+
+    points = []
+    if not active:
+        if start is None:
+            start = (x0 + rng.random() * (x1 - x0), y0 + rng.random() * (y1 - y0))
+        if fits(*start):
+            add(*start)
+            points.append(start)
+        else:
+            # Start inside an obstacle: look for any free first point
+            for _ in range(candidates):
+                x, y = x0 + rng.random() * (x1 - x0), y0 + rng.random() * (y1 - y0)
+                if fits(x, y):
+                    add(x, y)
+                    points.append((x, y))
+                    break
+
+    while active:
+        # Grow from a random active point; retire it when no candidate fits
+        i = int(rng.random() * len(active))
+        px, py = active[i]
+        # Candidates evenly spread on the inner edge of the annulus from a
+        # random start angle: denser packing with fewer candidates than
+        # uniform annulus samples
+        start_angle = rng.random() * 2 * math.pi
+        for j in range(candidates):
+            angle = start_angle + step_angle * j
+            x, y = px + edge * math.cos(angle), py + edge * math.sin(angle)
+            if fits(x, y):
+                add(x, y)
+                points.append((x, y))
+                break
+        else:
+            active[i] = active[-1]
+            active.pop()
+
+    return np.array(points, dtype=float).reshape(-1, 2)
+
+
+def spawn_positions(count, center, bounds, spacing, rng, is_blocked=None, existing=()):
+    """
+    count positions at least spacing apart (and from existing), as close to
+    center as possible: Poisson-disk samples in a square around center that
+    grows until it holds enough points, keeping the closest ones. When even
+    the full bounds are too small the spacing shrinks instead.
+    Returns an (n, 2) array with n == count unless the bounds are blocked.
+    """
+    if count <= 0:
+        return np.zeros((0, 2))
+    cx, cy = center
+    bx0, by0, bx1, by1 = bounds
+
+    def region_for(half):
+        return (max(bx0, cx - half), max(by0, cy - half), min(bx1, cx + half), min(by1, cy + half))
+
+    def capacity(region):
+        return (region[2] - region[0]) * (region[3] - region[1]) * POISSON_DENSITY / (spacing * spacing)
+
+    # Smallest square around center (clipped to bounds) expected to fit the points
+    needed = count + len(existing)
+    half = spacing
+    while capacity(region_for(half)) < needed and region_for(half) != tuple(bounds):
+        half *= 1.25
+
+    for _ in range(MAX_SHRINK_STEPS):
+        region = region_for(half)
+        points = poisson_disk(region, spacing, rng, is_blocked, existing, start=center if not existing else None)
+        if len(points) >= count:
+            order = np.argsort(np.hypot(points[:, 0] - cx, points[:, 1] - cy), kind="stable")
+            return points[order[:count]]
+
+        if region == tuple(bounds):
+            # Bounds are full: pack tighter
+            spacing *= max(0.5, math.sqrt(len(points) / count) * 0.95)
+        else:
+            half *= 1.5
+
+    print(f"⚠️ WARNING: Could only place {len(points)} of {count} bees")
+    return points
@@ -0,0 +1,26 @@
+import numpy as np
+from movement.vectorized import SEEKING, RETURNING, SETTLED
+
+
+def movement_arrays(movement):
+    """Bee positions, sizes and states and the remaining nectar positions of a movement backend"""
+    if hasattr(movement, 'states'):
+        # VectorizedMove already keeps them as arrays
+        nectar = movement.gold_positions[movement.gold_alive]
+        return movement.positions, movement.sizes, movement.states, nectar
+
+    bees = movement.red_dots
+    positions = np.array([dot.position for dot in bees], dtype=float).reshape(-1, 2)
+    sizes = np.array([dot.current_size for dot in bees], dtype=float)
+    states = np.full(len(bees), SEEKING, dtype=np.int8)
+    states[list(movement.returning_dots)] = RETURNING
+    states[list(movement.settled_dots)] = SETTLED
+    nectar = np.array([dot.position for dot in movement.gold_dots], dtype=float).reshape(-1, 2)
+    return positions, sizes, states, nectar
+
+
+def silver_positions(movement):
+    """Positions of the pollen (silver dots) still in the field"""
+    if hasattr(movement, 'silver_alive'):
+        return movement.silver_positions[movement.silver_alive]
+    return np.array([dot.position for dot in movement.silver_dots], dtype=float).reshape(-1, 2)
@@ -0,0 +1,136 @@
+import numpy as np
+from movement.spatial_index import SpatialHash
+
+# Largest number of bees (or nectar) solved exactly; beyond this a greedy
+# matching over the spatial index is used
+EXACT_ASSIGNMENT_LIMIT = 64
+# Nearest nectar candidates considered per bee by the greedy solver
+GREEDY_CANDIDATES = 8
+
+
+def hungarian(cost):
+    """
+    Minimum-cost assignment of rows to columns (Hungarian algorithm with
+    potentials, O(n^2 m)). Works on rectangular matrices: every row is
+    matched if there are at least as many columns, otherwise every column.
+    Returns an array with the matched column of each row, or -1.
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.full(cost.shape[1] if transposed else 0, -1, dtype=np.int64)
+
+    # 1-based rows/columns; column 0 is the virtual start of each augmenting path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # Row matched to each column, 0 for none
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for row in range(1, n + 1):
+        match[0] = row
+        col = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[col] = True
+            current_row = match[col]
+            free = ~used[1:]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = col
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_col = int(candidates.argmin()) + 1
+            delta = candidates[next_col - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+
+            col = next_col
+            if match[col] == 0:
+                break
+
+        # Flip the augmenting path
+        while col:
+            previous = way[col]
+            match[col] = match[previous]
+            col = previous
+
+    if transposed:
+        result = np.full(m, -1, dtype=np.int64)
+        for col in range(1, m + 1):
+            if match[col]:
+                result[col - 1] = match[col] - 1
+        return result
+
+    result = np.full(n, -1, dtype=np.int64)
+    for col in range(1, m + 1):
+        if match[col]:
+            result[match[col] - 1] = col - 1
+    return result
+
+
+def greedy_assignment(bee_positions, nectar_positions, candidates=GREEDY_CANDIDATES):
+    """
+    Near-optimal assignment for large swarms: each bee proposes its few
+    nearest nectar from a spatial index, pairs are taken shortest first, and
+    bees left over are matched to the nearest nectar still free.
+    Returns the nectar row of each bee, or -1.
+    """
+    n = len(bee_positions)
+    result = np.full(n, -1, dtype=np.int64)
+    if n == 0 or len(nectar_positions) == 0:
+        return result
+
+    nectar_list = np.asarray(nectar_positions, dtype=float).tolist()
+    bee_list = np.asarray(bee_positions, dtype=float).tolist()
+    index = SpatialHash(cell_size=1.0)
+    for j, position in enumerate(nectar_list):
+        index.insert(j, position)
+
+    k = min(candidates, len(nectar_list))
+    pairs = []
+    for i, position in enumerate(bee_list):
+        for distance, j in index.nearest(position, k=k):
+            pairs.append((distance, i, j))
+    pairs.sort()
+
+    taken = set()
+    for distance, i, j in pairs:
+        if result[i] < 0 and j not in taken:
+            result[i] = j
+            taken.add(j)
+            index.remove(j)
+
+    # Bees whose candidates were all taken look further out
+    for i in np.flatnonzero(result < 0).tolist():
+        if not index:
+            break
+        nearest = index.nearest(bee_list[i], k=1)
+        j = nearest[0][1]
+        result[i] = j
+        index.remove(j)
+
+    return result
+
+
+def assign_nectar(bee_positions, nectar_positions, exact_limit=EXACT_ASSIGNMENT_LIMIT):
+    """
+    Match idle bees to free nectar minimizing the total flight distance, one
+    bee per nectar. Small problems are solved exactly, large ones greedily.
+    Returns the nectar row of each bee, or -1 when there was none left.
+    """
+    bee_positions = np.asarray(bee_positions, dtype=float).reshape(-1, 2)
+    nectar_positions = np.asarray(nectar_positions, dtype=float).reshape(-1, 2)
+    if len(bee_positions) == 0 or len(nectar_positions) == 0:
+        return np.full(len(bee_positions), -1, dtype=np.int64)
+
+    if min(len(bee_positions), len(nectar_positions)) <= exact_limit:
+        delta = bee_positions[:, None, :] - nectar_positions[None, :, :]
+        return hungarian(np.hypot(delta[..., 0], delta[..., 1]))
+    return greedy_assignment(bee_positions, nectar_positions)
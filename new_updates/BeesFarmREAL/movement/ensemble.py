@@ -0,0 +1,415 @@
+import numpy as np
+from entities.circle_dot import CircleDot
+from movement.oscillation import OscillationDetector
+from movement.settling import settle_offsets
+from movement.vectorized import (SEEKING, RETURNING, SETTLED, ARRIVAL_DISTANCE, SILVER_INTERACTION_DISTANCE,
+                                 blocked_mask, step_towards, random_steps)
+from entities.spawning import spawn_positions
+from utils.constants import FLOWER_AREAS, SILVER_AREAS, HIVE_PRESET_POSITIONS, BEE_SPAWN_SPACING
+from utils.rng import get_stream
+
+# Nectar per cycle, as create_landscape / regenerate_nectar spawn it
+INITIAL_NECTAR = 5
+REGENERATED_NECTAR = (8, 12)  # Inclusive range
+MIN_NECTAR = 5                # ensure_gold_dots_at_spawn_points tops up to this
+SPAWN_ATTEMPTS = 10           # Tries to find a cell outside the forbidden zone
+SILVER_PER_AREA = (1, 5)      # Inclusive range of silver dots per silver area
+
+
+class EnsembleMove:
+    """
+    Many independent colonies on one landscape layout, advanced together.
+
+    Every per-bee array of VectorizedMove gets a leading replica axis
+    (replicas x bees), and every colony has its own nectar and silver dots
+    (replicas x slots, with alive masks). One update_state() moves all bees
+    of all colonies with the same vectorized kernels as VectorizedMove, so
+    the cost grows with the number of bees rather than colonies (1000
+    colonies of 4 bees take about 10 ms a tick, 2.5-3x one 4000-bee
+    VectorizedMove step: the colonies have more nectar cells to navigate to
+    and returning and seeking bees move in separate passes).
+
+    The seek, collect, return and settle rules are those of VectorizedMove.
+    Targets are handed out in greedy rounds (each bee takes the nearest free
+    nectar of its own colony, ties in bee order) across all colonies at once,
+    since an exact per-colony solver would be a Python loop per colony.
+    """
+
+    def __init__(self, replicas, bees_per_colony, beehive, beehive_position, max_gold_collected,
+                 pond_position, pond_size, forbidden_zone_func=None, obstacle_field=None, navigation=None,
+                 rng=None, block_size=15, flower_areas=None):
+        self.replicas = replicas
+        self.bees = bees_per_colony
+        self.beehive = beehive  # ObjectManager.beehive dict (position, width, height)
+        self.beehive_position = beehive_position
+        self.last_beehive_position = (12, 2)
+        self.block_size = block_size
+        self.flower_areas = [dict(area) for area in (flower_areas or FLOWER_AREAS)]
+        self.max_gold_collected = max_gold_collected
+        self.pond_position = pond_position
+        self.pond_size = pond_size
+        self.forbidden_zone_func = forbidden_zone_func
+        self.obstacle_field = obstacle_field
+        self.navigation = navigation
+        if navigation is not None:
+            navigation.warm_up([beehive_position, self.last_beehive_position])
+        self.avoidance_angle_offset = 1.2
+        self.rng = rng if rng is not None else get_stream("ensemble").generator
+
+        # Bee defaults come from CircleDot so both stay in sync
+        default_bee = CircleDot((0, 0))
+        self.original_size = default_bee.original_size
+        self.max_size = default_bee.max_size
+
+        # Per-bee arrays: (replicas, bees)
+        shape = (replicas, bees_per_colony)
+        self.positions = np.zeros(shape + (2,))
+        self.speed_modifiers = np.ones(shape)
+        self.sizes = np.full(shape, self.original_size)
+        self.silver_interactions = np.zeros(shape, dtype=np.int64)
+        self.targets = np.full(shape, -1, dtype=np.int64)  # Nectar slot of the bee's own colony
+        self.states = np.full(shape, SEEKING, dtype=np.int8)
+        self.oscillation = OscillationDetector(replicas * bees_per_colony)
+
+        # Flat views for the kernels shared with VectorizedMove
+        self.flat_positions = self.positions.reshape(-1, 2)
+        self.flat_states = self.states.reshape(-1)
+        self.flat_targets = self.targets.reshape(-1)
+        self.flat_speed_modifiers = self.speed_modifiers.reshape(-1)
+
+        # Per-colony state: (replicas,)
+        self.gold_collected = np.zeros(replicas, dtype=np.int64)
+        self.completed = np.zeros(replicas, dtype=bool)
+        self.cycles_completed = np.zeros(replicas, dtype=np.int64)
+
+        # Nectar slots: one per flower for the first pass, one per extra dot, one per top-up
+        self.gold_slots = len(self.flower_areas) + max(INITIAL_NECTAR, REGENERATED_NECTAR[1]) + len(self.flower_areas)
+        self.gold_positions = np.zeros((replicas, self.gold_slots, 2))
+        self.gold_alive = np.zeros((replicas, self.gold_slots), dtype=bool)
+        self.silver_slots = len(SILVER_AREAS) * SILVER_PER_AREA[1]
+        self.silver_positions = np.zeros((replicas, self.silver_slots, 2))
+        self.silver_alive = np.zeros((replicas, self.silver_slots), dtype=bool)
+
+        everyone = np.ones(replicas, dtype=bool)
+        self.place_bees(everyone)
+        self.spawn_nectar(everyone, np.full(replicas, INITIAL_NECTAR))
+        self.spawn_silver(everyone)
+
+        print(f"Initializing ensemble of {replicas} colonies with {bees_per_colony} bees each")
+
+    # --- Spawning (vectorized ObjectManager / helpers equivalents) ----------------
+
+    def place_bees(self, replicas):
+        """Put the bees of the given colonies inside the hive (ObjectManager.add_red_dots)"""
+        rows = np.flatnonzero(replicas)
+        hive_x, hive_y = self.beehive["position"]
+        size = np.array([self.beehive["width"], self.beehive["height"]], dtype=float)
+
+        preset = min(self.bees, len(HIVE_PRESET_POSITIONS))
+        layout = np.array([hive_x, hive_y]) + np.asarray(HIVE_PRESET_POSITIONS[:preset]) * size
+        if self.bees > preset:
+            # One Poisson-disk layout around the hive for the remaining bees, shared by the colonies
+            extra = spawn_positions(
+                self.bees - preset, center=(hive_x + size[0] / 2, hive_y + size[1] / 2),
+                bounds=(0, 0, self.block_size, self.block_size), spacing=BEE_SPAWN_SPACING, rng=self.rng,
+                is_blocked=lambda x, y: bool(self.is_blocked(x, y)), existing=layout.tolist())
+            layout = np.concatenate((layout, extra))
+
+        # Small randomness around the layout positions
+        self.positions[rows] = layout + self.rng.uniform(-0.1, 0.1, size=(rows.size, self.bees, 2))
+
+    def reset_bees(self, replicas):
+        """Line the bees up around the hive and reset their attributes (reset_bee_positions)"""
+        rows = np.flatnonzero(replicas)
+        hive_x, hive_y = self.beehive["position"]
+        width, height = self.beehive["width"], self.beehive["height"]
+
+        offset = self.rng.uniform(0.5, 1.5, size=(rows.size, self.bees))
+        along = self.rng.uniform(0, 1, size=(rows.size, self.bees))
+        side = np.arange(self.bees) % 4  # 0: right, 1: top, 2: left, 3: bottom
+        x = np.select([side == 0, side == 2], [hive_x + width + offset, hive_x - offset], hive_x + along * width)
+        y = np.select([side == 1, side == 3], [hive_y + height + offset, hive_y - offset], hive_y + along * height)
+        self.positions[rows, :, 0] = x
+        self.positions[rows, :, 1] = y
+
+        self.sizes[rows] = self.original_size
+        self.speed_modifiers[rows] = 1.0
+        self.silver_interactions[rows] = 0
+
+    def _flower_cells(self, areas):
+        """
+        Random cell centre inside each flower area index in areas, retried
+        outside the forbidden zone. Returns (positions, valid).
+        """
+        area_x = np.array([area["position"][0] for area in self.flower_areas])
+        area_y = np.array([area["position"][1] for area in self.flower_areas])
+        area_w = np.array([area["width"] for area in self.flower_areas])
+        area_h = np.array([area["height"] for area in self.flower_areas])
+
+        shape = areas.shape + (SPAWN_ATTEMPTS,)
+        x = area_x[areas][..., None] + self.rng.integers(0, area_w[areas][..., None], size=shape) + 0.5
+        y = area_y[areas][..., None] + self.rng.integers(0, area_h[areas][..., None], size=shape) + 0.5
+        allowed = np.ones(shape, dtype=bool)
+        if self.forbidden_zone_func is not None:
+            allowed = ~np.asarray(self.forbidden_zone_func(x, y), dtype=bool)
+
+        # First allowed attempt of each dot
+        attempt = allowed.argmax(axis=-1)[..., None]
+        positions = np.stack((np.take_along_axis(x, attempt, -1)[..., 0],
+                              np.take_along_axis(y, attempt, -1)[..., 0]), axis=-1)
+        return positions, allowed.any(axis=-1)
+
+    def spawn_nectar(self, replicas, counts):
+        """
+        New nectar for the given colonies, count per colony, with the rules of
+        ObjectManager.add_gold_dots (one dot per flower first, the rest in
+        random flowers, nothing in the forbidden zone) followed by the top-up
+        of ensure_gold_dots_at_spawn_points.
+        """
+        rows = np.flatnonzero(replicas)
+        counts = np.asarray(counts)[:rows.size] if np.ndim(counts) else np.full(rows.size, counts)
+        n_areas = len(self.flower_areas)
+        extra = self.gold_slots - 2 * n_areas
+
+        # First pass: every flower in a shuffled order (at most count of them)
+        order = np.argsort(self.rng.random((rows.size, n_areas)), axis=1)
+        first, first_ok = self._flower_cells(order)
+        first_ok &= np.arange(n_areas)[None, :] < np.minimum(counts, n_areas)[:, None]
+
+        # The remaining dots go to random flowers; failures are dropped
+        remaining = counts - first_ok.sum(axis=1)
+        areas = order[np.arange(rows.size)[:, None], self.rng.integers(0, np.minimum(counts, n_areas)[:, None],
+                                                                          size=(rows.size, extra))]
+        more, more_ok = self._flower_cells(areas)
+        more_ok &= np.arange(extra)[None, :] < remaining[:, None]
+
+        # Top up to MIN_NECTAR, one dot per flower in a fresh shuffled order
+        order = np.argsort(self.rng.random((rows.size, n_areas)), axis=1)
+        top_up, top_up_ok = self._flower_cells(order)
+        missing = MIN_NECTAR - first_ok.sum(axis=1) - more_ok.sum(axis=1)
+        top_up_ok &= np.cumsum(top_up_ok, axis=1) <= missing[:, None]
+
+        self.gold_positions[rows] = np.concatenate((first, more, top_up), axis=1)
+        self.gold_alive[rows] = np.concatenate((first_ok, more_ok, top_up_ok), axis=1)
+        self.targets[rows] = -1
+
+    def spawn_silver(self, replicas):
+        """New silver dots for the given colonies (ObjectManager.add_silver_dots)"""
+        rows = np.flatnonzero(replicas)
+        per_area = SILVER_PER_AREA[1]
+        positions = np.zeros((rows.size, len(SILVER_AREAS), per_area, 2))
+        alive = np.zeros((rows.size, len(SILVER_AREAS), per_area), dtype=bool)
+        for a, (x_range, y_range) in enumerate(SILVER_AREAS):
+            count = self.rng.integers(SILVER_PER_AREA[0], SILVER_PER_AREA[1] + 1, size=rows.size)
+            positions[:, a, :, 0] = x_range.start + self.rng.integers(0, len(x_range), size=(rows.size, per_area)) + 0.5
+            positions[:, a, :, 1] = y_range.start + self.rng.integers(0, len(y_range), size=(rows.size, per_area)) + 0.5
+            alive[:, a] = np.arange(per_area)[None, :] < count[:, None]
+        self.silver_positions[rows] = positions.reshape(rows.size, -1, 2)
+        self.silver_alive[rows] = alive.reshape(rows.size, -1)
+
+    def regenerate(self, replicas):
+        """Start a new nectar cycle in the given colonies (regenerate_nectar)"""
+        rows = np.flatnonzero(replicas)
+        self.gold_collected[rows] = 0
+        self.states[rows] = SEEKING
+        self.targets[rows] = -1
+        self.completed[rows] = False
+        self.cycles_completed[rows] += 1
+
+        counts = self.rng.integers(REGENERATED_NECTAR[0], REGENERATED_NECTAR[1] + 1, size=rows.size)
+        self.spawn_nectar(replicas, counts)
+        self.spawn_silver(replicas)
+        self.reset_bees(replicas)
+
+    # --- Queries -----------------------------------------------------------------
+
+    def are_all_nectar_collected(self):
+        """Per colony: nothing left in the field or the nectar target reached"""
+        return ~self.gold_alive.any(axis=1) | (self.gold_collected >= self.max_gold_collected)
+
+    def all_near_hive(self, max_distance=2.0):
+        """Per colony: every bee within max_distance of the beehive position"""
+        hive_x, hive_y = self.beehive_position
+        distance = np.hypot(self.positions[..., 0] - hive_x, self.positions[..., 1] - hive_y)
+        return (distance <= max_distance).all(axis=1)
+
+    def is_blocked(self, x, y):
+        if self.obstacle_field is not None:
+            return self.obstacle_field.is_blocked(x, y)
+        return blocked_mask(x, y, self.pond_position, self.pond_size, self.forbidden_zone_func)
+
+    # --- Simulation --------------------------------------------------------------
+
+    def _move(self, idx, targets):
+        """Move the flat bee indices idx towards targets; returns pre-move distances"""
+        positions = self.flat_positions[idx]
+        step_sizes = 0.4 * self.flat_speed_modifiers[idx]
+        headings = None
+        if self.navigation is not None:
+            headings = self.navigation.headings_towards(positions, targets)
+        new_positions, distances = step_towards(
+            positions, targets, step_sizes, self.is_blocked, self.rng,
+            self.avoidance_angle_offset, self.obstacle_field, headings)
+
+        # Bees stuck going back and forth take a random step instead
+        moving = distances > 0
+        oscillating = np.zeros(idx.size, dtype=bool)
+        oscillating[moving] = self.oscillation.check_many(idx[moving], new_positions[moving])
+        if oscillating.any():
+            new_positions[oscillating] = random_steps(
+                positions[oscillating], step_sizes[oscillating], self.is_blocked, self.rng)
+
+        self.flat_positions[idx] = new_positions
+        return distances
+
+    def _settle(self, idx):
+        """Place the flat bee indices idx at their grid position inside the hive"""
+        self.flat_positions[idx] = np.asarray(self.beehive_position, dtype=float) + settle_offsets(idx % self.bees)
+        self.flat_states[idx] = SETTLED
+
+    def _check_silver_interactions(self, active):
+        """Grow and slow down bees (active: replicas x bees mask) that touch a silver dot"""
+        rows = np.flatnonzero(active.any(axis=1) & self.silver_alive.any(axis=1))
+        if rows.size == 0:
+            return
+
+        # Squared distances, one coordinate at a time (no (rows, bees, slots, 2) temporary)
+        bees = self.positions[rows]
+        silver = self.silver_positions[rows]
+        dx = bees[:, :, None, 0] - silver[:, None, :, 0]
+        dy = bees[:, :, None, 1] - silver[:, None, :, 1]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        close = dx < SILVER_INTERACTION_DISTANCE ** 2
+        close &= self.silver_alive[rows, None, :]
+        close &= active[rows, :, None]
+        touching = close.any(axis=2)
+        if not touching.any():
+            return
+
+        # Each bee touches its first silver dot; each dot goes to the first bee of its colony
+        row, bee = np.nonzero(touching)
+        dot = close[row, bee].argmax(axis=1)
+        _, first = np.unique(row * self.silver_slots + dot, return_index=True)
+        replica, bee, dot = rows[row[first]], bee[first], dot[first]
+
+        self.silver_alive[replica, dot] = False
+        self.silver_interactions[replica, bee] += 1
+        k = self.silver_interactions[replica, bee]
+        self.sizes[replica, bee] = self.original_size * np.minimum(1.5 ** k, self.max_size / self.original_size)
+        self.speed_modifiers[replica, bee] = np.maximum(0.25, 1.0 - 0.25 * k)
+
+    def _assign_targets(self, needy):
+        """
+        Give the bees of the needy (replicas x bees) mask the closest nectar of
+        their colony that no other bee targets, in greedy rounds over all
+        colonies at once. Where all nectar is taken the bees share.
+        """
+        rows = np.flatnonzero(needy.any(axis=1))
+        delta = self.positions[rows, :, None, :] - self.gold_positions[rows, None, :, :]
+        dist = np.hypot(delta[..., 0], delta[..., 1])
+        alive = self.gold_alive[rows]
+        targets = self.targets[rows]
+
+        targeted = np.zeros(alive.shape, dtype=bool)
+        row, bee = np.nonzero(targets >= 0)
+        targeted[row, targets[row, bee]] = True
+
+        pending = needy[rows].copy()
+        while pending.any():
+            free = alive & ~targeted
+            share = pending & ~free.any(axis=1)[:, None]
+            if share.any():
+                # All nectar of the colony is targeted - share the nearest live one
+                nearest = np.where(alive[:, None, :], dist, np.inf).argmin(axis=2)
+                share_live = share & alive.any(axis=1)[:, None]
+                targets[share_live] = nearest[share_live]
+                pending &= ~share
+                if not pending.any():
+                    break
+
+            choice = np.where(free[:, None, :], dist, np.inf).argmin(axis=2)
+            row, bee = np.nonzero(pending)
+            picked = choice[row, bee]
+            # First bee (in index order) of each colony to pick a nectar gets it
+            _, first = np.unique(row * self.gold_slots + picked, return_index=True)
+            row, bee, picked = row[first], bee[first], picked[first]
+            targets[row, bee] = picked
+            targeted[row, picked] = True
+            pending[row, bee] = False
+
+        self.targets[rows] = targets
+
+    def _collect(self, idx):
+        """Collect the nectar targeted by the flat bee indices idx; first bee of a colony wins"""
+        replica = idx // self.bees
+        nectar = self.flat_targets[idx]
+        _, first = np.unique(replica * self.gold_slots + nectar, return_index=True)
+        winners = idx[first]
+
+        self.gold_alive[replica[first], nectar[first]] = False
+        self.gold_collected += np.bincount(winners // self.bees, minlength=self.replicas)
+        self.flat_states[winners] = RETURNING
+        # Bees that arrived at an already-collected nectar pick a new one next tick
+        self.flat_targets[idx] = -1
+
+    def update_state(self, replicas=None):
+        """Advance the bees of the given colonies (all unfinished ones by default) by one tick"""
+        run = ~self.completed if replicas is None else replicas & ~self.completed
+        if not run.any():
+            return
+
+        not_settled = self.states != SETTLED
+        exhausted = run & (self.gold_collected >= self.max_gold_collected)
+        foraging = run & ~exhausted
+
+        # Colonies that reached the nectar target send everyone to the hive entrance
+        homing = exhausted[:, None] & not_settled
+        self.states[homing] = RETURNING
+        self.completed |= exhausted & ~homing.any(axis=1)
+
+        self._check_silver_interactions(foraging[:, None] & not_settled)
+
+        # Returning bees fly home
+        returning = np.flatnonzero(run[:, None] & (self.states == RETURNING))
+        if returning.size:
+            replica = returning // self.bees
+            targets = np.where(exhausted[replica, None],
+                               np.asarray(self.last_beehive_position, dtype=float),
+                               np.asarray(self.beehive_position, dtype=float))
+            distances = self._move(returning, targets)
+            arrived = returning[distances < ARRIVAL_DISTANCE]
+            if arrived.size:
+                replica = arrived // self.bees
+                settle = exhausted[replica] | self.are_all_nectar_collected()[replica]
+                self._settle(arrived[settle])
+
+                # Jump away from the hive to avoid getting stuck, then seek again
+                jumping = arrived[~settle]
+                self.flat_states[jumping] = SEEKING
+                jump_angle = self.rng.uniform(0, 2 * np.pi, size=jumping.size)
+                jump_distance = self.rng.uniform(0.8, 1.2, size=jumping.size)
+                self.flat_positions[jumping, 0] += jump_distance * np.cos(jump_angle)
+                self.flat_positions[jumping, 1] += jump_distance * np.sin(jump_angle)
+
+        # Seeking bees (re)target and fly to nectar
+        seeking = foraging[:, None] & (self.states == SEEKING)
+        if seeking.any():
+            has_target = self.targets >= 0
+            alive_target = np.take_along_axis(self.gold_alive, np.maximum(self.targets, 0), axis=1)
+            needy = seeking & ~(has_target & alive_target)
+            self.targets[needy] = -1
+            if needy.any():
+                self._assign_targets(needy)
+
+            # No nectar left to target - return to the hive
+            self.states[seeking & (self.targets < 0)] = RETURNING
+
+            flying = np.flatnonzero(seeking & (self.targets >= 0))
+            if flying.size:
+                targets = self.gold_positions[flying // self.bees, self.flat_targets[flying]]
+                distances = self._move(flying, targets)
+                arrived = flying[distances < ARRIVAL_DISTANCE]
+                if arrived.size:
+                    self._collect(arrived)
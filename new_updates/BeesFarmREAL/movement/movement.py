@@ -1,28 +1,43 @@
 import math
-import random
 from utils.constants import DEBUG_VERBOSE
+from movement.spatial_index import SpatialHash
+from movement.assignment import assign_nectar
+from movement.oscillation import OscillationDetector
+from movement.settling import settle_position
+from utils.rng import get_stream
 
 class Move:
-    def __init__(self, red_dots, gold_dots, beehive_position, max_gold_collected, pond_position, pond_size, forbidden_zone_func=None, silver_dots=None):
+    def __init__(self, red_dots, gold_dots, beehive_position, max_gold_collected, pond_position, pond_size, forbidden_zone_func=None, silver_dots=None, obstacle_field=None, navigation=None, rng=None, last_beehive_position=(12, 2)):
         self.red_dots = red_dots  # Now a list of red dots
+        # Seedable streams: one for movement, one for the sampled log messages
+        self.rng = rng if rng is not None else get_stream("movement")
+        self.log_rng = get_stream("logging")
         self.dot_targets = {}  # Track which red dot is targeting which gold dot
+        # Assigning gold_dots / silver_dots rebuilds their spatial indexes
         self.gold_dots = gold_dots
         self.silver_dots = silver_dots or []  # Track silver dots for interactions
         self.beehive_position = beehive_position
-        self.last_beehive_position = (12, 2)
+        self.last_beehive_position = last_beehive_position  # Hive entrance bees settle through
         self.max_gold_collected = max_gold_collected
         self.gold_collected = 0
+        self.collected = []  # (bee index, gold dot) collected during the last update_state
         self.returning_dots = set()  # Track which dots are returning
         self.settled_dots = set()  # Track which dots have settled in the hive
         self.completed = False
         self.pond_position = pond_position
         self.pond_size = pond_size
         self.forbidden_zone_func = forbidden_zone_func
+        # Precomputed signed-distance field; when set, bees slide along obstacles
+        # instead of trying random detours
+        self.obstacle_field = obstacle_field
+        # Shared flow fields; bees follow the shortest path around obstacles
+        self.navigation = navigation
+        if navigation is not None:
+            navigation.warm_up([beehive_position, self.last_beehive_position])
         self.avoidance_angle_offset = 1.2  # Larger avoidance offset
         
-        # Add position history tracking for oscillation detection
-        self.position_history = {}
-        self.oscillation_count = {}
+        # Position history ring buffer for oscillation detection
+        self.oscillation = OscillationDetector(len(red_dots))
         self.bee_ids = {}
         
         # Track interactions with silver dots - move this BEFORE _assign_bee_ids call
@@ -35,6 +50,44 @@ class Move:
         
         print(f"Initializing simulation with {len(red_dots)} bees")
         
+    @property
+    def gold_dots(self):
+        return self._gold_dots
+
+    @gold_dots.setter
+    def gold_dots(self, dots):
+        self._gold_dots = dots
+        self.gold_index = SpatialHash(dots, cell_size=1.0)
+
+    @property
+    def silver_dots(self):
+        return self._silver_dots
+
+    @silver_dots.setter
+    def silver_dots(self, dots):
+        self._silver_dots = dots
+        self.silver_index = SpatialHash(dots, cell_size=1.0)
+
+    def add_gold_dot(self, gold_dot):
+        """Add a nectar dot to the field and its spatial index"""
+        self._gold_dots.append(gold_dot)
+        self.gold_index.insert(gold_dot)
+
+    def remove_gold_dot(self, gold_dot):
+        """Remove a nectar dot from the field and its spatial index"""
+        self._gold_dots.remove(gold_dot)
+        self.gold_index.remove(gold_dot)
+
+    def remove_silver_dot(self, silver_dot):
+        """Remove a silver dot (used elsewhere) from the field and its spatial index"""
+        self._silver_dots.remove(silver_dot)
+        self.silver_index.remove(silver_dot)
+
+    def revoke_collection(self, bee_index):
+        """Undo a collection another colony won; the bee goes back to seeking"""
+        self.gold_collected -= 1
+        self.returning_dots.discard(bee_index)
+
     def reset_for_new_cycle(self):
         """Reset the relevant state variables for a new nectar cycle"""
         self.gold_collected = 0
@@ -54,8 +107,6 @@ class Move:
         """Assign unique IDs to bees for tracking purposes"""
         for i, bee in enumerate(self.red_dots):
             self.bee_ids[i] = f"Bee-{i+1}"
-            self.position_history[i] = []
-            self.oscillation_count[i] = 0
             self.silver_dot_interactions[i] = 0
     
     def log_important_event(self, bee_index, message):
@@ -69,31 +120,11 @@ class Move:
 
     def detect_oscillation(self, bee_index, new_position):
         """Detect if a bee is oscillating (moving back and forth)"""
-        history = self.position_history.get(bee_index, [])
-        
-        # Only check for oscillation with sufficient history
-        if len(history) >= 5:
-            # Check if new position is very close to a previous recent position
-            for old_pos in history[-5:]:
-                distance = math.hypot(old_pos[0] - new_position[0], old_pos[1] - new_position[1])
-                if distance < 0.15:  # If very close to a recent position
-                    self.oscillation_count[bee_index] = self.oscillation_count.get(bee_index, 0) + 1
-                    
-                    if self.oscillation_count[bee_index] >= 3:  # Consecutive oscillations detected
-                        bee_id = self.bee_ids.get(bee_index, f"Bee-{bee_index}")
-                        if DEBUG_VERBOSE:  # Only log if verbose
-                            print(f"⚠️ {bee_id} oscillation detected! Breaking cycle with random movement")
-                        self.oscillation_count[bee_index] = 0  # Reset counter
-                        return True
-                    return False
-        
-        # Update position history
-        self.position_history[bee_index] = history + [new_position.copy()]
-        
-        # Keep history limited to prevent memory growth
-        if len(self.position_history[bee_index]) > 20:
-            self.position_history[bee_index] = self.position_history[bee_index][-20:]
-            
+        if self.oscillation.check(bee_index, new_position):
+            bee_id = self.bee_ids.get(bee_index, f"Bee-{bee_index}")
+            if DEBUG_VERBOSE:  # Only log if verbose
+                print(f"⚠️ {bee_id} oscillation detected! Breaking cycle with random movement")
+            return True
         return False
 
     def move_towards(self, red_dot, target_position, step_size=0.4):
@@ -108,80 +139,49 @@ class Move:
         if hasattr(red_dot, 'speed_modifier'):
             step_size *= red_dot.speed_modifier
         
-        dx = target_position[0] - red_dot.position[0]
-        dy = target_position[1] - red_dot.position[1]
-        distance = math.hypot(dx, dy)
+        if self.navigation is not None:
+            # Heading from the goal's shared flow field instead of a straight line
+            heading_x, heading_y, distance = self.navigation.heading_towards(red_dot.position, target_position)
+        else:
+            dx = target_position[0] - red_dot.position[0]
+            dy = target_position[1] - red_dot.position[1]
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                heading_x, heading_y = dx / distance, dy / distance
 
         if distance > 0:
-            angle = math.atan2(dy, dx)
-            
-            # Calculate next position
-            next_x = red_dot.position[0] + step_size * math.cos(angle)
-            next_y = red_dot.position[1] + step_size * math.sin(angle)
-
-            # Avoid obstacles - keep trying different detours until we find a valid position
-            # or hit the maximum number of attempts
-            max_detour_attempts = 5
-            detour_attempts = 0
-            
-            # Check for pond and forbidden zone repeatedly until we find a valid position
-            while ((self.is_inside_pond(next_x, next_y) or 
-                   (self.forbidden_zone_func and self.forbidden_zone_func(next_x, next_y))) and 
-                   detour_attempts < max_detour_attempts):
-                
-                # Calculate a new detour with increasing avoidance angle on each attempt
-                detour_angle_modifier = self.avoidance_angle_offset * (1 + 0.5 * detour_attempts)
-                detour_angle = angle + detour_angle_modifier + random.uniform(-0.3, 0.3)
-                radius_multiplier = 2.0 + detour_attempts * 0.5  # Widen the arc with each attempt
-                
-                next_x = red_dot.position[0] + step_size * radius_multiplier * math.cos(detour_angle)
-                next_y = red_dot.position[1] + step_size * radius_multiplier * math.sin(detour_angle)
-                
-                detour_attempts += 1
+            angle = math.atan2(heading_y, heading_x)
             
-            # If we still couldn't find a valid position after max attempts,
-            # try a completely random direction with a larger step
-            if (self.is_inside_pond(next_x, next_y) or 
-                (self.forbidden_zone_func and self.forbidden_zone_func(next_x, next_y))):
-                
-                # Use a random angle for emergency escape
-                emergency_angle = random.uniform(0, 2 * math.pi)
-                emergency_step = step_size * 3.0  # Larger step to escape
-                
-                next_x = red_dot.position[0] + emergency_step * math.cos(emergency_angle)
-                next_y = red_dot.position[1] + emergency_step * math.sin(emergency_angle)
-                
-                # Final safety check - if still in forbidden zone, don't move at all
-                if (self.is_inside_pond(next_x, next_y) or 
-                    (self.forbidden_zone_func and self.forbidden_zone_func(next_x, next_y))):
-                    # Don't move - stay in place
-                    next_x, next_y = red_dot.position
+            if self.obstacle_field is not None:
+                # One field lookup: slide along the obstacle edge if the step would enter it
+                next_x, next_y = self.obstacle_field.steer(
+                    red_dot.position[0], red_dot.position[1],
+                    heading_x, heading_y, step_size)
+            else:
+                next_x, next_y = self._detour_around_obstacles(red_dot, angle, step_size)
             
             # Oscillation detection and correction
             if bee_index is not None:
                 # Check for oscillation
-                old_position = red_dot.position.copy()
                 new_position = [next_x, next_y]
                 
                 is_oscillating = self.detect_oscillation(bee_index, new_position)
                 
                 if is_oscillating:
                     # Add randomization to break the cycle
-                    random_angle = random.uniform(0, 2 * math.pi)
+                    random_angle = self.rng.uniform(0, 2 * math.pi)
                     next_x = red_dot.position[0] + step_size * math.cos(random_angle)
                     next_y = red_dot.position[1] + step_size * math.sin(random_angle)
                     
                     # Check if this would put us in pond/forbidden zone and avoid if needed
-                    if (self.is_inside_pond(next_x, next_y) or 
-                            (self.forbidden_zone_func and self.forbidden_zone_func(next_x, next_y))):
+                    if self.is_blocked(next_x, next_y):
                         # Try a different angle
-                        random_angle = random.uniform(0, 2 * math.pi)
+                        random_angle = self.rng.uniform(0, 2 * math.pi)
                         next_x = red_dot.position[0] + step_size * 1.5 * math.cos(random_angle)
                         next_y = red_dot.position[1] + step_size * 1.5 * math.sin(random_angle)
                         
                         # Final safety check for oscillation-breaking move
-                        if (self.is_inside_pond(next_x, next_y) or 
-                            (self.forbidden_zone_func and self.forbidden_zone_func(next_x, next_y))):
+                        if self.is_blocked(next_x, next_y):
                             # Don't move - stay in place
                             next_x, next_y = red_dot.position
             
@@ -190,48 +190,110 @@ class Move:
             
         return distance
 
+    def _detour_around_obstacles(self, red_dot, angle, step_size):
+        """Rejection-sample detour directions around the pond and forbidden zone"""
+        # Calculate next position
+        next_x = red_dot.position[0] + step_size * math.cos(angle)
+        next_y = red_dot.position[1] + step_size * math.sin(angle)
+
+        # Avoid obstacles - keep trying different detours until we find a valid position
+        # or hit the maximum number of attempts
+        max_detour_attempts = 5
+        detour_attempts = 0
+
+        # Check for pond and forbidden zone repeatedly until we find a valid position
+        while self.is_blocked(next_x, next_y) and detour_attempts < max_detour_attempts:
+
+            # Calculate a new detour with increasing avoidance angle on each attempt
+            detour_angle_modifier = self.avoidance_angle_offset * (1 + 0.5 * detour_attempts)
+            detour_angle = angle + detour_angle_modifier + self.rng.uniform(-0.3, 0.3)
+            radius_multiplier = 2.0 + detour_attempts * 0.5  # Widen the arc with each attempt
+
+            next_x = red_dot.position[0] + step_size * radius_multiplier * math.cos(detour_angle)
+            next_y = red_dot.position[1] + step_size * radius_multiplier * math.sin(detour_angle)
+
+            detour_attempts += 1
+
+        # If we still couldn't find a valid position after max attempts,
+        # try a completely random direction with a larger step
+        if self.is_blocked(next_x, next_y):
+
+            # Use a random angle for emergency escape
+            emergency_angle = self.rng.uniform(0, 2 * math.pi)
+            emergency_step = step_size * 3.0  # Larger step to escape
+
+            next_x = red_dot.position[0] + emergency_step * math.cos(emergency_angle)
+            next_y = red_dot.position[1] + emergency_step * math.sin(emergency_angle)
+
+            # Final safety check - if still in forbidden zone, don't move at all
+            if self.is_blocked(next_x, next_y):
+                # Don't move - stay in place
+                next_x, next_y = red_dot.position
+
+        return next_x, next_y
+
+    def is_blocked(self, x, y):
+        """True if (x, y) is inside the pond or the forbidden zone"""
+        if self.obstacle_field is not None:
+            return self.obstacle_field.is_blocked(x, y)
+        return self.is_inside_pond(x, y) or bool(self.forbidden_zone_func and self.forbidden_zone_func(x, y))
+
     def is_inside_pond(self, x, y):
         px, py = self.pond_position
         pw, ph = self.pond_size
         return px <= x <= px + pw and py <= y <= py + ph
 
     def find_closest_gold_dot(self, red_dot):
-        if not self.gold_dots:
+        if not self.gold_index:
             return None
             
-        # Find gold dots that aren't being targeted by other red dots
-        available_gold_dots = [g for g in self.gold_dots if g not in self.dot_targets.values()]
+        # Find the closest gold dot that isn't being targeted by other red dots
+        targeted = set(self.dot_targets.values())
+        closest = self.gold_index.nearest(red_dot.position, k=1, predicate=lambda g: g not in targeted)
         
         # If all gold dots are targeted but there are still dots, let this dot target one too
-        if not available_gold_dots and self.gold_dots:
-            available_gold_dots = self.gold_dots
+        if not closest:
+            closest = self.gold_index.nearest(red_dot.position, k=1)
             
-        if not available_gold_dots:
+        if not closest:
             return None
             
-        return min(
-            available_gold_dots,
-            key=lambda g: math.hypot(g.position[0] - red_dot.position[0], g.position[1] - red_dot.position[1])
-        )
+        return closest[0][1]
         
+    def assign_idle_bees(self):
+        """
+        Match every seeking bee without a live target to the free nectar in
+        one batch, minimizing the total flight distance so bees don't chase
+        the same flower. Bees left over share the nearest nectar.
+        """
+        idle = [i for i in range(len(self.red_dots))
+                if i not in self.settled_dots and i not in self.returning_dots
+                and (i not in self.dot_targets or self.dot_targets[i] not in self.gold_index)]
+        if not idle or not self.gold_index:
+            return
+
+        for i in idle:
+            self.dot_targets.pop(i, None)
+        targeted = set(self.dot_targets.values())
+        free = [gold for gold in self.gold_dots if gold not in targeted]
+
+        choice = assign_nectar([self.red_dots[i].position for i in idle], [gold.position for gold in free])
+        for i, j in zip(idle, choice.tolist()):
+            gold_target = free[j] if j >= 0 else self.find_closest_gold_dot(self.red_dots[i])
+            self.dot_targets[i] = gold_target
+            # Log targeting only occasionally to reduce spam
+            if self.log_rng.random() < 0.3:  # 30% chance to log
+                target_pos = [round(p, 1) for p in gold_target.position]
+                self.log_important_event(i, f"🎯 Targeting nectar at {target_pos}")
+
     def are_all_nectar_collected(self):
         """Check if all nectar has been collected from the field"""
         return len(self.gold_dots) == 0 or self.gold_collected >= self.max_gold_collected
 
     def place_bee_in_hive(self, bee_index, red_dot):
         """Place the bee at a fixed position inside the hive"""
-        # Place the bee within the hive at a specific location
-        hive_x, hive_y = self.beehive_position
-        
-        # Create a grid position based on bee_index to neatly arrange bees
-        row = bee_index // 3
-        col = bee_index % 3
-        
-        # Calculate position within hive
-        red_dot.position = [
-            hive_x + 0.25 + (col * 0.25),  # Horizontal position
-            hive_y + 0.25 + (row * 0.25)   # Vertical position
-        ]
+        # Each bee has its own slot on a grid inside the hive
+        red_dot.position = settle_position(bee_index, self.beehive_position)
         
         # Remove from returning dots and add to settled dots
         if bee_index in self.returning_dots:
@@ -242,31 +304,29 @@ class Move:
 
     def check_silver_dot_interactions(self, red_dot, bee_index):
         """Check if a red dot has interacted with a silver dot"""
-        if not self.silver_dots:
+        if not self.silver_index:
             return False
             
         # Define interaction distance
         interaction_distance = 0.6
         
-        # Check distance to each silver dot
-        for i, silver_dot in enumerate(self.silver_dots[:]):  # Use copy to allow removal
-            sx, sy = silver_dot.position
-            rx, ry = red_dot.position
-            
-            distance = math.hypot(sx - rx, sy - ry)
+        # Only silver dots in the grid cells around the bee are checked
+        nearby = self.silver_index.query_radius(red_dot.position, interaction_distance)
+        if not nearby:
+            return False
             
-            if distance < interaction_distance:
-                # Interaction with silver dot occurred
-                changes = red_dot.interact_with_silver()
-                self.log_important_event(bee_index, f"🥈 Interacted with silver dot! Growing larger, moving slower (Size: {changes['new_size']:.2f}, Speed: {changes['new_speed']:.2f})")
-                
-                # Remove the silver dot after interaction
-                self.silver_dots.remove(silver_dot)
-                return True
-                
-        return False
+        # Interaction with the closest silver dot occurred
+        silver_dot = nearby[0][1]
+        changes = red_dot.interact_with_silver()
+        self.log_important_event(bee_index, f"🥈 Interacted with silver dot! Growing larger, moving slower (Size: {changes['new_size']:.2f}, Speed: {changes['new_speed']:.2f})")
+        
+        # Remove the silver dot after interaction
+        self.silver_dots.remove(silver_dot)
+        self.silver_index.remove(silver_dot)
+        return True
 
     def update_state(self):
+        self.collected = []
         if self.completed:
             return
 
@@ -296,6 +356,9 @@ class Move:
                 print(f"\nCYCLE COMPLETED: All bees have settled in the hive with nectar: {self.gold_collected}/{self.max_gold_collected}")
             return
             
+        # Give all idle bees their nectar in one batch
+        self.assign_idle_bees()
+
         # Process each red dot that hasn't settled yet
         for i, red_dot in enumerate(self.red_dots):
             # Skip bees that have already settled
@@ -322,18 +385,18 @@ class Move:
                         self.place_bee_in_hive(i, red_dot)
                     else:
                         # Add a larger jump away from the hive with randomization to prevent getting stuck
-                        jump_angle = random.uniform(0, 2 * math.pi)
-                        jump_distance = random.uniform(0.8, 1.2)  # Randomize distance too
+                        jump_angle = self.rng.uniform(0, 2 * math.pi)
+                        jump_distance = self.rng.uniform(0.8, 1.2)  # Randomize distance too
                         red_dot.position[0] += jump_distance * math.cos(jump_angle)
                         red_dot.position[1] += jump_distance * math.sin(jump_angle)
             else:
-                # Find a target if this dot doesn't have one
-                if i not in self.dot_targets or self.dot_targets[i] not in self.gold_dots:
+                # Find a target if this dot's nectar was taken earlier in this tick
+                if i not in self.dot_targets or self.dot_targets[i] not in self.gold_index:
                     gold_target = self.find_closest_gold_dot(red_dot)
                     if gold_target:
                         self.dot_targets[i] = gold_target
                         # Log targeting only occasionally to reduce spam
-                        if random.random() < 0.3:  # 30% chance to log
+                        if self.log_rng.random() < 0.3:  # 30% chance to log
                             target_pos = [round(p, 1) for p in gold_target.position]
                             self.log_important_event(i, f"🎯 Targeting nectar at {target_pos}")
                     else:
@@ -348,7 +411,8 @@ class Move:
                     # Collected gold dot
                     self.log_important_event(i, f"✨ Collected nectar ({self.gold_collected+1}/{self.max_gold_collected})")
                     
-                    self.gold_dots.remove(gold_target)
+                    self.remove_gold_dot(gold_target)
+                    self.collected.append((i, gold_target))
                     self.gold_collected += 1
                     self.dot_targets.pop(i)
                     self.returning_dots.add(i) 
\ No newline at end of file
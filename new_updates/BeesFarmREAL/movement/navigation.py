@@ -0,0 +1,309 @@
+import math
+from collections import OrderedDict
+import numpy as np
+from utils.constants import FLOWER_AREAS
+
+# 8-connected neighbourhood: (offset_x, offset_y, step cost in cells)
+NEIGHBOURS = [(dx, dy, math.hypot(dx, dy))
+              for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+class FlowField:
+    """
+    Shortest-path distance to one goal and the direction to fly from every
+    cell of the navigation grid. Unreachable and blocked cells have an
+    infinite distance and a zero direction.
+    """
+
+    def __init__(self, distance, dir_x, dir_y):
+        self.distance = distance
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+        self.reachable = np.isfinite(distance)
+
+
+class NavigationFields:
+    """
+    Cached flow fields over the landscape grid, one per static goal.
+
+    A field is computed once for each goal - the hive, a flower area or the
+    grid cell of a nectar dot - and then shared by every bee heading there,
+    so the cost of finding a way around the pond and the forbidden zone
+    grows with the number of goals instead of the number of bees. Fields
+    are only thrown away when the obstacles change (set_obstacle_field).
+    """
+
+    def __init__(self, obstacle_field, bounds=(0, 0, 15, 15), resolution=0.25, clearance=0.1,
+                 areas=FLOWER_AREAS, max_cached=256):
+        """
+        Parameters:
+        - obstacle_field: ObstacleField the bees have to fly around
+        - bounds: (x_min, y_min, x_max, y_max) area covered by the grid
+        - resolution: size of a navigation cell in landscape units
+        - clearance: cells closer than this to an obstacle are not passable
+        - areas: flower areas (position/width/height dicts) with a shared field
+        - max_cached: nectar cell fields kept before the oldest are dropped
+        """
+        self.bounds = bounds
+        self.resolution = resolution
+        self.clearance = clearance
+        self.areas = [dict(area) for area in areas]
+        self.max_cached = max_cached
+        self.shape = (int(math.ceil((bounds[2] - bounds[0]) / resolution)),
+                      int(math.ceil((bounds[3] - bounds[1]) / resolution)))
+
+        # Cell centres
+        xs = bounds[0] + (np.arange(self.shape[0]) + 0.5) * resolution
+        ys = bounds[1] + (np.arange(self.shape[1]) + 0.5) * resolution
+        self.grid_x, self.grid_y = np.meshgrid(xs, ys, indexing='ij')
+
+        self.fields = OrderedDict()  # key -> FlowField, least recently used first
+        self.pinned = set()          # Keys of warmed-up goals that are never evicted
+        self.builds = 0              # Number of fields computed so far
+        self.obstacle_field = None
+        self.set_obstacle_field(obstacle_field)
+
+    def set_obstacle_field(self, obstacle_field):
+        """Use a new obstacle field; cached fields are dropped only if it changed"""
+        if obstacle_field is self.obstacle_field and self.obstacle_field is not None:
+            return
+        self.obstacle_field = obstacle_field
+        if obstacle_field is None:
+            self.passable = np.ones(self.shape, dtype=bool)
+        else:
+            self.passable = obstacle_field.distance(self.grid_x, self.grid_y) > self.clearance
+        self.fields.clear()
+        # Pinned goals are rebuilt on their next use
+        print(f"🧭 Navigation grid {self.shape[0]}x{self.shape[1]} ready, {int(self.passable.sum())} passable cells")
+
+    # --- Goals -------------------------------------------------------------------
+
+    def cell_of(self, x, y):
+        """Grid cell containing (x, y), clamped to the grid"""
+        ix = int((x - self.bounds[0]) / self.resolution)
+        iy = int((y - self.bounds[1]) / self.resolution)
+        return (min(max(ix, 0), self.shape[0] - 1), min(max(iy, 0), self.shape[1] - 1))
+
+    def area_containing(self, position):
+        """Index of the flower area containing position, or None"""
+        x, y = position
+        for index, area in enumerate(self.areas):
+            ax, ay = area["position"]
+            if ax <= x <= ax + area["width"] and ay <= y <= ay + area["height"]:
+                return index
+        return None
+
+    def point_field(self, position):
+        """Field towards the grid cell of a single point (hive, nectar dot)"""
+        return self.cell_field(self.cell_of(*position))
+
+    def cell_field(self, cell):
+        """Field towards one grid cell (ix, iy)"""
+        key = ("cell",) + tuple(cell)
+        field = self._cached(key)
+        if field is None:
+            goal = np.zeros(self.shape, dtype=bool)
+            goal[key[1], key[2]] = True
+            field = self._store(key, self._build(goal))
+        return field
+
+    def area_field(self, index):
+        """Field towards any cell of flower area index"""
+        key = ("area", index)
+        field = self._cached(key)
+        if field is None:
+            area = self.areas[index]
+            ax, ay = area["position"]
+            goal = ((self.grid_x >= ax) & (self.grid_x <= ax + area["width"])
+                    & (self.grid_y >= ay) & (self.grid_y <= ay + area["height"]))
+            field = self._store(key, self._build(goal))
+        return field
+
+    def field_towards(self, position, target):
+        """
+        Field a bee at position should follow to reach target: the shared
+        flower area field until it is inside the target's area, then the
+        field of the target's own cell.
+        """
+        area = self.area_containing(target)
+        if area is not None and self.area_containing(position) != area:
+            return self.area_field(area)
+        return self.point_field(target)
+
+    def warm_up(self, points=()):
+        """Precompute (and pin) the fields of the given points and every flower area"""
+        keys = []
+        for index in range(len(self.areas)):
+            self.area_field(index)
+            keys.append(("area", index))
+        for point in points:
+            self.point_field(point)
+            keys.append(("cell",) + self.cell_of(*point))
+        self.pinned.update(keys)
+
+    def _cached(self, key):
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+        return field
+
+    def _store(self, key, field):
+        self.fields[key] = field
+        # Drop the least recently used nectar fields beyond the cache size
+        while len(self.fields) > self.max_cached + len(self.pinned):
+            for old_key in self.fields:
+                if old_key not in self.pinned:
+                    del self.fields[old_key]
+                    break
+            else:
+                break
+        return field
+
+    def _build(self, goal):
+        """Distance and direction fields from a boolean goal mask"""
+        self.builds += 1
+        nx, ny = self.shape
+        # Bees can always fly into their goal, even if it hugs an obstacle
+        open_cells = self.passable | goal
+
+        distance = np.full(self.shape, np.inf)
+        distance[goal] = 0.0
+
+        # Relax all 8 neighbours at once until nothing improves
+        padded = np.full((nx + 2, ny + 2), np.inf)
+        while True:
+            padded[1:-1, 1:-1] = distance
+            relaxed = distance.copy()
+            for dx, dy, cost in NEIGHBOURS:
+                np.minimum(relaxed, padded[1 + dx:nx + 1 + dx, 1 + dy:ny + 1 + dy] + cost, out=relaxed)
+            relaxed[~open_cells] = np.inf
+            if np.array_equal(relaxed, distance):
+                break
+            distance = relaxed
+
+        # Each cell points at its cheapest neighbour
+        padded[1:-1, 1:-1] = distance
+        candidates = np.stack([padded[1 + dx:nx + 1 + dx, 1 + dy:ny + 1 + dy] + cost
+                               for dx, dy, cost in NEIGHBOURS])
+        best = candidates.argmin(axis=0)
+        offsets = np.array([(dx / cost, dy / cost) for dx, dy, cost in NEIGHBOURS])
+        dir_x = offsets[best, 0]
+        dir_y = offsets[best, 1]
+
+        # Goal and unreachable cells have no direction of their own
+        still = goal | ~np.isfinite(distance)
+        dir_x[still] = 0.0
+        dir_y[still] = 0.0
+
+        return FlowField(distance * self.resolution, dir_x, dir_y)
+
+    # --- Lookups -----------------------------------------------------------------
+
+    def heading(self, field, x, y):
+        """
+        Unit direction of field at (x, y), blended over the four surrounding
+        cell centres. Returns None where no neighbouring cell has a direction.
+        """
+        fx = min(max((x - self.bounds[0]) / self.resolution - 0.5, 0.0), self.shape[0] - 1.000001)
+        fy = min(max((y - self.bounds[1]) / self.resolution - 0.5, 0.0), self.shape[1] - 1.000001)
+        ix = int(fx)
+        iy = int(fy)
+        tx = fx - ix
+        ty = fy - iy
+
+        dir_x = field.dir_x[ix:ix + 2, iy:iy + 2].tolist()
+        dir_y = field.dir_y[ix:ix + 2, iy:iy + 2].tolist()
+        hx = (dir_x[0][0] * (1 - tx) + dir_x[1][0] * tx) * (1 - ty) + (dir_x[0][1] * (1 - tx) + dir_x[1][1] * tx) * ty
+        hy = (dir_y[0][0] * (1 - tx) + dir_y[1][0] * tx) * (1 - ty) + (dir_y[0][1] * (1 - tx) + dir_y[1][1] * tx) * ty
+        length = math.hypot(hx, hy)
+        if length < 1e-6:
+            return None
+        return hx / length, hy / length
+
+    def headings(self, field, x, y):
+        """Vectorized heading(): returns (hx, hy, valid) arrays"""
+        fx = np.clip((x - self.bounds[0]) / self.resolution - 0.5, 0.0, self.shape[0] - 1.000001)
+        fy = np.clip((y - self.bounds[1]) / self.resolution - 0.5, 0.0, self.shape[1] - 1.000001)
+        ix = fx.astype(int)
+        iy = fy.astype(int)
+        tx = fx - ix
+        ty = fy - iy
+
+        blended = []
+        for grid in (field.dir_x, field.dir_y):
+            blended.append((grid[ix, iy] * (1 - tx) + grid[ix + 1, iy] * tx) * (1 - ty)
+                           + (grid[ix, iy + 1] * (1 - tx) + grid[ix + 1, iy + 1] * tx) * ty)
+        hx, hy = blended
+        length = np.hypot(hx, hy)
+        valid = length > 1e-6
+        length = np.where(valid, length, 1.0)
+        return hx / length, hy / length, valid
+
+    def heading_towards(self, position, target):
+        """
+        Direction a single bee at position should fly to reach target. Close
+        to the target, or where the field has no direction, it is the
+        straight line. Returns (hx, hy, distance) with distance in a straight line.
+        """
+        dx = target[0] - position[0]
+        dy = target[1] - position[1]
+        distance = math.hypot(dx, dy)
+        if distance == 0:
+            return 0.0, 0.0, 0.0
+        if distance > 2 * self.resolution:
+            heading = self.heading(self.field_towards(position, target), position[0], position[1])
+            if heading is not None:
+                return heading[0], heading[1], distance
+        return dx / distance, dy / distance, distance
+
+    def headings_towards(self, positions, targets):
+        """
+        Vectorized heading_towards() for an (n, 2) array of bees. Every bee
+        gets an integer key for the field it follows (the goal's cell, or
+        its flower area while it is outside that area), and bees are
+        grouped by one sort of those keys, so there is one field lookup per
+        field rather than per bee. Returns (hx, hy) arrays of unit
+        directions (zero on target).
+        """
+        delta = targets - positions
+        distances = np.hypot(delta[:, 0], delta[:, 1])
+        safe = np.where(distances > 0, distances, 1.0)
+        hx = delta[:, 0] / safe
+        hy = delta[:, 1] / safe
+
+        far = distances > 2 * self.resolution
+        if not far.any():
+            return hx, hy
+
+        idx = np.flatnonzero(far)
+        goals = targets[idx]
+        here = positions[idx]
+        # Cell number of the goal (as cell_of) ...
+        cx = np.clip(((goals[:, 0] - self.bounds[0]) / self.resolution).astype(np.int64), 0, self.shape[0] - 1)
+        cy = np.clip(((goals[:, 1] - self.bounds[1]) / self.resolution).astype(np.int64), 0, self.shape[1] - 1)
+        keys = cx * self.shape[1] + cy
+        # ... or -1 - area for bees still outside the flower area of their goal (as field_towards)
+        unmatched = np.ones(idx.size, dtype=bool)
+        for index, area in enumerate(self.areas):
+            in_area = unmatched & self._inside_area(goals, area)
+            unmatched &= ~in_area
+            keys[in_area & ~self._inside_area(here, area)] = -1 - index
+
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.append(starts[1:], keys.size)
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = int(keys[start])
+            field = self.area_field(-1 - key) if key < 0 else self.cell_field(divmod(key, self.shape[1]))
+            bees = idx[order[start:end]]
+            fx, fy, valid = self.headings(field, positions[bees, 0], positions[bees, 1])
+            hx[bees[valid]] = fx[valid]
+            hy[bees[valid]] = fy[valid]
+        return hx, hy
+
+    @staticmethod
+    def _inside_area(positions, area):
+        ax, ay = area["position"]
+        return ((positions[:, 0] >= ax) & (positions[:, 0] <= ax + area["width"])
+                & (positions[:, 1] >= ay) & (positions[:, 1] <= ay + area["height"]))
@@ -0,0 +1,207 @@
+import math
+import numpy as np
+
+
+def rectangle_sdf(x, y, position, size):
+    """Signed distance to an axis-aligned rectangle (negative inside)"""
+    x0, y0 = position
+    width, height = size
+    qx = np.maximum(x0 - x, x - (x0 + width))
+    qy = np.maximum(y0 - y, y - (y0 + height))
+    outside = np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0))
+    inside = np.minimum(np.maximum(qx, qy), 0.0)
+    return outside + inside
+
+
+def circle_sdf(x, y, center, radius):
+    """Signed distance to a circle (negative inside)"""
+    return np.hypot(x - center[0], y - center[1]) - radius
+
+
+class ObstacleField:
+    """
+    Rasterized signed-distance field (SDF) of the landscape obstacles.
+
+    The distance to the nearest obstacle edge (negative inside an obstacle)
+    and its gradient, which points away from the obstacle, are sampled once
+    on a regular grid. Lookups are bilinear and work on scalars or arrays,
+    so movement can test a position and find the way out of an obstacle with
+    one lookup.
+    """
+
+    def __init__(self, rectangles=(), circles=(), bounds=(0, 0, 15, 15), resolution=0.05, margin=1.0):
+        """
+        Parameters:
+        - rectangles: list of (position, size) pond-style rectangles
+        - circles: list of (center, radius) forbidden-zone circles
+        - bounds: (x_min, y_min, x_max, y_max) area to rasterize
+        - resolution: grid spacing in landscape units
+        - margin: extra border rasterized around bounds
+        """
+        self.rectangles = list(rectangles)
+        self.circles = list(circles)
+        self.resolution = resolution
+        self.origin = (bounds[0] - margin, bounds[1] - margin)
+
+        nx = int(np.ceil((bounds[2] - bounds[0] + 2 * margin) / resolution)) + 1
+        ny = int(np.ceil((bounds[3] - bounds[1] + 2 * margin) / resolution)) + 1
+        xs = self.origin[0] + np.arange(nx) * resolution
+        ys = self.origin[1] + np.arange(ny) * resolution
+        grid_x, grid_y = np.meshgrid(xs, ys, indexing='ij')
+
+        # Union of all obstacles is the minimum of their distances
+        sdf = np.full((nx, ny), np.inf)
+        for position, size in self.rectangles:
+            sdf = np.minimum(sdf, rectangle_sdf(grid_x, grid_y, position, size))
+        for center, radius in self.circles:
+            sdf = np.minimum(sdf, circle_sdf(grid_x, grid_y, center, radius))
+        if not np.isfinite(sdf).all():
+            # No obstacles at all - everything is far away
+            sdf = np.full((nx, ny), np.finfo(float).max / 4)
+
+        self.sdf = sdf
+        self.grad_x, self.grad_y = np.gradient(sdf, resolution)
+        self.shape = sdf.shape
+
+    def _bilinear(self, grids, x, y):
+        """Bilinearly interpolate each grid in grids at (x, y)"""
+        fx = (np.asarray(x, dtype=float) - self.origin[0]) / self.resolution
+        fy = (np.asarray(y, dtype=float) - self.origin[1]) / self.resolution
+        # Outside the raster the edge value is used
+        fx = np.clip(fx, 0, self.shape[0] - 1.000001)
+        fy = np.clip(fy, 0, self.shape[1] - 1.000001)
+        ix = fx.astype(int)
+        iy = fy.astype(int)
+        tx = fx - ix
+        ty = fy - iy
+
+        results = []
+        for grid in grids:
+            v00 = grid[ix, iy]
+            v10 = grid[ix + 1, iy]
+            v01 = grid[ix, iy + 1]
+            v11 = grid[ix + 1, iy + 1]
+            results.append((v00 * (1 - tx) + v10 * tx) * (1 - ty) + (v01 * (1 - tx) + v11 * tx) * ty)
+        return results
+
+    def _sample_scalar(self, x, y):
+        """Pure-Python bilinear lookup of (distance, grad_x, grad_y) for one point"""
+        fx = min(max((x - self.origin[0]) / self.resolution, 0.0), self.shape[0] - 1.000001)
+        fy = min(max((y - self.origin[1]) / self.resolution, 0.0), self.shape[1] - 1.000001)
+        ix = int(fx)
+        iy = int(fy)
+        tx = fx - ix
+        ty = fy - iy
+        w00 = (1 - tx) * (1 - ty)
+        w10 = tx * (1 - ty)
+        w01 = (1 - tx) * ty
+        w11 = tx * ty
+
+        values = []
+        for grid in (self.sdf, self.grad_x, self.grad_y):
+            cell = grid[ix:ix + 2, iy:iy + 2].tolist()
+            values.append(cell[0][0] * w00 + cell[1][0] * w10 + cell[0][1] * w01 + cell[1][1] * w11)
+        return values[0], values[1], values[2]
+
+    def distance(self, x, y):
+        """Signed distance to the nearest obstacle (negative inside)"""
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return self._sample_scalar(float(x), float(y))[0]
+        return self._bilinear((self.sdf,), x, y)[0]
+
+    def gradient(self, x, y):
+        """Gradient of the distance, pointing away from the nearest obstacle"""
+        return tuple(self._bilinear((self.grad_x, self.grad_y), x, y))
+
+    def sample(self, x, y):
+        """Distance and gradient in one lookup: (distance, grad_x, grad_y)"""
+        if np.ndim(x) == 0 and np.ndim(y) == 0:
+            return self._sample_scalar(float(x), float(y))
+        return tuple(self._bilinear((self.sdf, self.grad_x, self.grad_y), x, y))
+
+    def is_blocked(self, x, y):
+        """True where (x, y) is inside an obstacle"""
+        return self.distance(x, y) <= 0
+
+    def steer(self, origin_x, origin_y, heading_x, heading_y, step, clearance=0.05):
+        """
+        Move from origin along the unit heading by step, sliding along any
+        obstacle instead of entering it. Works on scalars or arrays.
+
+        When the step would end closer than clearance to an obstacle, the
+        component of the heading pointing into the obstacle is removed so the
+        bee follows the edge; if it still ends up inside, it is pushed back
+        out along the gradient. Returns (next_x, next_y).
+        """
+        if np.ndim(origin_x) == 0:
+            return self._steer_scalar(origin_x, origin_y, heading_x, heading_y, step, clearance)
+
+        next_x = origin_x + step * heading_x
+        next_y = origin_y + step * heading_y
+        dist, gx, gy = self.sample(next_x, next_y)
+        near = dist < clearance
+        if not np.any(near):
+            return next_x, next_y
+
+        # Outward normal of the nearest obstacle
+        norm = np.hypot(gx, gy)
+        norm = np.where(norm > 1e-9, norm, 1.0)
+        nx, ny = gx / norm, gy / norm
+
+        # Drop the part of the heading that points into the obstacle
+        into = heading_x * nx + heading_y * ny
+        into = np.where(near & (into < 0), into, 0.0)
+        slide_x = heading_x - into * nx
+        slide_y = heading_y - into * ny
+        slide_len = np.hypot(slide_x, slide_y)
+        # Head-on: pick the tangent so the bee goes around instead of stopping
+        head_on = slide_len < 1e-6
+        slide_x = np.where(head_on, -ny, slide_x / np.where(head_on, 1.0, slide_len))
+        slide_y = np.where(head_on, nx, slide_y / np.where(head_on, 1.0, slide_len))
+
+        next_x = np.where(near, origin_x + step * slide_x, next_x)
+        next_y = np.where(near, origin_y + step * slide_y, next_y)
+
+        # Anything that still ends inside is pushed out along the gradient
+        dist, gx, gy = self.sample(next_x, next_y)
+        inside = dist < clearance
+        if np.any(inside):
+            norm = np.hypot(gx, gy)
+            norm = np.where(norm > 1e-9, norm, 1.0)
+            push = np.where(inside, clearance - dist, 0.0)
+            next_x = next_x + push * gx / norm
+            next_y = next_y + push * gy / norm
+
+        return next_x, next_y
+
+    def _steer_scalar(self, origin_x, origin_y, heading_x, heading_y, step, clearance):
+        """steer() for a single bee, without NumPy call overhead"""
+        next_x = origin_x + step * heading_x
+        next_y = origin_y + step * heading_y
+        dist, gx, gy = self._sample_scalar(next_x, next_y)
+        if dist >= clearance:
+            return next_x, next_y
+
+        norm = math.hypot(gx, gy) or 1.0
+        nx, ny = gx / norm, gy / norm
+        into = heading_x * nx + heading_y * ny
+        if into < 0:
+            slide_x = heading_x - into * nx
+            slide_y = heading_y - into * ny
+        else:
+            slide_x, slide_y = heading_x, heading_y
+        slide_len = math.hypot(slide_x, slide_y)
+        if slide_len < 1e-6:
+            slide_x, slide_y = -ny, nx
+        else:
+            slide_x, slide_y = slide_x / slide_len, slide_y / slide_len
+
+        next_x = origin_x + step * slide_x
+        next_y = origin_y + step * slide_y
+        dist, gx, gy = self._sample_scalar(next_x, next_y)
+        if dist < clearance:
+            norm = math.hypot(gx, gy) or 1.0
+            push = clearance - dist
+            next_x += push * gx / norm
+            next_y += push * gy / norm
+        return next_x, next_y
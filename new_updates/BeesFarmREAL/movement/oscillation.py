@@ -0,0 +1,91 @@
+import numpy as np
+
+# Defaults match the original per-bee list based detector
+HISTORY_LENGTH = 20          # Positions remembered per bee
+OSCILLATION_WINDOW = 5       # Most recent positions compared against
+OSCILLATION_DISTANCE = 0.15  # Closer than this to a recent position counts as oscillating
+OSCILLATION_TRIGGER = 3      # Oscillations needed before the bee is nudged
+
+
+class OscillationDetector:
+    """
+    Detects bees moving back and forth between the same few positions.
+
+    Recent positions of every bee live in one preallocated
+    (bees x history x 2) ring buffer, so recording a position never
+    allocates, and the whole swarm can be checked with one broadcasted
+    distance computation. The rules are those of the old
+    Move.detect_oscillation: a position closer than OSCILLATION_DISTANCE to
+    one of the last OSCILLATION_WINDOW positions counts as an oscillation
+    (and is not recorded); after OSCILLATION_TRIGGER of them the bee is
+    reported and its count starts again.
+    """
+
+    def __init__(self, num_bees, history=HISTORY_LENGTH, window=OSCILLATION_WINDOW,
+                 threshold=OSCILLATION_DISTANCE, trigger=OSCILLATION_TRIGGER):
+        self.history = history
+        self.window = min(window, history)
+        self.threshold = threshold
+        self.trigger = trigger
+
+        self.buffer = np.zeros((num_bees, history, 2))
+        self.head = np.zeros(num_bees, dtype=np.int64)    # Next slot to write per bee
+        self.filled = np.zeros(num_bees, dtype=np.int64)  # Valid entries per bee
+        self.counts = np.zeros(num_bees, dtype=np.int64)  # Oscillations seen per bee
+
+        # Slots of the last `window` entries for every possible head position
+        self._recent = (np.arange(history)[:, None] - 1 - np.arange(self.window)[None, :]) % history
+
+    def reset(self, bees=None):
+        """Forget the history of the given bees (all bees by default)"""
+        if bees is None:
+            bees = slice(None)
+        self.head[bees] = 0
+        self.filled[bees] = 0
+        self.counts[bees] = 0
+
+    def check(self, bee, position):
+        """Record one bee's new position; True if it should break an oscillation"""
+        x, y = position[0], position[1]
+        if self.filled[bee] >= self.window:
+            recent = self.buffer[bee, self._recent[self.head[bee]]]
+            if (np.hypot(recent[:, 0] - x, recent[:, 1] - y) < self.threshold).any():
+                self.counts[bee] += 1
+                if self.counts[bee] >= self.trigger:
+                    self.counts[bee] = 0
+                    return True
+                return False
+
+        head = self.head[bee]
+        self.buffer[bee, head, 0] = x
+        self.buffer[bee, head, 1] = y
+        self.head[bee] = (head + 1) % self.history
+        self.filled[bee] = min(self.filled[bee] + 1, self.history)
+        return False
+
+    def check_many(self, bees, positions):
+        """
+        Vectorized check() for an array of distinct bee indices and their
+        (n, 2) new positions. Returns a boolean mask of the bees to nudge.
+        """
+        close = np.zeros(bees.size, dtype=bool)
+        ready = self.filled[bees] >= self.window
+        if ready.any():
+            checked = bees[ready]
+            recent = self.buffer[checked[:, None], self._recent[self.head[checked]]]
+            dx = recent[..., 0] - positions[ready, 0, None]
+            dy = recent[..., 1] - positions[ready, 1, None]
+            close[ready] = (np.hypot(dx, dy) < self.threshold).any(axis=1)
+
+        oscillating = bees[close]
+        self.counts[oscillating] += 1
+        triggered = np.zeros(bees.size, dtype=bool)
+        triggered[close] = self.counts[oscillating] >= self.trigger
+        self.counts[bees[triggered]] = 0
+
+        # Only positions that were not oscillations are recorded
+        recorded = bees[~close]
+        self.buffer[recorded, self.head[recorded]] = positions[~close]
+        self.head[recorded] = (self.head[recorded] + 1) % self.history
+        self.filled[recorded] = np.minimum(self.filled[recorded] + 1, self.history)
+        return triggered
@@ -0,0 +1,26 @@
+import numpy as np
+
+# Settled bees sit on a grid next to the hive drop-off point, which is on the
+# left edge of the (3 x 3) hive, 2 above its bottom. The grid is
+# SETTLE_COLUMNS wide; its rows first fill upwards to the top of the hive
+# (the original layout), then downwards into it. Every slot is inside the
+# hive and within 1.7 of the drop-off point, well inside the 2.0 the
+# completion checks allow. Bigger colonies wrap around and share slots.
+SETTLE_SPACING = 0.25
+SETTLE_COLUMNS = 3
+SETTLE_ROWS = (1, 2, 3, 0, -1, -2, -3, -4, -5, -6)  # In units of SETTLE_SPACING
+SETTLE_SLOTS = SETTLE_COLUMNS * len(SETTLE_ROWS)
+
+
+def settle_offsets(bee_indices):
+    """(n, 2) offsets from the drop-off point of the settle slots of the given bees"""
+    slot = np.asarray(bee_indices) % SETTLE_SLOTS
+    columns = slot % SETTLE_COLUMNS + 1
+    rows = np.asarray(SETTLE_ROWS)[slot // SETTLE_COLUMNS]
+    return np.stack([columns, rows], axis=-1) * SETTLE_SPACING
+
+
+def settle_position(bee_index, drop_position):
+    """[x, y] where bee bee_index settles in the hive with the given drop-off point"""
+    dx, dy = settle_offsets(bee_index).tolist()
+    return [drop_position[0] + dx, drop_position[1] + dy]
@@ -0,0 +1,132 @@
+import math
+
+
+class SpatialHash:
+    """
+    Uniform-grid spatial index over dots (anything with a .position).
+
+    Items are bucketed by the grid cell containing their position, so radius
+    and nearest-neighbour queries only look at the cells around the query
+    point instead of every dot. Items can be inserted and removed one at a
+    time as nectar is collected or regenerated.
+    """
+
+    def __init__(self, items=(), cell_size=1.0):
+        self.cell_size = cell_size
+        self.buckets = {}     # (cell_x, cell_y) -> {item: (x, y)}
+        self.item_cells = {}  # item -> (cell_x, cell_y)
+        self.bounds = None    # Occupied cell range; only grows until clear()
+        for item in items:
+            self.insert(item)
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def __iter__(self):
+        return iter(self.item_cells)
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, item, position=None):
+        """Add an item (at item.position unless a position is given)"""
+        if item in self.item_cells:
+            self.remove(item)
+        x, y = position if position is not None else item.position
+        cell = self._cell(x, y)
+        self.buckets.setdefault(cell, {})[item] = (x, y)
+        self.item_cells[item] = cell
+        if self.bounds is None:
+            self.bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            self.bounds[0] = min(self.bounds[0], cell[0])
+            self.bounds[1] = min(self.bounds[1], cell[1])
+            self.bounds[2] = max(self.bounds[2], cell[0])
+            self.bounds[3] = max(self.bounds[3], cell[1])
+
+    def remove(self, item):
+        """Remove an item; missing items are ignored"""
+        cell = self.item_cells.pop(item, None)
+        if cell is None:
+            return
+        bucket = self.buckets[cell]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[cell]
+
+    def clear(self):
+        self.buckets.clear()
+        self.item_cells.clear()
+        self.bounds = None
+
+    def query_radius(self, position, radius):
+        """Return [(distance, item)] for items strictly closer than radius, nearest first"""
+        x, y = position
+        min_cx, min_cy = self._cell(x - radius, y - radius)
+        max_cx, max_cy = self._cell(x + radius, y + radius)
+
+        found = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self.buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for item, (ix, iy) in bucket.items():
+                    distance = math.hypot(ix - x, iy - y)
+                    if distance < radius:
+                        found.append((distance, item))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(self, position, k=1, predicate=None):
+        """
+        Return up to k [(distance, item)] pairs closest to position, nearest
+        first. If predicate is given only items for which it returns True count.
+
+        Searches square rings of cells outwards from the query cell and stops
+        once the k-th best distance is closer than anything an unvisited ring
+        could contain.
+        """
+        if not self.item_cells:
+            return []
+
+        x, y = position
+        qx, qy = self._cell(x, y)
+
+        # Largest ring that can still contain an item
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        max_ring = max(0, qx - min_cx, max_cx - qx, qy - min_cy, max_cy - qy)
+
+        best = []
+        for ring in range(max_ring + 1):
+            # Any item in this ring is at least (ring - 1) cells away
+            if len(best) >= k and best[k - 1][0] <= (ring - 1) * self.cell_size:
+                break
+            for cell in self._ring_cells(qx, qy, ring):
+                bucket = self.buckets.get(cell)
+                if not bucket:
+                    continue
+                for item, (ix, iy) in bucket.items():
+                    if predicate is not None and not predicate(item):
+                        continue
+                    best.append((math.hypot(ix - x, iy - y), item))
+            best.sort(key=lambda pair: pair[0])
+            del best[k:]
+
+        return best
+
+    @staticmethod
+    def _ring_cells(qx, qy, ring):
+        """Cells on the square ring at Chebyshev distance ring from (qx, qy)"""
+        if ring == 0:
+            yield (qx, qy)
+            return
+        for cx in range(qx - ring, qx + ring + 1):
+            yield (cx, qy - ring)
+            yield (cx, qy + ring)
+        for cy in range(qy - ring + 1, qy + ring):
+            yield (qx - ring, cy)
+            yield (qx + ring, cy)
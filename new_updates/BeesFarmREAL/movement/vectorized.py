@@ -0,0 +1,461 @@
+import numpy as np
+from utils.constants import DEBUG_VERBOSE
+from movement.assignment import assign_nectar
+from movement.oscillation import OscillationDetector
+from movement.settling import settle_offsets
+from utils.rng import get_stream
+
+# Worker bee states stored in VectorizedMove.states
+SEEKING = 0     # Flying to (or looking for) a nectar target
+RETURNING = 1   # Carrying nectar back to the hive
+SETTLED = 2     # Resting inside the hive
+
+# Distance at which a bee reaches nectar, a silver dot or the hive
+ARRIVAL_DISTANCE = 0.6
+SILVER_INTERACTION_DISTANCE = 0.6
+MAX_DETOUR_ATTEMPTS = 5
+
+
+def blocked_mask(x, y, pond_position, pond_size, forbidden_zone_func=None):
+    """Vectorized pond / forbidden zone test for arrays of coordinates"""
+    px, py = pond_position
+    pw, ph = pond_size
+    blocked = (px <= x) & (x <= px + pw) & (py <= y) & (y <= py + ph)
+    if forbidden_zone_func is not None:
+        blocked |= np.asarray(forbidden_zone_func(x, y), dtype=bool)
+    return blocked
+
+
+def step_towards(positions, targets, step_sizes, is_blocked, rng, avoidance_angle_offset=1.2, obstacle_field=None,
+                 headings=None):
+    """
+    Advance every bee one step towards its target, with the same obstacle
+    handling as Move.move_towards: slide along the obstacle_field if one is
+    given, otherwise up to five widening detours, then a random emergency
+    escape, otherwise stay in place. headings, an (hx, hy) pair of unit
+    direction arrays, replaces the straight line to the targets.
+
+    Returns (new_positions, distances) where distances are measured before
+    moving, exactly like Move.move_towards.
+    """
+    delta = targets - positions
+    distances = np.hypot(delta[:, 0], delta[:, 1])
+    if headings is not None:
+        delta = np.column_stack(headings)
+
+    if obstacle_field is not None:
+        moving = distances > 0
+        norm = np.hypot(delta[:, 0], delta[:, 1])
+        safe = np.where(norm > 0, norm, 1.0)
+        next_x, next_y = obstacle_field.steer(
+            positions[:, 0], positions[:, 1], delta[:, 0] / safe, delta[:, 1] / safe, step_sizes)
+        new_positions = np.column_stack((next_x, next_y))
+        new_positions[~moving] = positions[~moving]
+        return new_positions, distances
+
+    angles = np.arctan2(delta[:, 1], delta[:, 0])
+
+    new_positions = positions + step_sizes[:, None] * np.column_stack((np.cos(angles), np.sin(angles)))
+
+    # Bees already on their target don't move
+    moving = distances > 0
+    new_positions[~moving] = positions[~moving]
+
+    blocked = moving & is_blocked(new_positions[:, 0], new_positions[:, 1])
+    if blocked.any():
+        idx = np.flatnonzero(blocked)
+        origin = positions[idx]
+        step = step_sizes[idx]
+
+        # All detour attempts at once: (blocked bees, attempts)
+        attempts = np.arange(MAX_DETOUR_ATTEMPTS)
+        detour_angles = (angles[idx, None]
+                         + avoidance_angle_offset * (1 + 0.5 * attempts)[None, :]
+                         + rng.uniform(-0.3, 0.3, size=(idx.size, MAX_DETOUR_ATTEMPTS)))
+        radii = step[:, None] * (2.0 + 0.5 * attempts)[None, :]
+        cand_x = origin[:, 0, None] + radii * np.cos(detour_angles)
+        cand_y = origin[:, 1, None] + radii * np.sin(detour_angles)
+        valid = ~is_blocked(cand_x, cand_y)
+
+        has_detour = valid.any(axis=1)
+        first_valid = valid.argmax(axis=1)
+        rows = np.arange(idx.size)
+        chosen = np.column_stack((cand_x[rows, first_valid], cand_y[rows, first_valid]))
+
+        # Emergency escape in a random direction with a larger step
+        escape = ~has_detour
+        if escape.any():
+            emergency_angles = rng.uniform(0, 2 * np.pi, size=escape.sum())
+            emergency_step = step[escape] * 3.0
+            escape_pos = origin[escape] + emergency_step[:, None] * np.column_stack(
+                (np.cos(emergency_angles), np.sin(emergency_angles)))
+            # Final safety check - if still blocked, don't move at all
+            still_blocked = is_blocked(escape_pos[:, 0], escape_pos[:, 1])
+            escape_pos[still_blocked] = origin[escape][still_blocked]
+            chosen[escape] = escape_pos
+
+        new_positions[idx] = chosen
+
+    return new_positions, distances
+
+
+def random_steps(origin, step, is_blocked, rng):
+    """Random-direction escape moves, as Move does for oscillating bees"""
+    angle = rng.uniform(0, 2 * np.pi, size=len(origin))
+    result = origin + step[:, None] * np.column_stack((np.cos(angle), np.sin(angle)))
+
+    # Blocked: try a different angle with a larger step, otherwise stay in place
+    blocked = is_blocked(result[:, 0], result[:, 1])
+    if blocked.any():
+        angle = rng.uniform(0, 2 * np.pi, size=blocked.sum())
+        retry = origin[blocked] + 1.5 * step[blocked, None] * np.column_stack((np.cos(angle), np.sin(angle)))
+        still_blocked = is_blocked(retry[:, 0], retry[:, 1])
+        retry[still_blocked] = origin[blocked][still_blocked]
+        result[blocked] = retry
+    return result
+
+
+class VectorizedMove:
+    """
+    Structure-of-arrays alternative to Move.
+
+    Positions, speed modifiers, sizes, targets and states of all worker bees
+    live in contiguous NumPy arrays and each update_state() advances the whole
+    swarm in a handful of vectorized operations. The seek, collect, return and
+    settle rules are the same as Move; bees that reach the same nectar or
+    silver dot in the same tick are resolved in bee order, as Move's loop does.
+
+    The public attributes used by the rest of the simulation (gold_collected,
+    gold_dots, silver_dots, settled_dots, returning_dots, dot_targets,
+    completed, reset_for_new_cycle, ...) match Move. With write_back=True the
+    CircleDot objects in red_dots are kept in sync after every tick so the
+    renderers keep working; large headless runs can turn it off.
+    """
+
+    def __init__(self, red_dots, gold_dots, beehive_position, max_gold_collected, pond_position, pond_size,
+                 forbidden_zone_func=None, silver_dots=None, write_back=True, rng=None, obstacle_field=None,
+                 navigation=None, last_beehive_position=(12, 2)):
+        self.red_dots = red_dots
+        self.beehive_position = beehive_position
+        self.last_beehive_position = last_beehive_position
+        self.max_gold_collected = max_gold_collected
+        self.gold_collected = 0
+        self.collected = []  # (bee index, gold dot) collected during the last update_state
+        self.completed = False
+        self.pond_position = pond_position
+        self.pond_size = pond_size
+        self.forbidden_zone_func = forbidden_zone_func
+        self.obstacle_field = obstacle_field
+        self.navigation = navigation
+        if navigation is not None:
+            navigation.warm_up([beehive_position, self.last_beehive_position])
+        self.avoidance_angle_offset = 1.2
+        self.write_back = write_back
+        self.rng = rng if rng is not None else get_stream("movement").generator
+        self.cycles_completed = 0
+
+        # Per-bee arrays
+        n = len(red_dots)
+        self.positions = np.zeros((n, 2))
+        self.speed_modifiers = np.ones(n)
+        self.sizes = np.full(n, 0.1)
+        self.original_sizes = np.full(n, 0.1)
+        self.max_sizes = np.full(n, 0.35)
+        self.silver_interactions = np.zeros(n, dtype=np.int64)
+        self.targets = np.full(n, -1, dtype=np.int64)  # Index into gold_positions
+        self.states = np.full(n, SEEKING, dtype=np.int8)
+        self.oscillation = OscillationDetector(n)
+        self._settled_cache = None
+        self._needs_pull = True
+        self.pull_from_dots()
+
+        # Nectar and silver arrays (alive masks allow O(1) removal)
+        self.gold_dots = gold_dots
+        self.silver_dots = silver_dots or []
+
+        print(f"Initializing vectorized simulation with {n} bees")
+
+    # --- Nectar / silver storage -------------------------------------------------
+
+    @property
+    def gold_dots(self):
+        return self._gold_dots
+
+    @gold_dots.setter
+    def gold_dots(self, dots):
+        self._gold_dots = dots
+        self._gold_slots = list(dots)  # Slot j of the arrays is _gold_slots[j]
+        self.gold_positions = np.array([d.position for d in dots], dtype=float).reshape(-1, 2)
+        self.gold_alive = np.ones(len(dots), dtype=bool)
+        self.targets[:] = -1
+
+    def remove_gold_dot(self, gold_dot):
+        """Remove a nectar dot (collected elsewhere) from the field"""
+        j = self._gold_slots.index(gold_dot)
+        if self.gold_alive[j]:
+            self.gold_alive[j] = False
+            self._gold_dots.remove(gold_dot)
+
+    @property
+    def silver_dots(self):
+        return self._silver_dots
+
+    @silver_dots.setter
+    def silver_dots(self, dots):
+        self._silver_dots = dots
+        self._silver_slots = list(dots)
+        self.silver_positions = np.array([d.position for d in dots], dtype=float).reshape(-1, 2)
+        self.silver_alive = np.ones(len(dots), dtype=bool)
+
+    def remove_silver_dot(self, silver_dot):
+        """Remove a silver dot (used elsewhere) from the field"""
+        j = self._silver_slots.index(silver_dot)
+        if self.silver_alive[j]:
+            self.silver_alive[j] = False
+            self._silver_dots.remove(silver_dot)
+
+    # --- Move-compatible views ---------------------------------------------------
+
+    @property
+    def settled_dots(self):
+        # Cached per tick: renderers test membership once per bee
+        if self._settled_cache is None:
+            self._settled_cache = set(np.flatnonzero(self.states == SETTLED).tolist())
+        return self._settled_cache
+
+    @property
+    def returning_dots(self):
+        return set(np.flatnonzero(self.states == RETURNING).tolist())
+
+    @property
+    def dot_targets(self):
+        return {i: self._gold_slots[t] for i, t in enumerate(self.targets.tolist()) if t >= 0}
+
+    def bee_positions(self):
+        return self.positions
+
+    def pull_from_dots(self):
+        """Load positions and silver attributes from the CircleDot objects"""
+        if not self.red_dots:
+            return
+        self.positions[:] = [dot.position for dot in self.red_dots]
+        self.speed_modifiers[:] = [getattr(dot, 'speed_modifier', 1.0) for dot in self.red_dots]
+        self.sizes[:] = [getattr(dot, 'current_size', 0.1) for dot in self.red_dots]
+        self.original_sizes[:] = [getattr(dot, 'original_size', 0.1) for dot in self.red_dots]
+        self.max_sizes[:] = [getattr(dot, 'max_size', 0.35) for dot in self.red_dots]
+        self.silver_interactions[:] = [getattr(dot, 'silver_interactions', 0) for dot in self.red_dots]
+        self._needs_pull = False
+
+    def push_to_dots(self, indices=None):
+        """Write positions (and silver attributes of the given bees) back to the CircleDots"""
+        for dot, position in zip(self.red_dots, self.positions.tolist()):
+            dot.position = position
+        if indices is not None:
+            for i in indices.tolist():
+                dot = self.red_dots[i]
+                dot.current_size = float(self.sizes[i])
+                dot.speed_modifier = float(self.speed_modifiers[i])
+                dot.silver_interactions = int(self.silver_interactions[i])
+
+    # --- Simulation --------------------------------------------------------------
+
+    def revoke_collection(self, bee_index):
+        """Undo a collection another colony won; the bee goes back to seeking"""
+        self.gold_collected -= 1
+        if self.states[bee_index] == RETURNING:
+            self.states[bee_index] = SEEKING
+
+    def reset_for_new_cycle(self):
+        """Reset the relevant state variables for a new nectar cycle"""
+        self.gold_collected = 0
+        self.states[:] = SEEKING
+        self.targets[:] = -1
+        self._settled_cache = None
+        self.completed = False
+        self.cycles_completed += 1
+
+        # regenerate_nectar repositions the CircleDots after this call
+        self._needs_pull = True
+        print(f"Move state reset for nectar cycle {self.cycles_completed + 1}")
+
+    def are_all_nectar_collected(self):
+        """Check if all nectar has been collected from the field"""
+        return not self.gold_alive.any() or self.gold_collected >= self.max_gold_collected
+
+    def is_blocked(self, x, y):
+        if self.obstacle_field is not None:
+            return self.obstacle_field.is_blocked(x, y)
+        return blocked_mask(x, y, self.pond_position, self.pond_size, self.forbidden_zone_func)
+
+    def _step_sizes(self, idx, step_size=0.4):
+        return step_size * self.speed_modifiers[idx]
+
+    def _move(self, idx, targets):
+        """Move the bees in idx towards targets; returns pre-move distances"""
+        positions = self.positions[idx]
+        headings = None
+        if self.navigation is not None:
+            # One flow field lookup per distinct goal
+            headings = self.navigation.headings_towards(positions, np.asarray(targets, dtype=float))
+        new_positions, distances = step_towards(
+            positions, targets, self._step_sizes(idx),
+            self.is_blocked, self.rng, self.avoidance_angle_offset, self.obstacle_field, headings)
+
+        # Bees stuck going back and forth take a random step instead
+        moving = distances > 0
+        oscillating = np.zeros(idx.size, dtype=bool)
+        oscillating[moving] = self.oscillation.check_many(idx[moving], new_positions[moving])
+        if oscillating.any():
+            new_positions[oscillating] = random_steps(
+                positions[oscillating], self._step_sizes(idx[oscillating]), self.is_blocked, self.rng)
+            if DEBUG_VERBOSE:
+                print(f"⚠️ {int(oscillating.sum())} bees oscillating! Breaking cycle with random movement")
+
+        self.positions[idx] = new_positions
+        return distances
+
+    def _settle(self, idx):
+        """Place bees at their fixed grid position inside the hive"""
+        self.positions[idx] = np.asarray(self.beehive_position, dtype=float) + settle_offsets(idx)
+        self.states[idx] = SETTLED
+
+    def _check_silver_interactions(self, active):
+        """Grow and slow down bees that touch a silver dot; each dot is used once"""
+        if not self.silver_alive.any() or active.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        silver_idx = np.flatnonzero(self.silver_alive)
+        delta = self.positions[active, None, :] - self.silver_positions[None, silver_idx, :]
+        close = np.hypot(delta[..., 0], delta[..., 1]) < SILVER_INTERACTION_DISTANCE
+
+        touching = close.any(axis=1)
+        if not touching.any():
+            return np.empty(0, dtype=np.int64)
+
+        # Each bee touches its first silver dot; each silver dot goes to the first bee
+        bees = active[touching]
+        dots = silver_idx[close[touching].argmax(axis=1)]
+        dots, first = np.unique(dots, return_index=True)
+        bees = bees[first]
+
+        self.silver_alive[dots] = False
+        self.silver_interactions[bees] += 1
+        k = self.silver_interactions[bees]
+        growth = np.minimum(1.5 ** k, self.max_sizes[bees] / self.original_sizes[bees])
+        self.sizes[bees] = self.original_sizes[bees] * growth
+        self.speed_modifiers[bees] = np.maximum(0.25, 1.0 - 0.25 * k)
+
+        # Keep the silver dot list in sync for the renderers
+        for j in dots.tolist():
+            self._silver_dots.remove(self._silver_slots[j])
+
+        if DEBUG_VERBOSE:
+            print(f"🥈 {bees.size} bees interacted with silver dots")
+        return bees
+
+    def _assign_targets(self, needy):
+        """
+        Match the bees in needy to the nectar no other bee is targeting in one
+        batch, minimizing the total flight distance. When there is more need
+        than nectar, the bees left over share the nearest nectar.
+        """
+        alive = np.flatnonzero(self.gold_alive)
+        if alive.size == 0:
+            return
+
+        targeted = np.zeros(self.gold_alive.size, dtype=bool)
+        targeted[self.targets[self.targets >= 0]] = True
+        free = alive[~targeted[alive]]
+
+        choice = assign_nectar(self.positions[needy], self.gold_positions[free])
+        matched = choice >= 0
+        self.targets[needy[matched]] = free[choice[matched]]
+
+        leftover = needy[~matched]
+        if leftover.size:
+            delta = self.positions[leftover, None, :] - self.gold_positions[None, alive, :]
+            self.targets[leftover] = alive[np.hypot(delta[..., 0], delta[..., 1]).argmin(axis=1)]
+
+    def _collect(self, bees):
+        """Collect the nectar targeted by bees; each nectar goes to the first bee"""
+        nectar, first = np.unique(self.targets[bees], return_index=True)
+        winners = bees[first]
+        losers = np.setdiff1d(bees, winners, assume_unique=True)
+
+        self.gold_alive[nectar] = False
+        self.gold_collected += winners.size
+        self.states[winners] = RETURNING
+        self.targets[winners] = -1
+        # Bees that arrived at an already-collected nectar pick a new one next tick
+        self.targets[losers] = -1
+
+        # Keep the gold dot list in sync for the renderers
+        for bee, j in zip(winners.tolist(), nectar.tolist()):
+            self._gold_dots.remove(self._gold_slots[j])
+            self.collected.append((bee, self._gold_slots[j]))
+
+    def update_state(self):
+        self.collected = []
+        if self.completed:
+            return
+
+        if self._needs_pull:
+            self.pull_from_dots()
+
+        grown = None
+        if self.gold_collected >= self.max_gold_collected:
+            # Everyone not settled heads back to the hive entrance
+            active = np.flatnonzero(self.states != SETTLED)
+            self.states[active] = RETURNING
+            if active.size == 0:
+                self.completed = True
+                print(f"\nCYCLE COMPLETED: All bees have settled in the hive with nectar: {self.gold_collected}/{self.max_gold_collected}")
+            else:
+                target = np.broadcast_to(np.asarray(self.last_beehive_position, dtype=float), (active.size, 2))
+                distances = self._move(active, target)
+                self._settle(active[distances < ARRIVAL_DISTANCE])
+        else:
+            active = np.flatnonzero(self.states != SETTLED)
+            grown = self._check_silver_interactions(active)
+
+            # Returning bees fly home
+            returning = active[self.states[active] == RETURNING]
+            if returning.size:
+                target = np.broadcast_to(np.asarray(self.beehive_position, dtype=float), (returning.size, 2))
+                distances = self._move(returning, target)
+                arrived = returning[distances < ARRIVAL_DISTANCE]
+                if arrived.size:
+                    if self.are_all_nectar_collected():
+                        self._settle(arrived)
+                    else:
+                        # Jump away from the hive to avoid getting stuck, then seek again
+                        self.states[arrived] = SEEKING
+                        jump_angle = self.rng.uniform(0, 2 * np.pi, size=arrived.size)
+                        jump_distance = self.rng.uniform(0.8, 1.2, size=arrived.size)
+                        self.positions[arrived, 0] += jump_distance * np.cos(jump_angle)
+                        self.positions[arrived, 1] += jump_distance * np.sin(jump_angle)
+
+            # Seeking bees (re)target and fly to nectar
+            seeking = active[self.states[active] == SEEKING]
+            if seeking.size:
+                has_target = self.targets[seeking] >= 0
+                has_target[has_target] = self.gold_alive[self.targets[seeking[has_target]]]
+                needy = seeking[~has_target]
+                self.targets[needy] = -1
+                if needy.size:
+                    self._assign_targets(needy)
+
+                # No nectar left to target - return to the hive
+                no_target = seeking[self.targets[seeking] < 0]
+                self.states[no_target] = RETURNING
+
+                flying = seeking[self.targets[seeking] >= 0]
+                if flying.size:
+                    distances = self._move(flying, self.gold_positions[self.targets[flying]])
+                    arrived = flying[distances < ARRIVAL_DISTANCE]
+                    if arrived.size:
+                        self._collect(arrived)
+
+        self._settled_cache = None
+        if self.write_back:
+            self.push_to_dots(grown)
@@ -1,16 +1,27 @@
-import time
-import random
-from simulation.simulation_config import SIMULATION_COMPLETE, COLS, ROWS, OFFSET_X, OFFSET_Y, WAIT_BETWEEN_CYCLES
-from simulation.utils import distance, debug_bee_position, check_simulation_completed
-from utils.helpers import regenerate_nectar
+from simulation.simulation_config import COLS, ROWS, OFFSET_X, OFFSET_Y
+from simulation.utils import distance, debug_bee_position
+from utils.rng import get_stream
+from simulation.shared_state import SETTLED
+from visualization.blitting import BlitManager
 
 class AnimationHandler:
-    def __init__(self, landscape, circle_markers, triangle_markers, square_markers, 
+    """
+    Renders a SimulationEngine onto the beehive view.
+    
+    The engine runs on a SimulationThread that publishes snapshots into a
+    SnapshotBuffer. FuncAnimation calls update() once per frame on the GUI
+    thread, which takes the latest snapshot and hands it to render(); the
+    engine itself is never touched from here. The artists are drawn by a
+    BlitManager, which only redraws the view when one of them changed.
+    """
+    def __init__(self, engine, buffer, circle_markers, triangle_markers, square_markers, 
                  hexagon_grid, bee_status, timestamp_text, nectar_status, 
-                 bee_sizes_text, total_nectar_text, total_box, screenshot_manager=None,
-                 target_timesteps=None):
+                 bee_sizes_text, total_nectar_text, total_box, screenshot_manager=None, blitter=None):
         
-        self.landscape = landscape
+        self.engine = engine
+        self.buffer = buffer
+        self.landscape = engine.landscape
+        self.rng = get_stream("comb")  # Comb placement and idle jitter
         self.circle_markers = circle_markers
         self.triangle_markers = triangle_markers
         self.square_markers = square_markers
@@ -23,22 +34,10 @@ class AnimationHandler:
         self.total_box = total_box
         self.screenshot_manager = screenshot_manager
         
-        # Store the original target timesteps for reporting
-        self.target_timesteps = target_timesteps or landscape.max_timesteps
-        
-        # Start time tracking
-        self.start_time = time.time()
-        
-        # Create a list of all artists for blitting
-        self.all_artists = self.create_artist_list()
-        
-        # Initialize tracking variables
-        self.last_nectar_count = 0
-        self.is_nectar_exhausted = False
-        self.nectar_cycle_count = 1
-        self.total_nectar_collected = 0
-        self.waiting_for_next_cycle = False
-        self.cycle_complete_time = None
+        # Register every artist for blitting
+        self.blitter = blitter or BlitManager(hexagon_grid.collection.figure.canvas)
+        self.register_artists()
+        self.baby_bees_registered = 0  # Baby bee markers already handed to the blitter
         
         # Initialize bee tracking variables together
         self.bee_comb_positions = {}  # Dictionary to store bee positions in the comb
@@ -51,305 +50,213 @@ class AnimationHandler:
             'last_debug_frame': 0,
             'last_nectar_debug': 0
         }
+        self.frame = 0
+        self.show_debug = False
+        self.finished = False
     
-    def create_artist_list(self):
-        all_artists = []
+    def register_artists(self):
+        blitter = self.blitter
         
-        # First, add all hexagon patches
-        for row in self.hexagon_grid:
-            for hex_patch in row:
-                all_artists.append(hex_patch)
+        # First, the honeycomb (one collection for every cell)
+        blitter.add(self.hexagon_grid.collection)
         
         # Add all marker objects
         for marker in self.circle_markers:
             if marker.circle:
-                all_artists.append(marker.circle)
+                blitter.add(marker.circle)
         
         for marker in self.triangle_markers:
             if marker.triangle:
-                all_artists.append(marker.triangle)
+                blitter.add(marker.triangle)
                 
         for marker in self.square_markers:
             if marker.rectangle:
-                all_artists.append(marker.rectangle)
+                blitter.add(marker.rectangle)
         
         # Add text elements
-        all_artists.append(self.timestamp_text)
-        all_artists.append(self.nectar_status)
-        all_artists.append(self.bee_sizes_text)
-        all_artists.append(self.bee_status)
-        all_artists.append(self.total_nectar_text)
-        all_artists.append(self.total_box)  # Add the background box for total nectar
-        
-        return all_artists
+        blitter.add(self.total_box)  # The background box for total nectar, under its text
+        blitter.add(self.timestamp_text)
+        blitter.add(self.nectar_status)
+        blitter.add(self.bee_sizes_text)
+        blitter.add(self.bee_status)
+        blitter.add(self.total_nectar_text)
         
     def update(self, frame):
-        global SIMULATION_COMPLETE
-        
-        # Get real elapsed time for accurate timing
-        elapsed_time = time.time() - self.start_time
-        formatted_time = f"{elapsed_time:.1f}"
-        
+        """Draw the latest snapshot; returns the artists that had to be redrawn"""
         # If simulation is complete, don't update anything - stop everything
-        if SIMULATION_COMPLETE:
-            # Stop screenshot timer if it exists
-            if self.screenshot_manager:
-                self.screenshot_manager.stop_timer()
-            # Just return all_artists to keep the display but stop updates
-            return self.all_artists
+        if self.finished:
+            # Nothing changes any more, so nothing is redrawn
+            return []
         
         # Track timing to reduce debug frequency
-        show_debug = False
+        self.show_debug = False
         if frame - self.static_values['last_debug_frame'] >= 50:  # Only show debug every 50 frames
-            show_debug = True
+            self.show_debug = True
             self.static_values['last_debug_frame'] = frame
+        self.frame = frame
         
-        # Update the queen-drone-baby simulation
-        from visualization.hive_view import update_queen_drone_simulation
-        queen_drone_sim_complete = update_queen_drone_simulation()
+        # Register queen, drone, and baby bee markers for blitting
+        # Import the visualization simulation data to access the markers
+        from visualization.hive_view import create_beehive_visualization
+        if hasattr(create_beehive_visualization, 'simulation_data'):
+            data = create_beehive_visualization.simulation_data
+            
+            # Queen and drone markers (adding a registered one does nothing)
+            if hasattr(data['queen_marker'], 'circle'):
+                self.blitter.add(data['queen_marker'].circle)
+            for drone_marker in data['drone_markers']:
+                if hasattr(drone_marker, 'circle'):
+                    self.blitter.add(drone_marker.circle)
+            
+            # Gold dots (baby bees) only ever get appended: register the new ones
+            baby_bees = data['gold_dots']
+            for gold_dot in baby_bees[self.baby_bees_registered:]:
+                self.blitter.add(gold_dot)
+            self.baby_bees_registered = len(baby_bees)
+        
+        # The simulation thread advances the world; draw its latest snapshot, if any is new
+        snapshot = self.buffer.take()
+        if snapshot is not None:
+            self.render(snapshot)
+        
+        # Redraw only if an artist changed position, visibility, color or text
+        return self.blitter.update()
+    
+    def render(self, snapshot):
+        """Push a snapshot (and the events since the previous one) to the artists"""
+        frame = self.frame
+        show_debug = self.show_debug
+        events = snapshot.events
         
-        # Set max_timesteps from user input (only on first frame)
-        if frame == 0 and hasattr(update_queen_drone_simulation, 'max_timesteps'):
-            # Get the current value before we change it
-            original_value = update_queen_drone_simulation.max_timesteps
-            
-            # Set the custom max_timesteps value from user input
-            update_queen_drone_simulation.max_timesteps = self.landscape.max_timesteps
-            
-            # Print confirmation that we've changed the value
-            print(f"✅ Overriding default simulation timesteps: {original_value} → {self.landscape.max_timesteps}")
+        # Simulated time, so the display doesn't drift with GUI load
+        formatted_time = f"{snapshot.seconds:.1f}"
         
         # If the queen-drone simulation is complete, stop the entire animation
-        if queen_drone_sim_complete:
-            print(f"\n🏁 QUEEN-DRONE SIMULATION COMPLETE: Reached {self.target_timesteps} timesteps")
-            print(f"Total nectar collected: {self.total_nectar_collected + self.landscape.movement.gold_collected}")
+        if snapshot.complete:
             print(f"Total simulation time: {formatted_time} seconds")
-            
-            # Set global simulation_complete flag
-            SIMULATION_COMPLETE = True
-            
-            # Force all movement to stop
-            if hasattr(self.landscape, 'movement'):
-                self.landscape.movement.completed = True
-                # Make all bees stop moving
-                for dot in self.landscape.objects.red_dots:
-                    if hasattr(dot, 'velocity'):
-                        dot.velocity = (0, 0)
-                    if hasattr(dot, 'target'):
-                        dot.target = None
+            print(f"🎨 Comb recolors: {self.hexagon_grid.recolors} applied, "
+                  f"{self.hexagon_grid.recolors_skipped} skipped (nectar level unchanged)")
+            print(f"🖼️ Hive view: {self.blitter.redraws} redraws, {self.blitter.frames_skipped} unchanged frames skipped, "
+                  f"{self.blitter.texts_skipped} unchanged texts")
             
             # Update the timestamp to show completion
-            self.timestamp_text.set_text(f"Time: {formatted_time} seconds - SIMULATION COMPLETE")
+            self.blitter.set_text(self.timestamp_text, f"Time: {formatted_time} seconds - SIMULATION COMPLETE")
             
             # Stop screenshot timer if it exists
             if self.screenshot_manager:
                 self.screenshot_manager.stop_timer()
-                
-            return self.all_artists
-        
-        # Add queen, drone, and baby bee markers to all_artists for animation
-        # Import the visualization simulation data to access the markers
-        if hasattr(update_queen_drone_simulation, 'frame_counter'):
-            from visualization.hive_view import create_beehive_visualization
-            if hasattr(create_beehive_visualization, 'simulation_data'):
-                data = create_beehive_visualization.simulation_data
-                
-                # Add queen marker
-                if hasattr(data['queen_marker'], 'circle') and data['queen_marker'].circle not in self.all_artists:
-                    self.all_artists.append(data['queen_marker'].circle)
-                
-                # Add drone markers
-                for drone_marker in data['drone_markers']:
-                    if hasattr(drone_marker, 'circle') and drone_marker.circle not in self.all_artists:
-                        self.all_artists.append(drone_marker.circle)
-                
-                # Add gold dots (baby bees)
-                for gold_dot in data['gold_dots']:
-                    if gold_dot not in self.all_artists:
-                        self.all_artists.append(gold_dot)
-        
-        # If we're in the waiting period between cycles
-        if self.waiting_for_next_cycle:
-            wait_time_elapsed = time.time() - self.cycle_complete_time
-            remaining_wait = WAIT_BETWEEN_CYCLES - wait_time_elapsed
+            self.finished = True
+            return
+        
+        if "nectar_regenerated" in events or "nectar_changed" in events:
+            # Update nectar visualization with the total nectar (previous cycles + current)
+            from visualization.hive_view import update_nectar_level
+            update_nectar_level(
+                self.hexagon_grid, 
+                snapshot.gold_collected,          # Current cycle's nectar
+                snapshot.max_gold_collected,      # Max nectar per cycle
+                snapshot.current_nectar_total,    # Total nectar so far
+                snapshot.cycle,                   # Current cycle 
+                self.nectar_status
+            )
+            
+            # Update the total counter
+            self.blitter.set_text(self.total_nectar_text, f"TOTAL NECTAR: {snapshot.current_nectar_total}")
+        
+        if "nectar_regenerated" in events:
+            print(f"    This should make the honeycomb visibly darker now")
+            
+            # Reset circle markers to match refreshed bee attributes
+            for i, size in enumerate(snapshot.sizes[:len(self.circle_markers)].tolist()):
+                # Reset circle size to normal
+                self.circle_markers[i].radius = size
+                if self.circle_markers[i].circle:
+                    self.circle_markers[i].circle.set_radius(size)
+                    # Reset color to normal red
+                    self.circle_markers[i].circle.set_facecolor('red')
             
-            if remaining_wait > 0:
-                # Still waiting, update the status text
-                self.timestamp_text.set_text(f"Time: {formatted_time} seconds (Next cycle in {remaining_wait:.1f}s)")
-                return self.all_artists
-            else:
-                # Waiting period is over, regenerate nectar
-                print(f"\n⏰ Waiting period complete. Regenerating nectar for cycle {self.nectar_cycle_count}...")
-                self.waiting_for_next_cycle = False
-                
-                # Add current nectar count to total before regenerating
-                self.total_nectar_collected += self.landscape.movement.gold_collected
-                
-                # Print the accumulated nectar information for debugging
-                print(f"\n🍯 TOTAL NECTAR ACCUMULATED: {self.total_nectar_collected} (after cycle {self.nectar_cycle_count})")
-                print(f"    This should make the honeycomb visibly darker now")
-                
-                # Regenerate nectar and reset for the next cycle
-                self.nectar_cycle_count += 1
-                self.landscape, total_nectar = regenerate_nectar(self.landscape, self.nectar_cycle_count, self.total_nectar_collected)
-                
-                # Reset tracking variables for this cycle
-                self.is_nectar_exhausted = False
-                self.last_nectar_count = 0
-                
-                # Update display to show the new cycle and total
-                gold_collected = self.landscape.movement.gold_collected
-                
-                # Update nectar visualization with the total nectar (accumulated so far)
-                from visualization.hive_view import update_nectar_level
-                update_nectar_level(
-                    self.hexagon_grid, 
-                    gold_collected,                  # Current cycle's nectar (0 at start)
-                    self.landscape.max_gold_collected,    # Max nectar per cycle
-                    self.total_nectar_collected,          # Total nectar accumulated so far
-                    self.nectar_cycle_count,              # Current cycle 
-                    self.nectar_status
-                )
-                
-                # Update the total counter
-                self.total_nectar_text.set_text(f"TOTAL NECTAR: {self.total_nectar_collected}")
-                
-                # Reset circle markers to match refreshed bee attributes
-                for i, red_dot in enumerate(self.landscape.objects.red_dots):
-                    if i < len(self.circle_markers) and hasattr(red_dot, 'current_size'):
-                        # Reset circle size to normal
-                        self.circle_markers[i].radius = red_dot.current_size
-                        if self.circle_markers[i].circle:
-                            self.circle_markers[i].circle.set_radius(red_dot.current_size)
-                            # Reset color to normal red
-                            self.circle_markers[i].circle.set_facecolor('red')
-                
-                # Reset bee size text
-                self.bee_sizes_text.set_text("Bee Growth: Normal")
-                
-                return self.all_artists
+            # Reset bee size text
+            self.blitter.set_text(self.bee_sizes_text, "Bee Growth: Normal")
         
-        # Check for completion directly
-        simulation_should_complete = check_simulation_completed(frame, self.landscape)
-        movement_completed = hasattr(self.landscape.movement, 'completed') and self.landscape.movement.completed
+        if snapshot.waiting:
+            # Still waiting, update the status text
+            self.blitter.set_text(self.timestamp_text, f"Time: {formatted_time} seconds (Next cycle in {snapshot.remaining_wait:.1f}s)")
+            return
         
         # Log the completion status
         if frame % 20 == 0 and show_debug:  # Only log every 20 frames AND when debug is enabled
             # Simplified logging to reduce output
-            print(f"[STATUS] Frame {frame} - Bees in comb view: {len(self.bees_in_hive_current)} of {len(self.landscape.objects.red_dots)}")
-            
-        if (simulation_should_complete or movement_completed) and not self.waiting_for_next_cycle:
-            # Cycle is complete, enter waiting state
-            print(f"\n🍯 NECTAR CYCLE {self.nectar_cycle_count} COMPLETED with {self.landscape.movement.gold_collected} nectar")
-            print(f"Total nectar so far: {self.total_nectar_collected + self.landscape.movement.gold_collected}")
-            
-            self.waiting_for_next_cycle = True
-            self.cycle_complete_time = time.time()
-            
-            # Update text to show waiting status
-            self.timestamp_text.set_text(f"Time: {formatted_time} seconds (Next cycle in {WAIT_BETWEEN_CYCLES:.1f}s)")
-            return self.all_artists
+            print(f"[STATUS] Frame {frame} - Bees in comb view: {len(self.bees_in_hive_current)} of {len(snapshot.positions)}")
         
-        # Update landscape simulation
-        if self.landscape.movement:
-            self.landscape.movement.update_state()
-            
-            # Get current nectar collection count
-            gold_collected = self.landscape.movement.gold_collected
-            
-            # Only update visual elements if nectar count changed
-            if gold_collected != self.last_nectar_count or not self.is_nectar_exhausted:
-                # Use our new nectar update function with total nectar and cycle information
-                from visualization.hive_view import update_nectar_level
-                update_nectar_level(
-                    self.hexagon_grid, 
-                    gold_collected,                  # Current cycle's nectar
-                    self.landscape.max_gold_collected,    # Max nectar per cycle
-                    self.total_nectar_collected + gold_collected,  # Total nectar (previous + current)
-                    self.nectar_cycle_count,              # Current cycle 
-                    self.nectar_status
-                )
-                
-                # Update total nectar text
-                self.total_nectar_text.set_text(f"TOTAL NECTAR: {self.total_nectar_collected + gold_collected}")
-                self.last_nectar_count = gold_collected
-                
-                # Check if nectar is exhausted
-                if gold_collected >= self.landscape.max_gold_collected:
-                    self.is_nectar_exhausted = True
-                    print(f"[DEBUG] Nectar target reached ({gold_collected}/{self.landscape.max_gold_collected}), checking for completion...")
-            
-            # Always update timestamp and bee positions (unless we're waiting for next cycle)
-            if not self.waiting_for_next_cycle:
-                self.timestamp_text.set_text(f"Time: {formatted_time} seconds")
-            
-            # Track bee sizes for reporting
-            bee_size_changes = False
-            max_bee_size = 0.1  # Default bee size
+        if "moved" not in events:
+            return
+        
+        # Always update timestamp and bee positions (unless we're waiting for next cycle)
+        self.blitter.set_text(self.timestamp_text, f"Time: {formatted_time} seconds")
+        
+        # Track bee sizes for reporting
+        max_bee_size = 0.1  # Default bee size
+        
+        # Get the beehive position for checking if bees are in/near the hive
+        hive_x, hive_y = self.landscape.objects.beehive["position"]
+        hive_width = self.landscape.objects.beehive["width"]
+        hive_height = self.landscape.objects.beehive["height"]
+        
+        # Beehive position from movement logic
+        movement_beehive_position = self.landscape.movement.beehive_position
+        
+        # Keep track of which bees are currently in the hive
+        self.bees_in_hive_current = set()
+        
+        # Update circle marker positions to match the worker bees
+        positions = snapshot.positions.tolist()
+        sizes = snapshot.sizes.tolist()
+        settled = (snapshot.states == SETTLED).tolist()
+        for i in range(min(len(positions), len(self.circle_markers))):
+            # Check if the bee is in or very near the hive
+            x, y = positions[i]
             
-            # Get the beehive position for checking if bees are in/near the hive
-            hive_x, hive_y = self.landscape.objects.beehive["position"]
-            hive_width = self.landscape.objects.beehive["width"]
-            hive_height = self.landscape.objects.beehive["height"]
+            # Calculate distance to hive
+            dist_to_hive = distance(
+                (x, y),
+                movement_beehive_position
+            )
             
-            # Beehive position from movement logic
-            movement_beehive_position = self.landscape.movement.beehive_position
+            # Define threshold for being "in" the hive
+            hive_threshold = 1.0  # Units from hive center
             
-            # Keep track of which bees are currently in the hive
-            self.bees_in_hive_current = set()
+            # Alternative check: see if bee is inside the hive rectangle or very close to it
+            in_hive_rect = (
+                hive_x <= x <= hive_x + hive_width and
+                hive_y <= y <= hive_y + hive_height
+            )
             
-            # Update circle marker positions to match red dots
-            for i, red_dot in enumerate(self.landscape.objects.red_dots):
-                if i < len(self.circle_markers):
-                    # Check if the bee is in or very near the hive
-                    x, y = red_dot.position
-                    
-                    # Calculate distance to hive
-                    dist_to_hive = distance(
-                        (x, y),
-                        movement_beehive_position
-                    )
-                    
-                    # Define threshold for being "in" the hive
-                    hive_threshold = 1.0  # Units from hive center
-                    
-                    # Alternative check: see if bee is inside the hive rectangle or very close to it
-                    in_hive_rect = (
-                        hive_x <= x <= hive_x + hive_width and
-                        hive_y <= y <= hive_y + hive_height
-                    )
-                    
-                    near_hive = dist_to_hive <= hive_threshold or in_hive_rect
-                    
-                    # Also check if this bee is in the settled_dots set
-                    is_settled = i in self.landscape.movement.settled_dots
-                    
-                    # Set visibility and position based on bee location
-                    if near_hive or is_settled:
-                        self._handle_bee_in_hive(i, red_dot, frame, show_debug)
-                    else:
-                        # The bee is not in the hive, hide it in the beehive visualization
-                        self.circle_markers[i].hide()
-                        
-                        if frame % 60 == 0 and show_debug:  # Reduce spam - once every 60 frames and only when debug is on
-                            print(f"[DEBUG] Bee #{i+1} is outside hive at {red_dot.position}")
-                    
-                    # Update the size of the circle based on silver dot interactions
-                    self._update_bee_size(i, red_dot, max_bee_size)
+            near_hive = dist_to_hive <= hive_threshold or in_hive_rect
             
-            # Update the bee sizes text
-            if max_bee_size > 0.1:
-                self.bee_sizes_text.set_text(f"Bee Growth: {int((max_bee_size/0.1 - 1) * 100)}% Larger")
+            # Set visibility and position based on bee location
+            if near_hive or settled[i]:
+                self._handle_bee_in_hive(i, (x, y), settled[i], frame, show_debug)
             else:
-                self.bee_sizes_text.set_text("Bee Growth: Normal")
+                # The bee is not in the hive, hide it in the beehive visualization
+                self.circle_markers[i].hide()
+                
+                if frame % 60 == 0 and show_debug:  # Reduce spam - once every 60 frames and only when debug is on
+                    print(f"[DEBUG] Bee #{i+1} is outside hive at {[x, y]}")
             
-            # Update which bees were in the hive for the next frame
-            self.bees_in_hive_prev = self.bees_in_hive_current.copy()
+            # Update the size of the circle based on silver dot interactions
+            self._update_bee_size(i, sizes[i], max_bee_size)
+        
+        # Update the bee sizes text
+        if max_bee_size > 0.1:
+            self.blitter.set_text(self.bee_sizes_text, f"Bee Growth: {int((max_bee_size/0.1 - 1) * 100)}% Larger")
+        else:
+            self.blitter.set_text(self.bee_sizes_text, "Bee Growth: Normal")
         
-        # Always return the same list of artists to prevent blinking
-        return self.all_artists
+        # Update which bees were in the hive for the next frame
+        self.bees_in_hive_prev = self.bees_in_hive_current.copy()
         
-    def _handle_bee_in_hive(self, i, red_dot, frame, show_debug):
+
+    def _handle_bee_in_hive(self, i, position, is_settled, frame, show_debug):
         # The bee is in/near the hive, make it visible in the beehive visualization
         self.circle_markers[i].show()
         
@@ -367,8 +274,8 @@ class AnimationHandler:
             central_rows = max(2, ROWS - 2)  # Ensure we have at least some rows
             
             # Use only the central portion of the comb
-            random_col = random.randint(2, central_cols)
-            random_row = random.randint(1, central_rows)
+            random_col = self.rng.randint(2, central_cols)
+            random_row = self.rng.randint(1, central_rows)
             
             # Calculate position coordinates - apply a scaling factor to ensure bees stay central
             # Scale coordinates to be more centralized
@@ -376,8 +283,8 @@ class AnimationHandler:
             comb_y = (ROWS / 2) + (random_row - central_rows/2) * 0.8 * OFFSET_Y
             
             # Minimal randomness within cells to avoid edge issues
-            comb_x += random.uniform(-0.1, 0.1)
-            comb_y += random.uniform(-0.1, 0.1)
+            comb_x += self.rng.uniform(-0.1, 0.1)
+            comb_y += self.rng.uniform(-0.1, 0.1)
             
             # Very strict safety check to ensure coordinates are well within bounds
             # Force coordinates to be at least 2 units away from any edge
@@ -394,7 +301,7 @@ class AnimationHandler:
             
             # Start an entrance animation - determine which edge to start from based on
             # the bee's position in the landscape
-            landscape_x, landscape_y = red_dot.position
+            landscape_x, landscape_y = position
             
             # Get the beehive position for determining entrance
             hive_x, hive_y = self.landscape.objects.beehive["position"]
@@ -444,8 +351,8 @@ class AnimationHandler:
                                       bee_index=i, position=f"({beehive_x:.2f}, {beehive_y:.2f})", level="WARNING")
                     
                     # Force to center area
-                    beehive_x = COLS * OFFSET_X / 2 + random.uniform(-3, 3)
-                    beehive_y = ROWS * OFFSET_Y / 2 + random.uniform(-2, 2)
+                    beehive_x = COLS * OFFSET_X / 2 + self.rng.uniform(-3, 3)
+                    beehive_y = ROWS * OFFSET_Y / 2 + self.rng.uniform(-2, 2)
                     # Update the stored position
                     self.bee_comb_positions[i] = (beehive_x, beehive_y)
                     
@@ -474,8 +381,8 @@ class AnimationHandler:
                                  bee_index=i, position=f"({beehive_x:.2f}, {beehive_y:.2f})", level="ERROR")
                 
                 # Force to center area
-                beehive_x = COLS * OFFSET_X / 2 + random.uniform(-3, 3)
-                beehive_y = ROWS * OFFSET_Y / 2 + random.uniform(-2, 2)
+                beehive_x = COLS * OFFSET_X / 2 + self.rng.uniform(-3, 3)
+                beehive_y = ROWS * OFFSET_Y / 2 + self.rng.uniform(-2, 2)
                 # Update the stored position
                 self.bee_comb_positions[i] = (beehive_x, beehive_y)
                 
@@ -484,12 +391,11 @@ class AnimationHandler:
             
             # For settled bees, we might want to position them differently
             # But only if they're safely positioned away from edges
-            is_settled = i in self.landscape.movement.settled_dots
-            if is_settled and random.random() < 0.03:  # 3% chance to move a little
+            if is_settled and self.rng.random() < 0.03:  # 3% chance to move a little
                 # Occasionally move the settled bee a tiny bit to simulate movement in the hive
                 # Use very small movements to avoid edge issues
-                new_x = beehive_x + random.uniform(-0.08, 0.08) 
-                new_y = beehive_y + random.uniform(-0.08, 0.08)
+                new_x = beehive_x + self.rng.uniform(-0.08, 0.08) 
+                new_y = beehive_y + self.rng.uniform(-0.08, 0.08)
                 
                 # Safety check to make sure the new position is still valid
                 if (edge_margin < new_x < COLS * OFFSET_X - edge_margin and 
@@ -511,20 +417,18 @@ class AnimationHandler:
         if frame % 60 == 0 and show_debug:  # Reduce spam - once every 60 frames and only when debug is on
             print(f"[DEBUG] Bee #{i+1} is in hive at comb position ({beehive_x:.2f}, {beehive_y:.2f})")
             
-    def _update_bee_size(self, i, red_dot, max_bee_size):
-        if hasattr(red_dot, 'current_size'):
-            current_max_bee_size = max(max_bee_size, red_dot.current_size)
-            
-            if red_dot.current_size != self.circle_markers[i].radius:
-                # Create a new circle with the updated size
-                if self.circle_markers[i].circle:
-                    self.circle_markers[i].radius = red_dot.current_size
-                    self.circle_markers[i].circle.set_radius(red_dot.current_size)
-                    
-                    # Also change color to indicate the increased power
-                    intensity = (red_dot.current_size - 0.1) / 0.25  # Normalize to 0-1 range
-                    new_color = (1.0, max(0, 1.0 - intensity), max(0, 1.0 - intensity))  # Red to more saturated red
-                    self.circle_markers[i].circle.set_facecolor(new_color)
-            
-            return current_max_bee_size
-        return max_bee_size 
\ No newline at end of file
+    def _update_bee_size(self, i, size, max_bee_size):
+        current_max_bee_size = max(max_bee_size, size)
+        
+        if size != self.circle_markers[i].radius:
+            # Create a new circle with the updated size
+            if self.circle_markers[i].circle:
+                self.circle_markers[i].radius = size
+                self.circle_markers[i].circle.set_radius(size)
+                
+                # Also change color to indicate the increased power
+                intensity = (size - 0.1) / 0.25  # Normalize to 0-1 range
+                new_color = (1.0, max(0, 1.0 - intensity), max(0, 1.0 - intensity))  # Red to more saturated red
+                self.circle_markers[i].circle.set_facecolor(new_color)
+        
+        return current_max_bee_size
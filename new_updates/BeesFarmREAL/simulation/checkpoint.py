@@ -0,0 +1,269 @@
+"""
+Checkpoint and resume for long runs.
+
+A checkpoint file is CHECKPOINT_MAGIC, a uint32 format version and a
+uint32 length, then that many bytes of JSON metadata (run parameters, the
+engine's cycle bookkeeping, the clock and the state of every random
+stream), followed by a compressed .npz archive with the per-bee, nectar,
+silver and oscillation arrays.
+
+Resuming rebuilds the static layout from the run parameters and seed, then
+overwrites everything that changes while the simulation runs, so a resumed
+run continues exactly as the original would have. The GUI-only decoration
+(comb placement of bees, queen and drone markers) is not saved; it is laid
+out again when the window opens.
+"""
+import io
+import json
+import os
+import struct
+import threading
+import numpy as np
+from entities.circle_dot import CircleDot
+from movement.vectorized import VectorizedMove
+from simulation.clock import SimulationClock
+from simulation.engine import SimulationEngine, create_landscape
+from utils.rng import seed_all, get_rng_service
+
+CHECKPOINT_MAGIC = b"BEECKPT\n"
+CHECKPOINT_VERSION = 3
+# Ticks between periodic checkpoints by default
+CHECKPOINT_INTERVAL = 1000
+
+_PREAMBLE = struct.Struct("<8sII")
+
+# Engine attributes saved as they are
+ENGINE_FIELDS = ('frame_counter', 'max_timesteps', 'target_timesteps', 'last_nectar_count',
+                 'is_nectar_exhausted', 'nectar_cycle_count', 'total_nectar_collected', 'waiting_for_next_cycle',
+                 'wait_until_tick', 'cycle_start_frame', 'cycle_history', 'complete')
+# CircleDot attributes of the worker bees
+BEE_FIELDS = ('original_size', 'current_size', 'speed_modifier', 'silver_interactions', 'max_size')
+# VectorizedMove per-bee arrays
+VECTOR_FIELDS = ('positions', 'speed_modifiers', 'sizes', 'original_sizes', 'max_sizes', 'silver_interactions',
+                 'targets', 'states')
+
+
+def _plain(value):
+    """JSON encoding of the numpy scalars counters pick up from the vectorized backend"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in a checkpoint")
+
+
+def _positions(dots):
+    return np.array([dot.position for dot in dots], dtype=float).reshape(-1, 2)
+
+
+def _dots(positions):
+    return [CircleDot(position) for position in positions.tolist()]
+
+
+def capture(engine, params):
+    """
+    (metadata, arrays) describing the engine right now. Only copies, so it
+    is cheap enough for the simulation thread; encoding happens elsewhere.
+    params are the keyword arguments create_landscape() needs for the layout.
+    """
+    landscape = engine.landscape
+    objects = landscape.objects
+    movement = engine.movement
+    rng_service = get_rng_service()
+    vectorized = isinstance(movement, VectorizedMove)
+
+    meta = {
+        'params': dict(params),
+        'seed': rng_service.entropy,
+        'replica': rng_service.replica,
+        'backend': "vectorized" if vectorized else "python",
+        'engine': {field: getattr(engine, field) for field in ENGINE_FIELDS},
+        'clock_ticks': engine.clock.ticks,
+        'movement': {
+            'gold_collected': int(movement.gold_collected),
+            'completed': bool(movement.completed),
+            'cycles_completed': movement.cycles_completed,
+        },
+        'rng': rng_service.get_state(),
+    }
+
+    bees = objects.red_dots
+    arrays = {'bees/position': _positions(bees)}
+    for field in BEE_FIELDS:
+        arrays[f'bees/{field}'] = np.array([getattr(bee, field) for bee in bees], dtype=float)
+    oscillation = movement.oscillation
+    for field in ('buffer', 'head', 'filled', 'counts'):
+        arrays[f'oscillation/{field}'] = getattr(oscillation, field).copy()
+
+    if vectorized:
+        # Slots keep the collected dots too; targets index into them
+        arrays['gold/position'] = movement.gold_positions.copy()
+        arrays['gold/alive'] = movement.gold_alive.copy()
+        arrays['silver/position'] = movement.silver_positions.copy()
+        arrays['silver/alive'] = movement.silver_alive.copy()
+        for field in VECTOR_FIELDS:
+            arrays[f'vectorized/{field}'] = getattr(movement, field).copy()
+        meta['movement']['needs_pull'] = movement._needs_pull
+    else:
+        gold_dots = movement.gold_dots
+        gold_slot = {id(dot): j for j, dot in enumerate(gold_dots)}
+        arrays['gold/position'] = _positions(gold_dots)
+        arrays['silver/position'] = _positions(movement.silver_dots)
+        targets = np.full(len(bees), -1, dtype=np.int64)
+        for i, dot in movement.dot_targets.items():
+            targets[i] = gold_slot.get(id(dot), -1)
+        arrays['move/targets'] = targets
+        arrays['move/returning'] = np.array(sorted(movement.returning_dots), dtype=np.int64)
+        arrays['move/settled'] = np.array(sorted(movement.settled_dots), dtype=np.int64)
+        arrays['move/silver_interactions'] = np.array(
+            [movement.silver_dot_interactions.get(i, 0) for i in range(len(bees))], dtype=np.int64)
+    return meta, arrays
+
+
+def write_checkpoint(path, meta, arrays):
+    """Write a checkpoint atomically: readers never see a half-written file"""
+    header = json.dumps(meta, default=_plain).encode()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(header)))
+        f.write(header)
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path):
+    """(metadata, arrays) of a checkpoint file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _PREAMBLE.size:
+        raise ValueError(f"{path} is not a bee world checkpoint")
+    magic, version, header_length = _PREAMBLE.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError(f"{path} is not a bee world checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is a version {version} checkpoint; this build reads version {CHECKPOINT_VERSION}")
+    start = _PREAMBLE.size
+    meta = json.loads(data[start:start + header_length])
+    with np.load(io.BytesIO(data[start + header_length:])) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    return meta, arrays
+
+
+def save_checkpoint(engine, path, params):
+    write_checkpoint(path, *capture(engine, params))
+
+
+def restore(engine, meta, arrays):
+    """Overwrite the dynamic state of a freshly built engine with a checkpoint"""
+    landscape = engine.landscape
+    objects = landscape.objects
+    movement = engine.movement
+
+    for field in ENGINE_FIELDS:
+        setattr(engine, field, meta['engine'][field])
+    engine.clock.ticks = meta['clock_ticks']
+
+    bees = objects.red_dots
+    if len(bees) != len(arrays['bees/position']):
+        raise ValueError(f"Checkpoint has {len(arrays['bees/position'])} bees, the rebuilt world {len(bees)}")
+    for i, (bee, position) in enumerate(zip(bees, arrays['bees/position'].tolist())):
+        bee.position = position
+        for field in BEE_FIELDS:
+            value = arrays[f'bees/{field}'][i]
+            setattr(bee, field, int(value) if field == 'silver_interactions' else float(value))
+    oscillation = movement.oscillation
+    for field in ('buffer', 'head', 'filled', 'counts'):
+        getattr(oscillation, field)[...] = arrays[f'oscillation/{field}']
+
+    # New dot objects; the object manager and the movement share the lists as they do in a live run
+    objects.gold_dots = _dots(arrays['gold/position'])
+    objects.silver_dots = _dots(arrays['silver/position'])
+    movement.gold_dots = objects.gold_dots
+    movement.silver_dots = objects.silver_dots
+
+    state = meta['movement']
+    if isinstance(movement, VectorizedMove):
+        for dot, alive in zip(list(objects.gold_dots), arrays['gold/alive'].tolist()):
+            if not alive:
+                movement.remove_gold_dot(dot)
+        for dot, alive in zip(list(objects.silver_dots), arrays['silver/alive'].tolist()):
+            if not alive:
+                movement.remove_silver_dot(dot)
+        for field in VECTOR_FIELDS:
+            getattr(movement, field)[...] = arrays[f'vectorized/{field}']
+        movement._settled_cache = None
+        movement._needs_pull = state['needs_pull']
+    else:
+        gold_dots = movement.gold_dots
+        movement.dot_targets = {i: gold_dots[j] for i, j in enumerate(arrays['move/targets'].tolist()) if j >= 0}
+        movement.returning_dots = set(arrays['move/returning'].tolist())
+        movement.settled_dots = set(arrays['move/settled'].tolist())
+        movement.silver_dot_interactions = dict(enumerate(arrays['move/silver_interactions'].tolist()))
+    movement.gold_collected = state['gold_collected']
+    movement.completed = state['completed']
+    movement.cycles_completed = state['cycles_completed']
+
+    # Last, so nothing above draws from the restored streams
+    get_rng_service().set_state(meta['rng'])
+
+
+def resume(path, speed=None):
+    """Rebuild the engine saved in a checkpoint; returns (engine, params)"""
+    meta, arrays = read_checkpoint(path)
+    params = meta['params']
+    seed_all(meta['seed'], replica=meta['replica'])
+    landscape = create_landscape(params['num_houses'], params['num_red_dots'], params['max_timesteps'],
+                                 movement_backend=meta['backend'])
+    engine = SimulationEngine(landscape, max_timesteps=params['max_timesteps'], clock=SimulationClock(speed=speed))
+    restore(engine, meta, arrays)
+    return engine, params
+
+
+class CheckpointWriter:
+    """
+    Engine observer that saves a checkpoint every `every` ticks (and when
+    the run completes). The state is copied on the simulation thread;
+    compressing and writing happen on a background thread, so the
+    simulation only pauses for the copy. If a write is still in progress,
+    the newer state replaces any pending one.
+    """
+
+    def __init__(self, path, params, every=CHECKPOINT_INTERVAL, start_frame=0):
+        self.path = path
+        self.params = params
+        self.every = every
+        self.last_frame = start_frame
+        self.written = 0
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="checkpoint", daemon=True)
+        self._thread.start()
+
+    def __call__(self, engine, events):
+        if engine.complete or engine.frame_counter - self.last_frame >= self.every:
+            self.save(engine)
+
+    def save(self, engine):
+        """Queue a checkpoint of the engine's current state"""
+        self.last_frame = engine.frame_counter
+        state = capture(engine, self.params)
+        with self._condition:
+            self._pending = state
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                state, self._pending = self._pending, None
+            write_checkpoint(self.path, *state)
+            self.written += 1
+
+    def close(self):
+        """Finish the pending write and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
@@ -0,0 +1,95 @@
+import math
+import time
+from simulation.simulation_config import SIMULATION_SPEED
+
+# Speed modes
+REALTIME = 1.0
+UNBOUNDED = None
+
+# Most ticks a paced clock lets a late frame catch up on
+MAX_TICKS_PER_FRAME = 30
+
+
+def parse_speed(text):
+    """Parse a --speed value: "realtime", "max"/"unbounded", or a factor like "4" or "4x" """
+    text = str(text).strip().lower()
+    if text in ("realtime", "real-time"):
+        return REALTIME
+    if text in ("max", "unbounded", "0"):
+        return UNBOUNDED
+    speed = float(text.rstrip("x"))
+    if speed <= 0:
+        return UNBOUNDED
+    return speed
+
+
+class SimulationClock:
+    """
+    Simulated time, counted in ticks of a fixed duration (SIMULATION_SPEED).
+
+    The simulation only ever looks at ticks, so results don't depend on how
+    fast the machine or the GUI is. The speed only decides how ticks map to
+    wall-clock time: REALTIME (1.0) paces one simulated second per real
+    second, N paces N times faster and UNBOUNDED runs as fast as possible,
+    which also lets the engine jump over waits in a single tick.
+    """
+
+    def __init__(self, tick_duration=SIMULATION_SPEED, speed=REALTIME):
+        self.tick_duration = tick_duration
+        self.speed = speed
+        self.ticks = 0
+        self._wall_start = None  # Wall-clock anchor of paced modes
+        self._start_tick = 0
+
+    @property
+    def unbounded(self):
+        return self.speed is None
+
+    @property
+    def seconds(self):
+        """Simulated seconds elapsed"""
+        return self.ticks * self.tick_duration
+
+    def ticks_for(self, seconds):
+        """Whole ticks needed to cover a simulated duration"""
+        return max(0, math.ceil(seconds / self.tick_duration - 1e-9))
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+    def set_speed(self, speed):
+        """Change the speed mode; pacing restarts from the current tick"""
+        self.speed = speed
+        self._wall_start = None
+
+    def _anchor(self):
+        if self._wall_start is None:
+            self._wall_start = time.perf_counter()
+            self._start_tick = self.ticks
+
+    def ticks_due(self, max_ticks=MAX_TICKS_PER_FRAME):
+        """
+        Ticks that should run now to keep pace with the wall clock (at most
+        max_ticks). Unbounded clocks always return max_ticks.
+        """
+        if self.unbounded:
+            return max_ticks
+        self._anchor()
+        elapsed = time.perf_counter() - self._wall_start
+        due = int(elapsed * self.speed / self.tick_duration) + 1 - (self.ticks - self._start_tick)
+        if due > max_ticks:
+            # Too far behind (e.g. the window was dragged): drop the backlog
+            # instead of freezing to catch up
+            self._start_tick -= due - max_ticks
+            due = max_ticks
+        return max(0, due)
+
+    def wait_for_next_tick(self):
+        """Sleep until the next tick is due (returns at once when unbounded)"""
+        if self.unbounded:
+            return
+        self._anchor()
+        due_at = self._wall_start + (self.ticks - self._start_tick) * self.tick_duration / self.speed
+        delay = due_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
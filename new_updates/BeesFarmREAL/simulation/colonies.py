@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Several colonies competing for one nectar field.
+
+Every colony has its own hive, foragers and queen/drone counts, and its
+foragers are stepped by a ColonyWorker - in this process or in a worker
+process of its own. Each tick all colonies step against their copy of the
+shared nectar field, then meet at a barrier where the master resolves
+nectar that more than one colony collected: one claimant (picked at random)
+keeps it, the others have the collection undone before their next step.
+"""
+import argparse
+import math
+import multiprocessing
+import time
+from simulation.simulation_config import WAIT_BETWEEN_CYCLES, MOVEMENT_BACKEND, SEED
+from simulation.clock import SimulationClock, UNBOUNDED, parse_speed
+from simulation.engine import create_layout, POND_POSITION, POND_SIZE
+from movement.movement import Move
+from movement.vectorized import VectorizedMove
+from entities.circle_dot import CircleDot
+from utils.helpers import ensure_gold_dots_at_spawn_points, reset_bees_around_hive
+from utils.rng import RNGService, seed_all, get_stream
+
+# Hive corners, clear of the flowers, pond and forbidden zone
+COLONY_HIVE_POSITIONS = [(11, 0), (11, 12), (0, 0), (4, 0)]
+HIVE_SIZE = 3
+# Bees closer than this to their drop-off point count as home
+HOME_DISTANCE = 2.0
+
+
+def hive_points(hive):
+    """Drop-off point and settling entrance of a hive, placed as for the original hive"""
+    hive_x, hive_y = hive["position"]
+    return (hive_x, hive_y + 2), (hive_x + 1, hive_y + 2)
+
+
+def dot_records(dots):
+    """(id, x, y) tuples of numbered dots, to send to colony workers"""
+    return [(dot.dot_id, dot.position[0], dot.position[1]) for dot in dots]
+
+
+class Colony:
+    """Master-side state of one colony: its hive, its bees as drawn, and its score"""
+
+    def __init__(self, index, hive, bees, drone_bees=0):
+        self.index = index
+        self.hive = hive
+        self.drop_position, self.entrance_position = hive_points(hive)
+        self.bees = bees  # CircleDots, also in landscape.objects.red_dots
+        self.drone_bees = drone_bees
+        self.gold_collected = 0
+        self.total_nectar = 0
+        self.completed = False
+        self.home = False
+
+    def spec(self, landscape, movement_backend, seed):
+        """Everything a ColonyWorker needs, as plain picklable data"""
+        return {
+            'index': self.index,
+            'hive': dict(self.hive),
+            'bees': [list(bee.position) for bee in self.bees],
+            'nectar': dot_records(landscape.objects.gold_dots),
+            'silver': dot_records(landscape.objects.silver_dots),
+            'max_gold': landscape.max_gold_collected,
+            'backend': movement_backend,
+            'seed': seed,
+        }
+
+
+class ColonyWorker:
+    """
+    Steps one colony's foragers: its own Move (or VectorizedMove), its own
+    copy of the shared nectar and silver dots and its own random streams, so
+    the results do not depend on where it runs.
+    """
+
+    def __init__(self, spec, layout=None):
+        self.index = spec['index']
+        self.hive = spec['hive']
+        self.rng_service = RNGService(spec['seed'], replica=self.index + 1)
+        layout = layout or create_layout()
+        drop_position, entrance_position = hive_points(self.hive)
+
+        self.bees = [CircleDot(position) for position in spec['bees']]
+        self.claims = {}  # Nectar id -> bee index, collected in the last step
+
+        vectorized = spec['backend'] == "vectorized"
+        move_class = VectorizedMove if vectorized else Move
+        rng = self.rng_service.stream("movement")
+        self.movement = move_class(
+            red_dots=self.bees,
+            gold_dots=self._dots(spec['nectar']),
+            beehive_position=drop_position,
+            max_gold_collected=spec['max_gold'],
+            pond_position=POND_POSITION,
+            pond_size=POND_SIZE,
+            forbidden_zone_func=layout.is_inside_forbidden_zone,
+            silver_dots=self._dots(spec['silver']),
+            obstacle_field=layout.obstacle_field,
+            navigation=layout.navigation,
+            rng=rng.generator if vectorized else rng,
+            last_beehive_position=entrance_position
+        )
+
+    def _dots(self, records):
+        dots = []
+        for dot_id, x, y in records:
+            dot = CircleDot((x, y))
+            dot.dot_id = dot_id
+            dots.append(dot)
+        return dots
+
+    def step(self, removed_gold, removed_silver, revoked):
+        """
+        Undo the collections this colony lost, drop the dots other colonies
+        took, advance one tick and report what was collected.
+        """
+        for nectar_id in revoked:
+            self.movement.revoke_collection(self.claims[nectar_id])
+
+        removed_gold = set(removed_gold)
+        for dot in [dot for dot in self.movement.gold_dots if dot.dot_id in removed_gold]:
+            self.movement.remove_gold_dot(dot)
+        removed_silver = set(removed_silver)
+        for dot in [dot for dot in self.movement.silver_dots if dot.dot_id in removed_silver]:
+            self.movement.remove_silver_dot(dot)
+
+        silver_before = {dot.dot_id for dot in self.movement.silver_dots}
+        self.movement.update_state()
+        self.claims = {dot.dot_id: bee for bee, dot in self.movement.collected}
+        silver_used = silver_before - {dot.dot_id for dot in self.movement.silver_dots}
+
+        hive_x, hive_y = self.movement.beehive_position
+        return {
+            'claims': list(self.claims),
+            'silver': sorted(silver_used),
+            'positions': [list(bee.position) for bee in self.bees],
+            'sizes': [bee.current_size for bee in self.bees],
+            'gold_collected': self.movement.gold_collected,
+            'completed': self.movement.completed,
+            'home': all(math.hypot(x - hive_x, y - hive_y) <= HOME_DISTANCE for x, y in
+                        (bee.position for bee in self.bees)),
+        }
+
+    def regenerate(self, nectar, silver):
+        """Start a new nectar cycle on the given shared field; returns the bee positions"""
+        self.movement.reset_for_new_cycle()
+        self.movement.gold_dots = self._dots(nectar)
+        self.movement.silver_dots = self._dots(silver)
+        self.claims = {}
+        reset_bees_around_hive(self.bees, self.hive, self.rng_service.stream("placement"), reset_attributes=True)
+        return [list(bee.position) for bee in self.bees]
+
+
+def serve_colony(conn, spec):
+    """Worker process: build the colony, then run (command, args) requests until None"""
+    worker = ColonyWorker(spec)
+    conn.send("ready")
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        command, args = request
+        conn.send(getattr(worker, command)(*args))
+    conn.close()
+
+
+class LocalColony:
+    """ColonyWorker in this process, behind the same request/result calls as ProcessColony"""
+
+    def __init__(self, spec, layout=None):
+        self.worker = ColonyWorker(spec, layout)
+        self._result = None
+
+    def request(self, command, *args):
+        self._result = getattr(self.worker, command)(*args)
+
+    def result(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class ProcessColony:
+    """ColonyWorker in a worker process, driven over a pipe"""
+
+    def __init__(self, spec):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=serve_colony, args=(child, spec), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn.recv()  # Wait until the colony is built
+
+    def request(self, command, *args):
+        self.conn.send((command, args))
+
+    def result(self):
+        return self.conn.recv()
+
+    def close(self):
+        if self.process.is_alive():
+            self.conn.send(None)
+            self.process.join()
+        self.conn.close()
+
+
+def create_colonies(num_colonies, bees_per_colony, max_timesteps, drone_bees=0, num_houses=1,
+                    hive_positions=COLONY_HIVE_POSITIONS):
+    """Landscape with one hive and bees per colony and a shared nectar field"""
+    if num_colonies > len(hive_positions):
+        raise ValueError(f"At most {len(hive_positions)} colonies fit the landscape")
+
+    landscape = create_layout(num_houses, max_timesteps)
+    colonies = []
+    for index in range(num_colonies):
+        # The layout already has the first hive
+        hive = landscape.objects.hives[0] if index == 0 else landscape.objects.add_beehive(
+            position=hive_positions[index], height=HIVE_SIZE, width=HIVE_SIZE)
+        bees = landscape.objects.add_red_dots(count=bees_per_colony, hive=hive)
+        colonies.append(Colony(index, hive, bees, drone_bees))
+
+    landscape.objects.add_gold_dots(count=5)
+    landscape.objects.add_silver_dots()
+    ensure_gold_dots_at_spawn_points(landscape.objects)
+    return landscape, colonies
+
+
+class MultiColonyEngine:
+    """
+    SimulationEngine for competing colonies.
+
+    The master owns the shared nectar field and the nectar cycle: a cycle
+    ends when the field is empty (or every colony reached its nectar target)
+    and all bees are home, and after the wait every colony restarts on a new
+    field. Colonies are stepped in worker processes when processes=True.
+    """
+
+    def __init__(self, landscape, colonies, max_timesteps, movement_backend=MOVEMENT_BACKEND, processes=True,
+                 seed=None, wait_between_cycles=WAIT_BETWEEN_CYCLES, clock=None):
+        self.landscape = landscape
+        self.colonies = colonies
+        self.max_timesteps = max_timesteps
+        self.frame_counter = 0
+        self.wait_between_cycles = wait_between_cycles
+        self.clock = clock or SimulationClock(speed=UNBOUNDED)
+        self.rng = get_stream("colonies")  # Picks the winner of contested nectar
+        self.complete = False
+
+        # Nectar cycle bookkeeping
+        self.nectar_cycle_count = 1
+        self.waiting_for_next_cycle = False
+        self.wait_until_tick = None
+        self.cycle_start_frame = 0
+        self.cycle_history = []
+        self.contested_nectar = 0
+
+        self._next_dot_id = 0
+        self._number_dots()
+        # Dots each colony must drop and collections it must undo at its next step
+        self._pending = [([], [], []) for _ in colonies]
+
+        specs = [colony.spec(landscape, movement_backend, seed) for colony in colonies]
+        if processes:
+            self.workers = [ProcessColony(spec) for spec in specs]
+        else:
+            self.workers = [LocalColony(spec, landscape) for spec in specs]
+
+    def _number_dots(self):
+        """Give every new nectar and silver dot a unique id shared with the workers"""
+        for dot in self.landscape.objects.gold_dots + self.landscape.objects.silver_dots:
+            if not hasattr(dot, 'dot_id'):
+                dot.dot_id = self._next_dot_id
+                self._next_dot_id += 1
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+    def step(self, n=1):
+        for _ in range(n):
+            if self.complete:
+                break
+            self._tick()
+        return self.complete
+
+    def run(self):
+        """Step until the timestep limit, paced by the clock; workers are closed at the end"""
+        try:
+            while not self.complete:
+                self.clock.wait_for_next_tick()
+                self.step()
+        finally:
+            self.close()
+        return self.summary()
+
+    def summary(self):
+        return {
+            'timesteps': self.frame_counter,
+            'simulated_seconds': self.clock.seconds,
+            'cycles_completed': len(self.cycle_history),
+            'contested_nectar': self.contested_nectar,
+            'colonies': [{
+                'colony': colony.index,
+                'hive': colony.hive["position"],
+                'bees': len(colony.bees),
+                'drone_bees': colony.drone_bees,
+                'total_nectar': colony.total_nectar + colony.gold_collected,
+                'nectar_per_cycle': [cycle['nectar'][colony.index] for cycle in self.cycle_history],
+            } for colony in self.colonies],
+        }
+
+    def _tick(self):
+        self.frame_counter += 1
+        self.clock.advance()
+        if self.frame_counter >= self.max_timesteps:
+            self.complete = True
+            print(f"\n🏁 MULTI-COLONY SIMULATION COMPLETE: Reached {self.max_timesteps} timesteps")
+            return
+
+        frame = self.frame_counter - 1
+        objects = self.landscape.objects
+
+        if self.waiting_for_next_cycle:
+            remaining = self.wait_until_tick - self.clock.ticks
+            if remaining > 0:
+                if self.clock.unbounded:
+                    skip = min(remaining - 1, self.max_timesteps - 1 - self.frame_counter)
+                    self.frame_counter += skip
+                    self.clock.advance(skip)
+                return
+            self.waiting_for_next_cycle = False
+            self._regenerate()
+            self.cycle_start_frame = self.frame_counter
+            return
+
+        field_done = not objects.gold_dots or all(
+            colony.gold_collected >= self.landscape.max_gold_collected for colony in self.colonies)
+        all_home = field_done and frame % 10 == 0 and all(colony.home for colony in self.colonies)
+        if all_home or all(colony.completed for colony in self.colonies):
+            nectar = [colony.gold_collected for colony in self.colonies]
+            print(f"\n🍯 NECTAR CYCLE {self.nectar_cycle_count} COMPLETED, nectar per colony: {nectar}")
+            self.cycle_history.append({
+                'cycle': self.nectar_cycle_count,
+                'nectar': nectar,
+                'duration': self.frame_counter - self.cycle_start_frame,
+            })
+            self.waiting_for_next_cycle = True
+            self.wait_until_tick = self.clock.ticks + self.clock.ticks_for(self.wait_between_cycles)
+            return
+
+        # Barrier: every colony steps, then contested nectar is resolved
+        for worker, pending in zip(self.workers, self._pending):
+            worker.request("step", *pending)
+        replies = [worker.result() for worker in self.workers]
+        self._resolve(replies)
+
+    def _resolve(self, replies):
+        """Settle this tick's nectar claims and update the shared field and the drawn bees"""
+        claimants = {}
+        for colony, reply in zip(self.colonies, replies):
+            for nectar_id in reply['claims']:
+                claimants.setdefault(nectar_id, []).append(colony.index)
+
+        revoked = [[] for _ in self.colonies]
+        for nectar_id, indexes in claimants.items():
+            if len(indexes) > 1:
+                winner = indexes[int(self.rng.random() * len(indexes))]
+                for index in indexes:
+                    if index != winner:
+                        revoked[index].append(nectar_id)
+                self.contested_nectar += 1
+
+        silver_used = set()
+        for reply in replies:
+            silver_used.update(reply['silver'])
+
+        for colony, reply in zip(self.colonies, replies):
+            own = set(reply['claims'])
+            self._pending[colony.index] = (
+                sorted(set(claimants) - own), sorted(silver_used - set(reply['silver'])), revoked[colony.index])
+            colony.gold_collected = reply['gold_collected'] - len(revoked[colony.index])
+            colony.completed = reply['completed'] and not revoked[colony.index]
+            colony.home = reply['home']
+            for bee, position, size in zip(colony.bees, reply['positions'], reply['sizes']):
+                bee.position = position
+                bee.current_size = size
+
+        objects = self.landscape.objects
+        objects.gold_dots[:] = [dot for dot in objects.gold_dots if dot.dot_id not in claimants]
+        objects.silver_dots[:] = [dot for dot in objects.silver_dots if dot.dot_id not in silver_used]
+
+    def _regenerate(self):
+        """New shared nectar field for every colony"""
+        objects = self.landscape.objects
+        for colony in self.colonies:
+            colony.total_nectar += colony.gold_collected
+            colony.gold_collected = 0
+            colony.completed = False
+            colony.home = False
+        self.nectar_cycle_count += 1
+
+        objects.gold_dots[:] = []
+        objects.silver_dots[:] = []
+        objects.add_gold_dots(count=get_stream("nectar").randint(8, 12))
+        objects.add_silver_dots()
+        ensure_gold_dots_at_spawn_points(objects)
+        self._number_dots()
+
+        nectar, silver = dot_records(objects.gold_dots), dot_records(objects.silver_dots)
+        for worker in self.workers:
+            worker.request("regenerate", nectar, silver)
+        for colony, worker in zip(self.colonies, self.workers):
+            for bee, position in zip(colony.bees, worker.result()):
+                bee.position = position
+        self._pending = [([], [], []) for _ in self.colonies]
+        print(f"\n🌱 NECTAR REGENERATED for {len(self.colonies)} colonies - cycle {self.nectar_cycle_count}")
+
+
+def run_colonies(num_colonies, bees_per_colony, max_timesteps, drone_bees=0, movement_backend=MOVEMENT_BACKEND,
+                 processes=True, seed=SEED, speed=UNBOUNDED):
+    """Build the colonies, run them to the timestep limit and return the summary"""
+    rng_service = seed_all(seed)
+    landscape, colonies = create_colonies(num_colonies, bees_per_colony, max_timesteps, drone_bees)
+    engine = MultiColonyEngine(landscape, colonies, max_timesteps, movement_backend, processes,
+                               seed=rng_service.entropy, clock=SimulationClock(speed=speed))
+
+    start_time = time.time()
+    summary = engine.run()
+    summary['wall_time'] = time.time() - start_time
+    summary['seed'] = rng_service.entropy
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bee World Simulation (competing colonies)")
+    parser.add_argument("-c", "--colonies", type=int, default=2, help="Number of colonies")
+    parser.add_argument("-b", "--bees", type=int, default=4, help="Worker bees per colony")
+    parser.add_argument("-d", "--drones", type=int, default=2, help="Drone bees per colony")
+    parser.add_argument("-t", "--timesteps", type=int, default=1500, help="Timesteps to simulate")
+    parser.add_argument("--backend", choices=["python", "vectorized"], default=MOVEMENT_BACKEND,
+                        help="Worker bee movement backend")
+    parser.add_argument("--in-process", action="store_true", help="Step all colonies in this process")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed for a reproducible run")
+    parser.add_argument("--speed", type=parse_speed, default=UNBOUNDED,
+                        help="Clock speed: max (default), realtime or a factor such as 4x")
+
+    args = parser.parse_args()
+    summary = run_colonies(args.colonies, args.bees, args.timesteps, args.drones, args.backend,
+                           not args.in_process, args.seed, args.speed)
+
+    print("\n=== MULTI-COLONY RUN COMPLETE ===")
+    print(f"Timesteps: {summary['timesteps']}, nectar cycles completed: {summary['cycles_completed']}")
+    print(f"Contested nectar: {summary['contested_nectar']}")
+    for colony in summary['colonies']:
+        print(f"Colony {colony['colony']} (hive at {colony['hive']}, {colony['bees']} bees): "
+              f"{colony['total_nectar']} nectar, per cycle {colony['nectar_per_cycle']}")
+    print(f"Wall time: {summary['wall_time']:.2f} seconds")
+    print(f"Seed: {summary['seed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+from simulation.simulation_config import WAIT_BETWEEN_CYCLES, MOVEMENT_BACKEND
+from simulation.clock import SimulationClock, REALTIME, UNBOUNDED
+from simulation.utils import check_simulation_completed
+from entities.landscape import Landscape
+from movement.movement import Move
+from movement.vectorized import VectorizedMove
+from utils.helpers import ensure_gold_dots_at_spawn_points, regenerate_nectar
+from utils.rng import seed_all
+
+
+# Fixed colony layout
+BEEHIVE_POSITION = (11, 2)       # Where returning bees drop their nectar
+POND_POSITION = (12, 5)
+POND_SIZE = (3, 5)               # (width, height)
+
+
+def create_layout(num_houses=1, max_timesteps=None, original_timesteps=None):
+    """
+    Landscape with the hive, pond and obstacle / navigation fields but no
+    bees, nectar or silver dots yet. Ensemble runs share one layout.
+    """
+    landscape = Landscape(block_size=15, max_gold_collected=20, num_houses=num_houses)
+
+    # Set max timesteps (the caller adds any construction compensation)
+    landscape.max_timesteps = max_timesteps
+    # Store original timesteps for reporting
+    landscape.original_timesteps = original_timesteps or max_timesteps
+
+    landscape.objects.add_beehive(position=(11, 0), height=3, width=3)
+    landscape.objects.add_pond(position=POND_POSITION, height=POND_SIZE[1], width=POND_SIZE[0])
+
+    # Obstacles are static, so their distance field and flow fields are built once
+    landscape.build_obstacle_field()
+    landscape.build_navigation()
+    return landscape
+
+
+def create_landscape(num_houses, num_red_dots, max_timesteps, original_timesteps=None,
+                     movement_backend=MOVEMENT_BACKEND, seed=None):
+    """
+    Build the landscape, its objects and the worker bee movement logic.
+
+    This is the world setup that used to live inline in main(); it does not
+    touch matplotlib so it can be used for headless runs as well as the GUI.
+    movement_backend selects Move ("python") or VectorizedMove ("vectorized").
+    A seed reseeds every random stream first, making the run reproducible.
+    """
+    if seed is not None:
+        seed_all(seed)
+
+    landscape = create_layout(num_houses, max_timesteps, original_timesteps)
+    landscape.objects.add_red_dots(count=num_red_dots)
+    landscape.objects.add_gold_dots(count=5)
+    landscape.objects.add_silver_dots()
+
+    # Ensure there's gold nectar (alliance) at each spawn point
+    ensure_gold_dots_at_spawn_points(landscape.objects)
+
+    # Initialize movement logic with obstacle avoidance (pond + forbidden zone)
+    move_class = VectorizedMove if movement_backend == "vectorized" else Move
+    landscape.movement = move_class(
+        red_dots=landscape.objects.red_dots,
+        gold_dots=landscape.objects.gold_dots,
+        beehive_position=BEEHIVE_POSITION,
+        max_gold_collected=landscape.max_gold_collected,
+        pond_position=POND_POSITION,
+        pond_size=POND_SIZE,
+        forbidden_zone_func=landscape.is_inside_forbidden_zone,
+        silver_dots=landscape.objects.silver_dots,
+        obstacle_field=landscape.obstacle_field,
+        navigation=landscape.navigation
+    )
+
+    return landscape
+
+
+class SimulationEngine:
+    """
+    Advances the bee world one timestep at a time, independently of any GUI.
+
+    The engine owns everything that changes while the simulation runs: the
+    landscape and its Move logic, the queen-drone timestep counter and the
+    nectar cycle bookkeeping. Renderers subscribe with add_observer() and are
+    called after every tick with the engine and the list of events that
+    happened during that tick.
+
+    Time is kept by a SimulationClock in ticks, including the wait between
+    nectar cycles, so a run gives the same results at any speed. With an
+    unbounded clock the whole wait is skipped in a single tick.
+
+    Tick events:
+    - "simulation_complete": the timestep limit was reached
+    - "cycle_complete": all nectar was collected and the bees are home
+    - "waiting": the tick was spent waiting for the next nectar cycle
+    - "nectar_regenerated": a new nectar cycle started
+    - "nectar_changed": nectar in the hive changed (or is still being collected)
+    - "moved": worker bees were advanced
+    """
+
+    def __init__(self, landscape, max_timesteps=None, target_timesteps=None,
+                 wait_between_cycles=WAIT_BETWEEN_CYCLES, realtime=False, clock=None):
+        self.landscape = landscape
+
+        # Queen-drone simulation state (timestep limit for the whole run)
+        self.frame_counter = 0
+        self.max_timesteps = max_timesteps or landscape.max_timesteps
+        self.target_timesteps = target_timesteps or getattr(landscape, 'original_timesteps', self.max_timesteps)
+
+        # Nectar cycle bookkeeping
+        self.last_nectar_count = 0
+        self.is_nectar_exhausted = False
+        self.nectar_cycle_count = 1
+        self.total_nectar_collected = 0
+        self.waiting_for_next_cycle = False
+        self.wait_until_tick = None
+        self.cycle_start_frame = 0
+        self.cycle_history = []  # One summary dict per completed cycle
+
+        # Simulated seconds between cycles; realtime only picks the default clock speed
+        self.wait_between_cycles = wait_between_cycles
+        self.clock = clock or SimulationClock(speed=REALTIME if realtime else UNBOUNDED)
+
+        self.complete = False
+        self.observers = []
+
+    @property
+    def movement(self):
+        return self.landscape.movement
+
+    @property
+    def current_nectar_total(self):
+        """Total nectar including the cycle in progress"""
+        return self.total_nectar_collected + self.movement.gold_collected
+
+    def add_observer(self, observer):
+        """Register a callable observer(engine, events) run after every tick"""
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def step(self, n=1):
+        """
+        Advance the simulation by n timesteps as fast as possible.
+        Returns True once the simulation is complete.
+        """
+        for _ in range(n):
+            if self.complete:
+                break
+            events = self._tick()
+            for observer in self.observers:
+                observer(self, events)
+        return self.complete
+
+    def advance(self):
+        """
+        Run the ticks the clock says are due (for a GUI frame callback).
+        Returns the number of ticks run.
+        """
+        due = self.clock.ticks_due()
+        start = self.frame_counter
+        self.step(due)
+        return self.frame_counter - start
+
+    def run(self, max_steps=None):
+        """Step until the simulation completes (or max_steps have been run), paced by the clock"""
+        steps = 0
+        while not self.complete and (max_steps is None or steps < max_steps):
+            self.clock.wait_for_next_tick()
+            self.step()
+            steps += 1
+        return self.summary()
+
+    def remaining_wait(self):
+        """Simulated seconds left before the next nectar cycle starts"""
+        if not self.waiting_for_next_cycle:
+            return 0.0
+        return max(0, self.wait_until_tick - self.clock.ticks) * self.clock.tick_duration
+
+    def summary(self):
+        """Plain dict describing the run so far"""
+        return {
+            'timesteps': self.frame_counter,
+            'simulated_seconds': self.clock.seconds,
+            'target_timesteps': self.target_timesteps,
+            'cycles_started': self.nectar_cycle_count,
+            'cycles_completed': len(self.cycle_history),
+            'total_nectar': self.current_nectar_total,
+            'nectar_per_cycle': [cycle['nectar'] for cycle in self.cycle_history],
+            'cycle_durations': [cycle['duration'] for cycle in self.cycle_history],
+        }
+
+    def _tick(self):
+        events = []
+
+        # Advance the queen-drone timestep counter, which bounds the whole run
+        self.frame_counter += 1
+        self.clock.advance()
+        if self.frame_counter >= self.max_timesteps:
+            self.complete = True
+            print(f"\n🏁 QUEEN-DRONE SIMULATION COMPLETE: Reached {self.target_timesteps} timesteps")
+            print(f"Total nectar collected: {self.current_nectar_total}")
+
+            # Force all movement to stop
+            self.movement.completed = True
+            for dot in self.landscape.objects.red_dots:
+                if hasattr(dot, 'velocity'):
+                    dot.velocity = (0, 0)
+                if hasattr(dot, 'target'):
+                    dot.target = None
+            events.append("simulation_complete")
+            return events
+
+        frame = self.frame_counter - 1
+
+        # If we're in the waiting period between cycles
+        if self.waiting_for_next_cycle:
+            remaining = self.wait_until_tick - self.clock.ticks
+            if remaining > 0:
+                if self.clock.unbounded:
+                    # Nothing moves while waiting: jump to the tick before the
+                    # wait ends, so the next tick starts the cycle as in real time
+                    skip = min(remaining - 1, self.max_timesteps - 1 - self.frame_counter)
+                    self.frame_counter += skip
+                    self.clock.advance(skip)
+                events.append("waiting")
+                return events
+
+            # Waiting period is over, regenerate nectar
+            print(f"\n⏰ Waiting period complete. Regenerating nectar for cycle {self.nectar_cycle_count}...")
+            self.waiting_for_next_cycle = False
+
+            # Add current nectar count to total before regenerating
+            self.total_nectar_collected += self.movement.gold_collected
+            print(f"\n🍯 TOTAL NECTAR ACCUMULATED: {self.total_nectar_collected} (after cycle {self.nectar_cycle_count})")
+
+            # Regenerate nectar and reset for the next cycle
+            self.nectar_cycle_count += 1
+            self.landscape, _ = regenerate_nectar(self.landscape, self.nectar_cycle_count, self.total_nectar_collected)
+
+            # Reset tracking variables for this cycle
+            self.is_nectar_exhausted = False
+            self.last_nectar_count = 0
+            self.cycle_start_frame = self.frame_counter
+            events.append("nectar_regenerated")
+            return events
+
+        # Check for completion of the current nectar cycle
+        simulation_should_complete = check_simulation_completed(frame, self.landscape)
+        movement_completed = getattr(self.movement, 'completed', False)
+
+        if simulation_should_complete or movement_completed:
+            # Cycle is complete, enter waiting state
+            print(f"\n🍯 NECTAR CYCLE {self.nectar_cycle_count} COMPLETED with {self.movement.gold_collected} nectar")
+            print(f"Total nectar so far: {self.current_nectar_total}")
+
+            self.cycle_history.append({
+                'cycle': self.nectar_cycle_count,
+                'nectar': self.movement.gold_collected,
+                'duration': self.frame_counter - self.cycle_start_frame,
+            })
+            self.waiting_for_next_cycle = True
+            self.wait_until_tick = self.clock.ticks + self.clock.ticks_for(self.wait_between_cycles)
+            events.append("cycle_complete")
+            return events
+
+        # Update landscape simulation
+        self.movement.update_state()
+        events.append("moved")
+
+        gold_collected = self.movement.gold_collected
+        if gold_collected != self.last_nectar_count or not self.is_nectar_exhausted:
+            self.last_nectar_count = gold_collected
+            events.append("nectar_changed")
+
+            # Check if nectar is exhausted
+            if gold_collected >= self.landscape.max_gold_collected:
+                self.is_nectar_exhausted = True
+                print(f"[DEBUG] Nectar target reached ({gold_collected}/{self.landscape.max_gold_collected}), checking for completion...")
+
+        return events
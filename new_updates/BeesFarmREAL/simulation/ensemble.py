@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo ensemble: many independent colonies on one landscape layout,
+stepped together by EnsembleMove, reporting the distribution of the results
+instead of a single run.
+"""
+import argparse
+import time
+import numpy as np
+from simulation.simulation_config import WAIT_BETWEEN_CYCLES, SEED
+from simulation.clock import SimulationClock, UNBOUNDED, parse_speed
+from simulation.engine import create_layout, BEEHIVE_POSITION, POND_POSITION, POND_SIZE
+from movement.ensemble import EnsembleMove
+from utils.rng import seed_all, get_stream
+
+# Percentiles reported for every ensemble statistic
+PERCENTILES = (5, 50, 95)
+
+
+def describe(values):
+    """Distribution statistics of a list of numbers"""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return {'count': 0}
+    p5, median, p95 = np.percentile(values, PERCENTILES)
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'p5': float(p5),
+        'median': float(median),
+        'p95': float(p95),
+        'max': float(values.max()),
+    }
+
+
+class EnsembleEngine:
+    """
+    SimulationEngine for an ensemble: the same nectar cycle rules, with every
+    piece of cycle bookkeeping held per colony (replica) in an array.
+
+    Colonies finish their cycles at different ticks, so each one waits and
+    regenerates on its own; only colonies that are foraging are moved. With
+    an unbounded clock, ticks where every colony is waiting are skipped.
+    """
+
+    def __init__(self, movement, max_timesteps, wait_between_cycles=WAIT_BETWEEN_CYCLES, clock=None):
+        self.movement = movement
+        self.replicas = movement.replicas
+        self.max_timesteps = max_timesteps
+        self.frame_counter = 0
+        self.wait_between_cycles = wait_between_cycles
+        self.clock = clock or SimulationClock(speed=UNBOUNDED)
+        self.complete = False
+
+        # Per colony nectar cycle bookkeeping
+        self.waiting = np.zeros(self.replicas, dtype=bool)
+        self.wait_until_tick = np.zeros(self.replicas, dtype=np.int64)
+        self.cycle_start_frame = np.zeros(self.replicas, dtype=np.int64)
+        self.total_nectar_collected = np.zeros(self.replicas, dtype=np.int64)
+        self.cycle_nectar = []     # Nectar of every completed cycle, all colonies
+        self.cycle_durations = []  # Ticks of every completed cycle, all colonies
+        self.cycles_completed = np.zeros(self.replicas, dtype=np.int64)
+
+    @property
+    def current_nectar_total(self):
+        """Per colony total including the cycle in progress"""
+        return self.total_nectar_collected + self.movement.gold_collected
+
+    def step(self, n=1):
+        """Advance every colony by n timesteps; returns True once complete"""
+        for _ in range(n):
+            if self.complete:
+                break
+            self._tick()
+        return self.complete
+
+    def run(self):
+        """Step until the timestep limit, paced by the clock"""
+        while not self.complete:
+            self.clock.wait_for_next_tick()
+            self.step()
+        return self.summary()
+
+    def summary(self):
+        """Plain dict with the distribution of the results over the colonies"""
+        return {
+            'replicas': self.replicas,
+            'timesteps': self.frame_counter,
+            'simulated_seconds': self.clock.seconds,
+            'total_nectar': describe(self.current_nectar_total),
+            'cycles_completed': describe(self.cycles_completed),
+            'nectar_per_cycle': describe(self.cycle_nectar),
+            'cycle_duration': describe(self.cycle_durations),
+        }
+
+    def _tick(self):
+        self.frame_counter += 1
+        self.clock.advance()
+        if self.frame_counter >= self.max_timesteps:
+            self.complete = True
+            return
+
+        frame = self.frame_counter - 1
+        movement = self.movement
+
+        # Colonies whose wait is over start a new nectar cycle this tick
+        restart = self.waiting & (self.wait_until_tick <= self.clock.ticks)
+        if restart.any():
+            self.total_nectar_collected[restart] += movement.gold_collected[restart]
+            movement.regenerate(restart)
+            self.waiting[restart] = False
+            self.cycle_start_frame[restart] = self.frame_counter
+
+        # Cycle completion, as check_simulation_completed decides it
+        active = ~self.waiting & ~restart
+        done = movement.completed.copy()
+        if frame % 10 == 0:
+            done |= movement.are_all_nectar_collected() & movement.all_near_hive()
+        done &= active
+        if done.any():
+            self.cycle_nectar.extend(movement.gold_collected[done].tolist())
+            self.cycle_durations.extend((self.frame_counter - self.cycle_start_frame[done]).tolist())
+            self.cycles_completed[done] += 1
+            self.waiting[done] = True
+            self.wait_until_tick[done] = self.clock.ticks + self.clock.ticks_for(self.wait_between_cycles)
+
+        movement.update_state(active & ~done)
+
+        if self.clock.unbounded and self.waiting.all():
+            # Nothing moves: jump to the tick before the first colony restarts
+            skip = int(self.wait_until_tick.min()) - self.clock.ticks - 1
+            skip = min(skip, self.max_timesteps - 1 - self.frame_counter)
+            if skip > 0:
+                self.frame_counter += skip
+                self.clock.advance(skip)
+
+
+def run_ensemble(replicas, num_red_dots, max_timesteps, seed=SEED, speed=UNBOUNDED):
+    """Run replicas colonies of num_red_dots bees for max_timesteps and return the summary"""
+    rng_service = seed_all(seed)
+    landscape = create_layout(max_timesteps=max_timesteps)
+    movement = EnsembleMove(
+        replicas=replicas,
+        bees_per_colony=num_red_dots,
+        beehive=landscape.objects.beehive,
+        beehive_position=BEEHIVE_POSITION,
+        max_gold_collected=landscape.max_gold_collected,
+        pond_position=POND_POSITION,
+        pond_size=POND_SIZE,
+        forbidden_zone_func=landscape.is_inside_forbidden_zone,
+        obstacle_field=landscape.obstacle_field,
+        navigation=landscape.navigation,
+        rng=get_stream("ensemble").generator,
+        block_size=landscape.block_size,
+        flower_areas=landscape.objects.flower_areas()
+    )
+    engine = EnsembleEngine(movement, max_timesteps, clock=SimulationClock(speed=speed))
+
+    start_time = time.time()
+    summary = engine.run()
+    summary['wall_time'] = time.time() - start_time
+    summary['num_red_dots'] = num_red_dots
+    summary['seed'] = rng_service.entropy
+    return summary
+
+
+def format_stats(stats):
+    if not stats['count']:
+        return "n/a"
+    return (f"mean {stats['mean']:.2f} ± {stats['std']:.2f}, median {stats['median']:.1f}, "
+            f"5-95% [{stats['p5']:.1f}, {stats['p95']:.1f}], range [{stats['min']:.0f}, {stats['max']:.0f}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bee World Simulation (Monte Carlo ensemble)")
+    parser.add_argument("--ensemble", action="store_true", help="Accepted for compatibility with beeworld.py")
+    parser.add_argument("-r", "--replicas", type=int, default=1000, help="Number of independent colonies")
+    parser.add_argument("-b", "--bees", type=int, default=4, help="Worker bees per colony")
+    parser.add_argument("-t", "--timesteps", type=int, default=1500, help="Timesteps per colony")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed for a reproducible ensemble")
+    parser.add_argument("--speed", type=parse_speed, default=UNBOUNDED,
+                        help="Clock speed: max (default), realtime or a factor such as 4x")
+
+    args = parser.parse_args()
+    summary = run_ensemble(args.replicas, args.bees, args.timesteps, args.seed, args.speed)
+
+    print("\n=== ENSEMBLE RUN COMPLETE ===")
+    print(f"Colonies: {summary['replicas']} x {summary['num_red_dots']} bees, {summary['timesteps']} timesteps")
+    print(f"Total nectar per colony: {format_stats(summary['total_nectar'])}")
+    print(f"Cycles completed per colony: {format_stats(summary['cycles_completed'])}")
+    print(f"Nectar per cycle: {format_stats(summary['nectar_per_cycle'])}")
+    print(f"Cycle duration (ticks): {format_stats(summary['cycle_duration'])}")
+    print(f"Wall time: {summary['wall_time']:.2f} seconds")
+    print(f"Seed: {summary['seed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Offscreen video export: renders a headless run on the Agg backend and
+streams the raw RGBA frames into an encoder, with no display, Qt or
+savefig involved.
+
+VideoExporter is an engine observer. After each tick it snapshots the
+world and, at frames_per_tick (0.25 renders every 4th tick, 2 shows each
+tick for two frames), redraws only the moving artists over a cached
+background and hands the canvas buffer to the encoder. With ffmpeg on the
+PATH the frames are piped to an ffmpeg subprocess, which encodes in
+parallel with the simulation; without it (or for an output name ending in
+.png or .npz) they are written to a directory as numbered PNG files or as
+compressed .npz batches of frames.
+"""
+import math
+import os
+import shutil
+import subprocess
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle, Rectangle
+from entities.landscape import FORBIDDEN_ZONE_CENTER, FORBIDDEN_ZONE_RADIUS
+from simulation.shared_state import SEEKING, RETURNING, SETTLED
+from simulation.snapshots import take_snapshot
+from simulation.viewer import STATE_COLORS
+from utils.constants import COLS, ROWS, OFFSET_X, OFFSET_Y
+from visualization.blitting import BlitManager
+from visualization.honeycomb import HoneycombGrid
+from visualization.nectar_colors import darkness_index
+
+# Output frame rate and size (even, as H.264 needs)
+VIDEO_FPS = 30
+VIDEO_WIDTH = 1280
+VIDEO_HEIGHT = 720
+VIDEO_DPI = 100
+# Frames rendered per engine tick
+FRAMES_PER_TICK = 1.0
+# Frames per .npz file in the npz fallback
+NPZ_BATCH = 100
+
+# Bee colors indexed by state code
+_STATE_PALETTE = np.array([STATE_COLORS[state] for state in (SEEKING, RETURNING, SETTLED)])
+
+
+class FFmpegEncoder:
+    """Pipes raw RGBA frames into an ffmpeg subprocess writing an H.264 video"""
+
+    def __init__(self, path, width, height, fps=VIDEO_FPS, ffmpeg=None):
+        self.path = path
+        self.frames = 0
+        command = [ffmpeg or shutil.which("ffmpeg"), "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                   "-an", "-c:v", "libx264", "-pix_fmt", "yuv420p", path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, rgba):
+        self.process.stdin.write(rgba)
+        self.frames += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit code {self.process.returncode} writing {self.path}")
+
+
+class FrameDirectoryEncoder:
+    """
+    Fallback without ffmpeg: numbered PNG files (frame-000001.png, ...) or,
+    with fmt="npz", compressed .npz batches of NPZ_BATCH RGB frames each
+    (frames-000001.npz holds frames 1 to NPZ_BATCH, under the key "frames").
+    """
+
+    def __init__(self, directory, width, height, fmt="png"):
+        if fmt not in ("png", "npz"):
+            raise ValueError(f"Unknown frame format {fmt!r}")
+        self.path = directory
+        self.width = width
+        self.height = height
+        self.fmt = fmt
+        self.frames = 0
+        self._batch = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _image(self, rgba):
+        return np.frombuffer(rgba, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+    def write(self, rgba):
+        self.frames += 1
+        if self.fmt == "png":
+            from PIL import Image
+            Image.frombuffer("RGBA", (self.width, self.height), rgba, "raw", "RGBA", 0, 1).save(
+                os.path.join(self.path, f"frame-{self.frames:06d}.png"), compress_level=1)
+            return
+        self._batch.append(self._image(rgba)[..., :3].copy())
+        if len(self._batch) == NPZ_BATCH:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            first = self.frames - len(self._batch) + 1
+            np.savez_compressed(os.path.join(self.path, f"frames-{first:06d}.npz"), frames=np.stack(self._batch))
+            self._batch = []
+
+    def close(self):
+        self._flush()
+
+
+def open_encoder(path, width, height, fps=VIDEO_FPS):
+    """
+    Encoder for path: run.png or run.npz write PNG or .npz frames to the
+    directory run_frames; any other name is a video for ffmpeg, or PNG
+    frames in that directory if ffmpeg is not installed.
+    """
+    stem, extension = os.path.splitext(path)
+    directory = stem + "_frames"
+    if extension.lower() in (".png", ".npz"):
+        return FrameDirectoryEncoder(directory, width, height, extension.lower()[1:])
+    if shutil.which("ffmpeg"):
+        return FFmpegEncoder(path, width, height, fps)
+    print(f"⚠️ WARNING: ffmpeg not found; writing PNG frames to {directory} instead of {path}")
+    return FrameDirectoryEncoder(directory, width, height, "png")
+
+
+class FrameRenderer:
+    """
+    Agg figure of the landscape (terrain, bees colored by state, nectar and
+    pollen) next to the comb and a status line. The static layers are drawn
+    once; each frame only redraws the artists that changed.
+    """
+
+    def __init__(self, landscape, width=VIDEO_WIDTH, height=VIDEO_HEIGHT, dpi=VIDEO_DPI):
+        self.width = width
+        self.height = height
+        self.max_gold_collected = landscape.max_gold_collected
+        self.figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax, comb_ax = self.figure.subplots(1, 2)
+        self.figure.subplots_adjust(left=0.02, right=0.98, bottom=0.03, top=0.97, wspace=0.05)
+        self.ax = ax
+
+        size = landscape.block_size
+        ax.imshow(landscape.grid.T, cmap="Dark2", extent=[0, size, 0, size])
+        ax.set_xlim(0, size)
+        ax.set_ylim(0, size)
+        ax.set_aspect('equal')
+        ax.set_xticks([])
+        ax.set_yticks([])
+        hive = landscape.objects.beehive
+        if hive:
+            ax.add_patch(Rectangle(hive["position"], hive["width"], hive["height"], color='brown'))
+        pond = landscape.objects.pond
+        if pond:
+            ax.add_patch(Rectangle(pond["position"], pond["width"], pond["height"], color='cornflowerblue'))
+        ax.add_patch(Circle(FORBIDDEN_ZONE_CENTER, FORBIDDEN_ZONE_RADIUS, color='lightgreen'))
+
+        self.silver = ax.scatter(np.empty(0), np.empty(0), s=25, color='silver', linewidths=0, zorder=2)
+        self.nectar = ax.scatter(np.empty(0), np.empty(0), s=60, color='gold', linewidths=0, zorder=2)
+        self.bees = ax.scatter(np.empty(0), np.empty(0), linewidths=0, zorder=3)
+        # Status lines sit inside their axes, where each frame's redraw clears them
+        self.status = ax.text(0.02, 0.97, "", transform=ax.transAxes, va='top', fontsize=11, zorder=4,
+                              bbox=dict(facecolor='white', alpha=0.8, pad=3))
+
+        comb_ax.set_aspect('equal')
+        comb_ax.set_axis_off()
+        comb_ax.set_xlim(-1, COLS * OFFSET_X + 1)
+        comb_ax.set_ylim(-3, ROWS * OFFSET_Y + OFFSET_Y / 2 + 1)
+        self.comb = HoneycombGrid(comb_ax, facecolor=(1.0, 0.99, 0.95, 0.4))
+        self.comb_status = comb_ax.text(0.5, 0.02, "", transform=comb_ax.transAxes, ha='center', va='bottom',
+                                        fontsize=12, color='darkorange', fontweight='bold')
+
+        self.blitter = BlitManager(self.canvas)
+        for artist in (self.silver, self.nectar, self.bees, self.status, self.comb.collection, self.comb_status):
+            self.blitter.add(artist)
+        self.canvas.draw()  # Static layers, cached by the blitter
+        # Points per landscape unit, to draw bee sizes (radii) to scale
+        self.points_per_unit = ax.bbox.width / size * 72.0 / dpi
+
+    def render(self, snapshot):
+        """Draw a snapshot; returns the frame as RGBA bytes (height x width x 4)"""
+        self.bees.set_offsets(snapshot.positions)
+        self.bees.set_sizes((2 * snapshot.sizes * self.points_per_unit) ** 2)
+        self.bees.set_facecolor(_STATE_PALETTE[np.clip(snapshot.states, 0, len(_STATE_PALETTE) - 1)])
+        self.nectar.set_offsets(snapshot.nectar)
+        self.silver.set_offsets(snapshot.silver)
+        self.comb.set_nectar_level(darkness_index(snapshot.current_nectar_total))
+        state = "complete" if snapshot.complete else f"next cycle in {snapshot.remaining_wait:.1f}s" \
+            if snapshot.waiting else "foraging"
+        self.blitter.set_text(self.status, f"Time: {snapshot.seconds:.1f} seconds ({state})")
+        self.blitter.set_text(self.comb_status, f"Nectar in Hive: {snapshot.gold_collected}/"
+                              f"{self.max_gold_collected} (Cycle {snapshot.cycle}) | "
+                              f"Total Nectar: {snapshot.current_nectar_total}")
+        self.blitter.update()
+        return bytes(self.canvas.buffer_rgba())
+
+
+class VideoExporter:
+    """
+    Engine observer rendering frames_per_tick frames per tick into a video
+    file (see open_encoder() for frame directories). Call close() at the
+    end to finish the file. Frames are counted from the engine's tick
+    counter, so a wait the unbounded clock runs as one call still lasts
+    its full length in the video; start_frame is the tick the run starts
+    from (non-zero when resuming).
+    """
+
+    def __init__(self, landscape, path, frames_per_tick=FRAMES_PER_TICK, fps=VIDEO_FPS,
+                 width=VIDEO_WIDTH, height=VIDEO_HEIGHT, start_frame=0):
+        self.renderer = FrameRenderer(landscape, width, height)
+        width, height = self.renderer.canvas.get_width_height()
+        self.encoder = open_encoder(path, width, height, fps)
+        self.frames_per_tick = frames_per_tick
+        self._start_frame = start_frame
+        self._phase = None  # Fraction of a frame the count starts from, set on the first call
+        self.frames_rendered = 0
+
+    @property
+    def frames_written(self):
+        return self.encoder.frames
+
+    def __call__(self, engine, events):
+        if self._phase is None:
+            # Line the frames up so the last tick of the run always gets one
+            total = round(self.frames_per_tick * (engine.max_timesteps - self._start_frame), 9)
+            self._phase = math.ceil(total) - total
+        elapsed = engine.frame_counter - self._start_frame
+        due = int(self._phase + self.frames_per_tick * elapsed + 1e-9) - self.encoder.frames
+        if due < 1:
+            return
+        frame = self.renderer.render(take_snapshot(engine, events))
+        self.frames_rendered += 1
+        for _ in range(due):
+            self.encoder.write(frame)
+
+    def close(self):
+        self.encoder.close()
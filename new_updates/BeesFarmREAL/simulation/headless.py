@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Headless bee simulation: runs the engine as fast as the CPU allows,
+without matplotlib or Qt.
+"""
+import argparse
+import time
+from simulation.input_handlers import interactive_mode, batch_mode
+from simulation.simulation_config import MOVEMENT_BACKEND, SEED
+from simulation.engine import SimulationEngine, create_landscape
+from utils.rng import seed_all, get_rng_service
+from simulation.clock import SimulationClock, UNBOUNDED, parse_speed
+from simulation.shared_state import SharedWorldWriter, DEFAULT_SHARED_NAME
+from simulation.streaming import FrameServer, STREAM_PORT
+from simulation.checkpoint import CheckpointWriter, CHECKPOINT_INTERVAL, resume
+from simulation.recorder import TrajectoryRecorder
+
+
+def run_headless(num_houses, num_red_dots, num_drone_bees, max_timesteps, movement_backend=MOVEMENT_BACKEND,
+                 seed=SEED, speed=UNBOUNDED, replica=0, share=None, stream=None, checkpoint=None,
+                 checkpoint_every=CHECKPOINT_INTERVAL, record=None, record_every=1, video=None,
+                 frames_per_tick=1.0):
+    """
+    Build a world, step it to completion and return the engine summary.
+    Runs with the same seed and different replica numbers are independent.
+    With share set, every frame is published to the shared-memory block of
+    that name for viewers (see simulation.viewer); with stream set, frames
+    are served to TCP clients on that localhost port (see simulation.streaming).
+    With checkpoint set, the run is saved to that file every checkpoint_every
+    ticks and at the end (see simulation.checkpoint). With record set, the
+    trajectory of every record_every-th tick is written to that directory
+    (see simulation.recorder). With video set, the run is rendered offscreen
+    to that file at frames_per_tick frames per tick (see simulation.export).
+    """
+    seed_all(seed, replica=replica)
+    landscape = create_landscape(num_houses, num_red_dots, max_timesteps, movement_backend=movement_backend)
+    engine = SimulationEngine(landscape, max_timesteps=max_timesteps, clock=SimulationClock(speed=speed))
+    params = {'num_houses': num_houses, 'num_red_dots': num_red_dots, 'num_drone_bees': num_drone_bees,
+              'max_timesteps': max_timesteps}
+    return _run(engine, params, share, stream, checkpoint, checkpoint_every, record, record_every, video,
+                frames_per_tick)
+
+
+def resume_headless(path, speed=UNBOUNDED, share=None, stream=None, checkpoint=None,
+                    checkpoint_every=CHECKPOINT_INTERVAL, record=None, record_every=1, video=None,
+                    frames_per_tick=1.0):
+    """Continue a run from a checkpoint file (see run_headless for the options)"""
+    engine, params = resume(path, speed=speed)
+    print(f"💾 Resumed from {path} at timestep {engine.frame_counter}/{engine.max_timesteps}")
+    return _run(engine, params, share, stream, checkpoint, checkpoint_every, record, record_every, video,
+                frames_per_tick)
+
+
+def _run(engine, params, share, stream, checkpoint, checkpoint_every, record, record_every, video,
+         frames_per_tick):
+    writer = None
+    if share:
+        writer = SharedWorldWriter.for_engine(engine, name=share)
+        writer.publish(engine)
+        engine.add_observer(writer)
+        print(f"📡 Publishing world state to shared memory '{writer.name}'")
+
+    server = None
+    if stream is not None:
+        server = FrameServer(port=stream).start()
+        engine.add_observer(server)
+
+    checkpoints = None
+    if checkpoint:
+        checkpoints = CheckpointWriter(checkpoint, params, every=checkpoint_every, start_frame=engine.frame_counter)
+        engine.add_observer(checkpoints)
+
+    recorder = None
+    if record:
+        recorder = TrajectoryRecorder.for_engine(engine, record, every=record_every)
+        engine.add_observer(recorder)
+        print(f"🎞️ Recording the trajectory to {record}")
+
+    exporter = None
+    if video:
+        # Imported here so runs without a video never load matplotlib
+        from simulation.export import VideoExporter
+        exporter = VideoExporter(engine.landscape, video, frames_per_tick=frames_per_tick,
+                                 start_frame=engine.frame_counter)
+        engine.add_observer(exporter)
+        print(f"🎬 Rendering the run to {video} ({frames_per_tick:g} frames per tick)")
+
+    start_time = time.time()
+    try:
+        summary = engine.run()
+    finally:
+        if writer is not None:
+            writer.close()
+        if server is not None:
+            server.stop()
+        if checkpoints is not None:
+            checkpoints.close()
+        if recorder is not None:
+            recorder.close()
+        if exporter is not None:
+            exporter.close()
+            print(f"🎬 {exporter.frames_written} frames written ({exporter.frames_rendered} rendered)")
+    rng_service = get_rng_service()
+    summary['wall_time'] = time.time() - start_time
+    summary['num_drone_bees'] = params['num_drone_bees']
+    summary['seed'] = rng_service.entropy
+    summary['replica'] = rng_service.replica
+    return summary
+
+
+def print_summary(summary):
+    print("\n=== HEADLESS RUN COMPLETE ===")
+    print(f"Timesteps: {summary['timesteps']}/{summary['target_timesteps']}")
+    print(f"Nectar cycles completed: {summary['cycles_completed']}")
+    print(f"Nectar per cycle: {summary['nectar_per_cycle']}")
+    print(f"Total nectar collected: {summary['total_nectar']}")
+    print(f"Simulated time: {summary['simulated_seconds']:.1f} seconds")
+    print(f"Wall time: {summary['wall_time']:.2f} seconds")
+    print(f"Seed: {summary['seed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bee World Simulation (headless)")
+    parser.add_argument("-i", "--interactive", action="store_true", help="Run the program in interactive mode")
+    parser.add_argument("-f", "--terrain", type=str, help="Terrain file for batch mode")
+    parser.add_argument("-p", "--parameters", type=str, help="Parameters file for batch mode")
+    parser.add_argument("--headless", action="store_true", help="Accepted for compatibility with beeworld.py")
+    parser.add_argument("--backend", choices=["python", "vectorized"], default=MOVEMENT_BACKEND,
+                        help="Worker bee movement backend")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed for a reproducible run")
+    parser.add_argument("--speed", type=parse_speed, default=UNBOUNDED,
+                        help="Clock speed: max (default), realtime or a factor such as 4x")
+    parser.add_argument("--share", nargs="?", const=DEFAULT_SHARED_NAME, default=None, metavar="NAME",
+                        help="Publish the world state in shared memory for viewers (beeworld.py --view)")
+    parser.add_argument("--stream", type=int, nargs="?", const=STREAM_PORT, default=None, metavar="PORT",
+                        help="Stream frames to TCP clients on this localhost port (beeworld.py --watch)")
+    parser.add_argument("--checkpoint", type=str, metavar="FILE", help="Save the run to this file periodically")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_INTERVAL, metavar="TICKS",
+                        help="Timesteps between checkpoints")
+    parser.add_argument("--resume", type=str, metavar="FILE", help="Continue the run saved in this checkpoint")
+    parser.add_argument("--record", type=str, metavar="DIR", help="Record the trajectory to .npy segments in DIR")
+    parser.add_argument("--record-every", type=int, default=1, metavar="TICKS",
+                        help="Record every Nth timestep")
+    parser.add_argument("--video", type=str, metavar="FILE",
+                        help="Render the run offscreen to this video file (.png or .npz for frame files)")
+    parser.add_argument("--frames-per-tick", type=float, default=1.0, metavar="RATIO",
+                        help="Video frames per timestep: 0.25 shows every 4th, 2 shows each twice")
+
+    args = parser.parse_args()
+
+    if args.resume:
+        summary = resume_headless(args.resume, args.speed, share=args.share, stream=args.stream,
+                                  checkpoint=args.checkpoint or args.resume, checkpoint_every=args.checkpoint_every,
+                                  record=args.record, record_every=args.record_every, video=args.video,
+                                  frames_per_tick=args.frames_per_tick)
+        print_summary(summary)
+        return
+
+    if args.interactive:
+        num_houses, num_red_dots, num_drone_bees, max_timesteps = interactive_mode()
+    elif args.terrain and args.parameters:
+        num_houses, num_red_dots, num_drone_bees, max_timesteps = batch_mode(args.terrain, args.parameters)
+    else:
+        print("Invalid input. Use -i for interactive mode or -f and -p for batch mode.")
+        return
+
+    summary = run_headless(num_houses, num_red_dots, num_drone_bees, max_timesteps, args.backend, args.seed, args.speed,
+                           share=args.share, stream=args.stream, checkpoint=args.checkpoint,
+                           checkpoint_every=args.checkpoint_every, record=args.record, record_every=args.record_every,
+                           video=args.video, frames_per_tick=args.frames_per_tick)
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
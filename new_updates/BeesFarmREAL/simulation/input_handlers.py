@@ -1,4 +1,5 @@
 import csv
+from simulation.simulation_config import MAX_BEES
 
 def read_para_csv(file_name):
     defaults = {}
@@ -66,33 +67,33 @@ def interactive_mode():
 
     # Interactive input for worker bees (red dots)
     while True:
-        user_input = input(f"How many worker bees (red dots) do you want (1 to 4)? (Batch Mode: {num_red_dots}): ")
+        user_input = input(f"How many worker bees (red dots) do you want (1 to {MAX_BEES})? (Batch Mode: {num_red_dots}): ")
         if user_input == "":
             print(f"Using default value for worker bees: {num_red_dots}")
             break
         try:
             num_red_dots = int(user_input)
-            if 1 <= num_red_dots <= 4:
+            if 1 <= num_red_dots <= MAX_BEES:
                 print(f"You have chosen {num_red_dots} red dots (worker bees).")
                 break
             else:
-                print("Error: Please enter a number between 1 and 4.")
+                print(f"Error: Please enter a number between 1 and {MAX_BEES}.")
         except ValueError:
             print("Invalid input. Please try again.")
 
     # Interactive input for drone bees (black dots)
     while True:
-        user_input = input(f"How many drone bees (black dots) do you want (1 to 4)? (Batch Mode: {num_drone_bees}): ")
+        user_input = input(f"How many drone bees (black dots) do you want (1 to {MAX_BEES})? (Batch Mode: {num_drone_bees}): ")
         if user_input == "":
             print(f"Using default value for drone bees: {num_drone_bees}")
             break
         try:
             num_drone_bees = int(user_input)
-            if 1 <= num_drone_bees <= 4:
+            if 1 <= num_drone_bees <= MAX_BEES:
                 print(f"You have chosen {num_drone_bees} black dots (drone bees).")
                 break
             else:
-                print("Error: Please enter a number between 1 and 4.")
+                print(f"Error: Please enter a number between 1 and {MAX_BEES}.")
         except ValueError:
             print("Invalid input. Please try again.")
 
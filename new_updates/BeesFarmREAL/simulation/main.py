@@ -3,7 +3,6 @@ import matplotlib
 matplotlib.use('Qt5Agg')
 
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import time
 import random
 import numpy as np
@@ -15,15 +14,17 @@ from PyQt5.QtWidgets import QApplication
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 import sys
 import csv
-from simulation.simulation_config import FPS, SCREENSHOT_INTERVAL, WAIT_BETWEEN_CYCLES
+from simulation.simulation_config import FPS, SCREENSHOT_INTERVAL, WAIT_BETWEEN_CYCLES, SEED, SIMULATION_RATE
 from simulation.input_handlers import interactive_mode, batch_mode
-from visualization.hive_view import create_beehive_view, update_nectar_level, update_queen_drone_simulation
-from entities.landscape import Landscape
-from movement.movement import Move
-from utils.helpers import ensure_gold_dots_at_spawn_points, regenerate_nectar, reset_bee_positions
+from visualization.hive_view import create_beehive_view
+from simulation.engine import SimulationEngine, create_landscape
+from utils.rng import seed_all
+from simulation.clock import SimulationClock, parse_speed
 from utils.constants import DEBUG_VERBOSE, COLS, ROWS, OFFSET_X, OFFSET_Y
 from simulation.screenshot import ScreenshotManager
 from simulation.animation import AnimationHandler
+from simulation.snapshots import SnapshotBuffer, SimulationThread
+from simulation.streaming import FrameServer, STREAM_PORT
 from construction.construction_animation import run_construction_animation
 
 # Screenshot configuration
@@ -70,9 +71,18 @@ def main():
     parser.add_argument("-f", "--terrain", type=str, help="Terrain file for batch mode")
     parser.add_argument("-p", "--parameters", type=str, help="Parameters file for batch mode")
     parser.add_argument("--skip-construction", action="store_true", help="Skip the construction phase animation")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed for a reproducible run")
+    parser.add_argument("--speed", type=parse_speed, default=SIMULATION_RATE,
+                        help="Clock speed: realtime, a factor such as 4x, or max")
+    parser.add_argument("--stream", type=int, nargs="?", const=STREAM_PORT, default=None, metavar="PORT",
+                        help="Also stream frames to TCP dashboard clients on this localhost port")
 
     args = parser.parse_args()
 
+    # Seed every random stream before anything is placed
+    rng_service = seed_all(args.seed)
+    print(f"🎲 Random seed: {rng_service.entropy}")
+
     # Create Qt application
     if not QApplication.instance():
         app = QApplication(sys.argv)
@@ -98,9 +108,6 @@ def main():
         max_timesteps += compensation_timesteps
         print(f"Adding {compensation_timesteps} timesteps to compensate for construction phase ({original_timesteps} → {max_timesteps})")
 
-    # Set target timesteps in the update function (for displaying the correct target)
-    update_queen_drone_simulation.target_timesteps = original_timesteps
-
     # Create figure with grid layout for both visualizations
     fig = plt.figure(figsize=(16, 8))
     gs = GridSpec(1, 2, width_ratios=[1, 1])
@@ -131,37 +138,24 @@ def main():
         plt.pause(0.5)  # Brief pause after construction
     
     # NOW setup objects in the environment (after construction)
-    landscape = Landscape(block_size=15, max_gold_collected=20, num_houses=num_houses)
-    
-    # Set max timesteps with compensation for construction time
-    landscape.max_timesteps = max_timesteps
-    # Store original timesteps for reporting
-    landscape.original_timesteps = original_timesteps
+    landscape = create_landscape(num_houses, num_red_dots, max_timesteps, original_timesteps)
     print(f"Simulation will run for {max_timesteps} timesteps (target: {original_timesteps})")
-    
-    landscape.objects.add_beehive(position=(11, 0), height=3, width=3)
-    landscape.objects.add_pond(position=(12, 5), height=5, width=3)
-    landscape.objects.add_red_dots(count=num_red_dots)
-    landscape.objects.add_gold_dots(count=5)
-    landscape.objects.add_silver_dots()
-    
-    # Ensure there's gold nectar (alliance) at each spawn point
-    ensure_gold_dots_at_spawn_points(landscape.objects)
 
-    # Initialize movement logic with obstacle avoidance (pond + forbidden zone)
-    landscape.movement = Move(
-        red_dots=landscape.objects.red_dots,
-        gold_dots=landscape.objects.gold_dots,
-        beehive_position=(11, 2),
-        max_gold_collected=landscape.max_gold_collected,
-        pond_position=(12, 5),
-        pond_size=(3, 5),
-        forbidden_zone_func=landscape.is_inside_forbidden_zone,
-        silver_dots=landscape.objects.silver_dots
-    )
+    # The engine advances the world on a worker thread, paced by its clock; the
+    # GUI only draws the snapshots it publishes
+    engine = SimulationEngine(landscape, max_timesteps=max_timesteps,
+                              target_timesteps=original_timesteps,
+                              clock=SimulationClock(speed=args.speed))
+    snapshots = SnapshotBuffer()
+    simulation_thread = SimulationThread(engine, snapshots)
+    frame_server = None
+    if args.stream is not None:
+        frame_server = FrameServer(port=args.stream).start()
+        engine.add_observer(frame_server)
 
     # NOW show landscape (after construction)
-    landscape.display(fig=fig, subplot_spec=gs[0, 1], title=f"Landscape with {num_red_dots} Worker Bees")
+    landscape.display(fig=fig, subplot_spec=gs[0, 1], title=f"Landscape with {num_red_dots} Worker Bees",
+                      snapshots=snapshots)
     
     print("\n=== MAIN SIMULATION STARTING ===")
     
@@ -171,7 +165,8 @@ def main():
     
     # Initialize animation handler
     animation_handler = AnimationHandler(
-        landscape=landscape,
+        engine=engine,
+        buffer=snapshots,
         circle_markers=circle_markers,
         triangle_markers=triangle_markers,
         square_markers=square_markers,
@@ -182,34 +177,36 @@ def main():
         bee_sizes_text=bee_sizes_text,
         total_nectar_text=total_nectar_text,
         total_box=total_box,
-        screenshot_manager=screenshot_manager,
-        target_timesteps=original_timesteps  # Pass original target timesteps
+        screenshot_manager=screenshot_manager
     )
     
     try:
-        # Create a combined animation
-        ani = animation.FuncAnimation(
-            fig, 
-            animation_handler.update, 
-            frames=999999,
-            interval=1000/FPS,
-            blit=True,
-            repeat=True
-        )
+        # Drive the hive view from a canvas timer; its blitter only redraws
+        # the view when an artist changed (the landscape keeps its own animation)
+        animation_handler.blitter.start(animation_handler.update, interval=1000/FPS)
         
         # Display the combined figure with right plot margin for annotations
         plt.tight_layout()
         
-        # Show the plot with Qt's main loop
+        # Start ticking, then show the plot with Qt's main loop
+        simulation_thread.start()
         plt.show()
         
-        # Stop the screenshot timer when animation ends
-        screenshot_manager.stop_timer()
+        # Stop the simulation and the screenshot timer when the window closes
+        animation_handler.blitter.stop()
+        simulation_thread.stop()
+        screenshot_manager.close()
+        if frame_server is not None:
+            frame_server.stop()
         
     except Exception as e:
+        simulation_thread.stop()
+        screenshot_manager.close()
+        if frame_server is not None:
+            frame_server.stop()
         # Print any error that occurs during animation
         print(f"Error during animation: {e}")
-        print(f"Total nectar collected: {animation_handler.total_nectar_collected}")
+        print(f"Total nectar collected: {engine.total_nectar_collected}")
 
 if __name__ == "__main__":
     main() 
@@ -0,0 +1,168 @@
+"""
+Columnar trajectory recording for analysis.
+
+TrajectoryRecorder is an engine observer that appends one row per tick to
+preallocated .npy memmaps: bee positions, states and sizes, and the nectar
+and silver positions (padded with NaN to a fixed capacity, with their
+counts). Files are written in segments of SEGMENT_TICKS rows and rotated
+when a segment is full, so a run of any length never holds more than one
+segment open and each tick costs a few array copies.
+
+A directory of recordings looks like:
+
+    manifest.json           bee count, capacities and rows per segment
+    frame-00000.npy         (ticks,) engine frame numbers
+    positions-00000.npy     (ticks, bees, 2) float32
+    states-00000.npy        (ticks, bees) int8
+    sizes-00000.npy         (ticks, bees) float32
+    nectar-00000.npy        (ticks, max_nectar, 2) float32, NaN padded
+    nectar_count-00000.npy  (ticks,) int16
+    silver-00000.npy, silver_count-00000.npy   as for nectar
+    ...-00001.npy           the next segment
+
+load_trajectory() maps the segments back and joins them.
+"""
+import json
+import os
+import numpy as np
+from movement.arrays import silver_positions
+from simulation.shared_state import world_arrays
+
+# Rows (ticks) per segment file
+SEGMENT_TICKS = 1000
+# Nectar and silver dots recorded per tick (a cycle spawns a dozen or so)
+MAX_RECORDED_NECTAR = 64
+MAX_RECORDED_SILVER = 64
+
+MANIFEST = "manifest.json"
+
+
+def _segment_path(directory, column, index):
+    return os.path.join(directory, f"{column}-{index:05d}.npy")
+
+
+class TrajectoryRecorder:
+    """
+    Engine observer writing every `every`-th tick to rotating .npy
+    segments in directory (created if needed; an existing recording there
+    is replaced). Call close() at the end to flush and finish the manifest.
+    """
+
+    def __init__(self, directory, num_bees, every=1, segment_ticks=SEGMENT_TICKS,
+                 max_nectar=MAX_RECORDED_NECTAR, max_silver=MAX_RECORDED_SILVER):
+        self.directory = directory
+        self.num_bees = num_bees
+        self.every = every
+        self.segment_ticks = segment_ticks
+        self.columns = {
+            'frame': ((), np.int64),
+            'positions': ((num_bees, 2), np.float32),
+            'states': ((num_bees,), np.int8),
+            'sizes': ((num_bees,), np.float32),
+            'nectar': ((max_nectar, 2), np.float32),
+            'nectar_count': ((), np.int16),
+            'silver': ((max_silver, 2), np.float32),
+            'silver_count': ((), np.int16),
+        }
+        self.segments = []  # Rows written to each finished segment
+        self.segment = None
+        self.row = 0
+        self.ticks_recorded = 0
+        self._warned = False
+
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name == MANIFEST or (name.endswith(".npy") and name.split("-")[0] in self.columns):
+                os.remove(os.path.join(directory, name))
+        self._open_segment()
+
+    @classmethod
+    def for_engine(cls, engine, directory, **kwargs):
+        return cls(directory, len(engine.movement.red_dots), **kwargs)
+
+    def _open_segment(self):
+        index = len(self.segments)
+        self.segment = {}
+        for column, (shape, dtype) in self.columns.items():
+            self.segment[column] = np.lib.format.open_memmap(
+                _segment_path(self.directory, column, index), mode="w+", dtype=dtype,
+                shape=(self.segment_ticks,) + shape)
+        self.row = 0
+
+    def _close_segment(self):
+        for array in self.segment.values():
+            array.flush()
+        self.segments.append(self.row)
+        self.segment = None
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {
+            'num_bees': self.num_bees,
+            'segment_ticks': self.segment_ticks,
+            'segments': self.segments,
+            'columns': {column: [list(shape), np.dtype(dtype).str] for column, (shape, dtype) in self.columns.items()},
+        }
+        with open(os.path.join(self.directory, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=1)
+
+    def __call__(self, engine, events):
+        if engine.frame_counter % self.every == 0 or engine.complete:
+            self.record(engine)
+
+    def record(self, engine):
+        """Append the engine's current state as one row"""
+        if self.segment is None:
+            raise RuntimeError("Recorder is closed")
+        if self.row == self.segment_ticks:
+            self._close_segment()
+            self._open_segment()
+
+        positions, sizes, states, nectar = world_arrays(engine)
+        silver = silver_positions(engine.movement)
+        segment = self.segment
+        row = self.row
+        nectar_count = min(len(nectar), segment['nectar'].shape[1])
+        silver_count = min(len(silver), segment['silver'].shape[1])
+        if not self._warned and (nectar_count < len(nectar) or silver_count < len(silver)):
+            print(f"⚠️ WARNING: Recording only the first {nectar_count} nectar and {silver_count} silver dots")
+            self._warned = True
+
+        segment['frame'][row] = engine.frame_counter
+        segment['positions'][row] = positions
+        segment['states'][row] = states
+        segment['sizes'][row] = sizes
+        segment['nectar'][row, :nectar_count] = nectar[:nectar_count]
+        # Unused slots read as NaN, not as dots at the origin
+        segment['nectar'][row, nectar_count:] = np.nan
+        segment['nectar_count'][row] = nectar_count
+        segment['silver'][row, :silver_count] = silver[:silver_count]
+        segment['silver'][row, silver_count:] = np.nan
+        segment['silver_count'][row] = silver_count
+        self.row += 1
+        self.ticks_recorded += 1
+
+    def close(self):
+        if self.segment is not None:
+            self._close_segment()
+
+
+def load_trajectory(directory, columns=None, mmap=True):
+    """
+    {column: array} of a recording, joined over all segments, keeping only
+    the rows that were written. With mmap the segments are memory-mapped
+    and a single segment is returned without copying.
+    """
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    columns = columns or list(manifest['columns'])
+    result = {}
+    for column in columns:
+        parts = [np.load(_segment_path(directory, column, index), mmap_mode="r" if mmap else None)[:rows]
+                 for index, rows in enumerate(manifest['segments'])]
+        if not parts:
+            shape, dtype = manifest['columns'][column]
+            result[column] = np.zeros([0] + shape, dtype=dtype)
+            continue
+        result[column] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    return result
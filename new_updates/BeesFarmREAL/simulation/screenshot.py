@@ -1,51 +1,136 @@
 import os
+import queue
+import threading
+import numpy as np
 from PyQt5 import QtCore
-from simulation.simulation_config import ENABLE_SCREENSHOTS
+from simulation.simulation_config import ENABLE_SCREENSHOTS, SCREENSHOT_QUEUE_SIZE, SCREENSHOT_WORKERS, \
+    SCREENSHOT_POLICY
+
+SCREENSHOT_DIR = "screenshots"
+
+
+class ScreenshotWriter:
+    """
+    Encodes and saves screenshots on worker threads, so the GUI thread only
+    copies the canvas buffer. Frames wait in a bounded queue; when it is
+    full, policy "drop-oldest" discards the oldest waiting frame and
+    "block" waits for a worker. A frame identical to the previous one is
+    not queued at all.
+    """
+
+    def __init__(self, directory=SCREENSHOT_DIR, workers=SCREENSHOT_WORKERS, queue_size=SCREENSHOT_QUEUE_SIZE,
+                 policy=SCREENSHOT_POLICY):
+        if policy not in ("drop-oldest", "block"):
+            raise ValueError(f"Unknown screenshot queue policy {policy!r}")
+        self.directory = directory
+        self.policy = policy
+        self.queue = queue.Queue(queue_size)
+        self._previous = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.skipped = 0  # Identical to the previous frame
+        os.makedirs(directory, exist_ok=True)
+        self._workers = [threading.Thread(target=self._run, name=f"screenshot-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, filename, rgba, width, height):
+        """Queue RGBA bytes (height x width x 4) to be saved as filename; returns whether it was queued"""
+        if rgba == self._previous:
+            self.skipped += 1
+            return False
+        self._previous = rgba
+        item = (filename, rgba, width, height)
+        if self.policy == "block":
+            self.queue.put(item)
+            return True
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return True
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    with self._lock:
+                        self.dropped += 1
+                except queue.Empty:
+                    pass  # A worker took it first; try again
+
+    def _run(self):
+        from PIL import Image
+
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                filename, rgba, width, height = item
+                image = Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1)
+                image.save(os.path.join(self.directory, filename), compress_level=1)
+                with self._lock:
+                    self.written += 1
+            except OSError as e:
+                print(f"Screenshot error: {e}")
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """Save everything still queued and stop the workers"""
+        for _ in self._workers:
+            self.queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
 
 class ScreenshotManager:
     def __init__(self, fig):
         self.fig = fig
         self.screenshot_counter = 0
         self.screenshot_timer = None
-        
+        self.writer = None
+
     def initialize_timer(self, interval):
         if ENABLE_SCREENSHOTS:
+            self.writer = ScreenshotWriter()
             self.screenshot_timer = QtCore.QTimer()
             self.screenshot_timer.timeout.connect(self.take_screenshot)
             self.screenshot_timer.start(interval)  # milliseconds
-    
+
     def take_screenshot(self):
         # Import here to get the current value, not the value at module import time
         from simulation.simulation_config import SIMULATION_COMPLETE
-        
+
         if not ENABLE_SCREENSHOTS or SIMULATION_COMPLETE:
             self.stop_timer()  # Actively stop the timer when simulation completes
             return
-            
-        # Create screenshots directory if it doesn't exist
-        if not os.path.exists("screenshots"):
-            os.makedirs("screenshots")
-            
-        self.screenshot_counter += 1
-        
+
         # Get the figure canvas (Qt widget)
         canvas = self.fig.canvas
-        
+
         try:
-            # Option 1: Use Qt's grabFramebuffer for a clean screenshot
-            if hasattr(canvas, 'grab'):
-                # For Qt5
-                pixmap = canvas.grab()
-                pixmap.save(f"screenshots/screenshot_{self.screenshot_counter}.png")
-                print(f"Screenshot saved: screenshots/screenshot_{self.screenshot_counter}.png")
-            else:
-                # Option 2: Fallback to matplotlib's savefig
-                self.fig.savefig(f"screenshots/screenshot_{self.screenshot_counter}.png")
-                print(f"Screenshot saved using matplotlib: screenshots/screenshot_{self.screenshot_counter}.png")
+            # Copy what is on screen (the Agg buffer, blitted artists included);
+            # encoding and writing happen on the writer's threads
+            buffer = np.asarray(canvas.buffer_rgba())
+            height, width = buffer.shape[:2]
+            filename = f"screenshot_{self.screenshot_counter + 1}.png"
+            if self.writer.submit(filename, buffer.tobytes(), width, height):
+                self.screenshot_counter += 1
         except Exception as e:
             print(f"Screenshot error: {e}")
-            
+
     def stop_timer(self):
         if self.screenshot_timer and self.screenshot_timer.isActive():
             print("Screenshot timer stopped")
-            self.screenshot_timer.stop() 
\ No newline at end of file
+            self.screenshot_timer.stop()
+
+    def close(self):
+        """Stop taking screenshots and finish writing the queued ones"""
+        self.stop_timer()
+        if self.writer is not None:
+            self.writer.close()
+            print(f"📸 Screenshots: {self.writer.written} saved to {self.writer.directory}/, "
+                  f"{self.writer.skipped} unchanged skipped, {self.writer.dropped} dropped")
+            self.writer = None
@@ -0,0 +1,251 @@
+"""
+World state in shared memory, so viewer and recorder processes can follow a
+running simulation without pickling anything.
+
+One named multiprocessing.shared_memory block holds a small header followed
+by the bee positions, sizes and states, the remaining nectar positions and
+the comb cell levels. The simulation process writes it (SharedWorldWriter,
+usually as an engine observer) and any number of processes map it read-only
+(SharedWorldReader).
+
+Consistency uses a sequence counter (a seqlock): the writer makes the
+counter odd before it writes and even again when it is done, so a reader
+that sees the same even value before and after copying has a whole frame.
+The writer never waits for readers.
+"""
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from movement.arrays import movement_arrays
+from utils.constants import COLS, ROWS
+from visualization.nectar_colors import comb_levels
+
+# Marks the block as bee world state and the layout version readers understand
+MAGIC = b"BEEW"
+VERSION = 1
+# Block name used when none is given
+DEFAULT_SHARED_NAME = "beeworld"
+# Nectar dots the block has room for (a cycle spawns about a dozen)
+MAX_SHARED_NECTAR = 256
+# Seconds between polls while a reader waits for a new frame
+POLL_INTERVAL = 0.005
+# Copies a reader tries before giving up on a writer that keeps overtaking it
+READ_RETRIES = 1000
+
+# Header flags
+COMPLETE = 1  # The simulation reached its timestep limit
+WAITING = 2   # Between nectar cycles
+CLOSED = 4    # The writer has shut down; no more frames will come
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u4'),
+    ('seq', '<u8'),
+    ('frame', '<u8'),
+    ('ticks', '<u8'),
+    ('world_size', '<f8'),
+    ('bee_capacity', '<u4'),
+    ('bee_count', '<u4'),
+    ('nectar_capacity', '<u4'),
+    ('nectar_count', '<u4'),
+    ('rows', '<u4'),
+    ('cols', '<u4'),
+    ('cycle', '<u4'),
+    ('gold_collected', '<u4'),
+    ('total_nectar', '<u4'),
+    ('flags', '<u4'),
+])
+
+# Bee states, the same codes VectorizedMove uses
+SEEKING, RETURNING, SETTLED = 0, 1, 2
+
+
+def _align(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def layout(bee_capacity, nectar_capacity, rows, cols):
+    """
+    Where each array lives in the block: {name: (offset, shape, dtype)} and
+    the total size in bytes. Readers rebuild it from the header.
+    """
+    arrays = [
+        ('positions', (bee_capacity, 2), np.float64),
+        ('sizes', (bee_capacity,), np.float32),
+        ('states', (bee_capacity,), np.int8),
+        ('nectar', (nectar_capacity, 2), np.float64),
+        ('comb', (rows, cols), np.float32),
+    ]
+    offsets = {}
+    offset = _align(HEADER_DTYPE.itemsize)
+    for name, shape, dtype in arrays:
+        offsets[name] = (offset, shape, np.dtype(dtype))
+        offset = _align(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    return offsets, offset
+
+
+def _views(buf, bee_capacity, nectar_capacity, rows, cols):
+    """numpy arrays over the block for every entry of the layout"""
+    offsets, _ = layout(bee_capacity, nectar_capacity, rows, cols)
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            for name, (offset, shape, dtype) in offsets.items()}
+
+
+def world_arrays(engine):
+    """Bee positions, sizes and states and the remaining nectar positions of an engine"""
+    return movement_arrays(engine.movement)
+
+
+class SharedWorldWriter:
+    """
+    Owner of the shared block. publish(engine) copies the current frame in;
+    the writer is also an engine observer, publishing after every tick.
+    Bees or nectar beyond the capacities are left out with a warning.
+    """
+
+    def __init__(self, max_bees, max_nectar=MAX_SHARED_NECTAR, rows=ROWS, cols=COLS, name=DEFAULT_SHARED_NAME,
+                 world_size=15):
+        _, size = layout(max_bees, max_nectar, rows, cols)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        self.arrays = _views(self.shm.buf, max_bees, max_nectar, rows, cols)
+        self._warned = False
+
+        self.header['magic'] = MAGIC
+        self.header['version'] = VERSION
+        self.header['seq'] = 0
+        self.header['world_size'] = world_size
+        self.header['bee_capacity'] = max_bees
+        self.header['nectar_capacity'] = max_nectar
+        self.header['rows'] = rows
+        self.header['cols'] = cols
+
+    @classmethod
+    def for_engine(cls, engine, name=DEFAULT_SHARED_NAME, headroom=2):
+        """Writer sized for an engine's colony, with room for it to grow headroom times"""
+        bees = len(engine.movement.red_dots)
+        return cls(max(1, bees * headroom), name=name, world_size=engine.landscape.block_size)
+
+    def __call__(self, engine, events):
+        self.publish(engine)
+
+    def publish(self, engine):
+        """Write the engine's current frame"""
+        positions, sizes, states, nectar = world_arrays(engine)
+        header = self.header
+        arrays = self.arrays
+        bees = min(len(positions), int(header['bee_capacity']))
+        nectar_count = min(len(nectar), int(header['nectar_capacity']))
+        if not self._warned and (bees < len(positions) or nectar_count < len(nectar)):
+            print(f"⚠️ WARNING: Shared state {self.name} is too small; only {bees} bees "
+                  f"and {nectar_count} nectar dots are published")
+            self._warned = True
+
+        seq = int(header['seq'])
+        header['seq'] = seq + 1  # Odd: frame being written
+        arrays['positions'][:bees] = positions[:bees]
+        arrays['sizes'][:bees] = sizes[:bees]
+        arrays['states'][:bees] = states[:bees]
+        arrays['nectar'][:nectar_count] = nectar[:nectar_count]
+        arrays['comb'][:] = comb_levels(engine.current_nectar_total, int(header['rows']), int(header['cols']))
+        header['frame'] = engine.frame_counter
+        header['ticks'] = engine.clock.ticks
+        header['bee_count'] = bees
+        header['nectar_count'] = nectar_count
+        header['cycle'] = engine.nectar_cycle_count
+        header['gold_collected'] = engine.movement.gold_collected
+        header['total_nectar'] = engine.current_nectar_total
+        header['flags'] = (COMPLETE if engine.complete else 0) | (WAITING if engine.waiting_for_next_cycle else 0)
+        header['seq'] = seq + 2  # Even: frame complete
+
+    def close(self):
+        """Tell readers no more frames will come, then release the block"""
+        seq = int(self.header['seq'])
+        self.header['seq'] = seq + 1
+        self.header['flags'] = int(self.header['flags']) | CLOSED
+        self.header['seq'] = seq + 2
+        del self.header, self.arrays
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedWorldReader:
+    """
+    Read-only mapping of a block published by SharedWorldWriter. read()
+    returns a consistent snapshot dict with copies of the arrays; wait()
+    blocks until the writer publishes a newer frame.
+    """
+
+    def __init__(self, name=DEFAULT_SHARED_NAME):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # Attaching registers the block with this process's resource tracker,
+        # which would unlink it when we exit; it belongs to the writer
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.name = name
+
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if bytes(header['magic']) != MAGIC or int(header['version']) != VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not a version {VERSION} bee world state block")
+        header.flags.writeable = False
+        self.header = header
+        self.arrays = _views(self.shm.buf, int(header['bee_capacity']), int(header['nectar_capacity']),
+                             int(header['rows']), int(header['cols']))
+        for array in self.arrays.values():
+            array.flags.writeable = False
+        self.world_size = float(header['world_size'])
+
+    @property
+    def seq(self):
+        return int(self.header['seq'])
+
+    def read(self):
+        """Consistent snapshot of the latest complete frame"""
+        for _ in range(READ_RETRIES):
+            seq = self.seq
+            if seq % 2:
+                time.sleep(0)  # Writer busy; let it finish
+                continue
+            header = self.header.copy()
+            bees = int(header['bee_count'])
+            nectar = int(header['nectar_count'])
+            snapshot = {
+                'positions': self.arrays['positions'][:bees].copy(),
+                'sizes': self.arrays['sizes'][:bees].copy(),
+                'states': self.arrays['states'][:bees].copy(),
+                'nectar': self.arrays['nectar'][:nectar].copy(),
+                'comb': self.arrays['comb'].copy(),
+            }
+            if self.seq != seq:
+                continue  # Overwritten while copying
+            flags = int(header['flags'])
+            snapshot.update({
+                'seq': seq,
+                'frame': int(header['frame']),
+                'ticks': int(header['ticks']),
+                'cycle': int(header['cycle']),
+                'gold_collected': int(header['gold_collected']),
+                'total_nectar': int(header['total_nectar']),
+                'complete': bool(flags & COMPLETE),
+                'waiting': bool(flags & WAITING),
+                'closed': bool(flags & CLOSED),
+            })
+            return snapshot
+        raise RuntimeError(f"Could not get a consistent frame from {self.name}")
+
+    def wait(self, last_seq, timeout=None):
+        """Wait for a frame newer than last_seq; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            seq = self.seq
+            if seq != last_seq and seq % 2 == 0:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+
+    def close(self):
+        del self.header, self.arrays
+        self.shm.close()
+
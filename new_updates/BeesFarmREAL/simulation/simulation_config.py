@@ -1,11 +1,23 @@
-import matplotlib
-
 # FPS and timing configuration
 FPS = 30  # Animation frames per second
+SIMULATION_SPEED = 1.0 / FPS  # Simulated seconds per tick
+
+# Simulation clock speed: 1.0 is real time, N runs N times faster,
+# None runs unbounded (as fast as the CPU allows)
+SIMULATION_RATE = 1.0
 
 # Wait time between cycles (nectar collection)
 WAIT_BETWEEN_CYCLES = 3  # seconds
 
+# Largest colony the input prompts accept (worker and drone bees each)
+MAX_BEES = 10000
+
+# Worker bee movement backend: "python" (Move) or "vectorized" (VectorizedMove)
+MOVEMENT_BACKEND = "python"
+
+# Random seed for reproducible runs (None draws a fresh one; see utils.rng)
+SEED = None
+
 # Debug settings
 DEBUG_VERBOSE = False  # Set to True for verbose debugging
 
@@ -18,6 +30,9 @@ OFFSET_Y = 0.85
 # Screenshot configuration
 ENABLE_SCREENSHOTS = True  # Set to False to disable screenshots
 SCREENSHOT_INTERVAL = 1000  # Screenshot interval in milliseconds (1 second)
+SCREENSHOT_WORKERS = 2  # Threads encoding and saving screenshots
+SCREENSHOT_QUEUE_SIZE = 8  # Screenshots waiting to be saved before the policy applies
+SCREENSHOT_POLICY = "drop-oldest"  # Full queue: "drop-oldest" discards the oldest, "block" waits
 
 # Global variable to track if simulation is complete
 SIMULATION_COMPLETE = False 
\ No newline at end of file
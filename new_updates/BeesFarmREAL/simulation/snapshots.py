@@ -0,0 +1,142 @@
+"""
+Producer/consumer split for the GUI: the engine ticks on a worker thread
+and publishes immutable snapshots; the FuncAnimation callbacks on the Qt
+thread only read the latest one and push it to the artists. A slow tick no
+longer freezes the window, and repaint time no longer caps the tick rate.
+"""
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from movement.arrays import silver_positions
+from simulation.shared_state import world_arrays
+
+# One frame of the world as the renderers see it. The arrays are private,
+# read-only copies; events are every engine event since the previous take().
+Snapshot = namedtuple('Snapshot', [
+    'frame',                   # engine.frame_counter
+    'seconds',                 # Simulated seconds on the clock
+    'events',                  # frozenset of engine event names
+    'complete',
+    'waiting',                 # Between nectar cycles
+    'remaining_wait',          # Simulated seconds until the next cycle
+    'cycle',                   # Current nectar cycle number
+    'gold_collected',          # Nectar in the hive this cycle
+    'max_gold_collected',
+    'current_nectar_total',    # All cycles including this one
+    'positions',               # (bees, 2) worker bee positions
+    'sizes',                   # (bees,) worker bee sizes
+    'states',                  # (bees,) seeking / returning / settled codes
+    'nectar',                  # (n, 2) positions of the nectar still in the field
+    'silver',                  # (n, 2) positions of the pollen still in the field
+])
+
+
+def _frozen(array, dtype):
+    array = np.array(array, dtype=dtype)  # Always a copy: the engine keeps writing its own
+    array.flags.writeable = False
+    return array
+
+
+def take_snapshot(engine, events=()):
+    """Immutable copy of everything the GUI draws from the engine"""
+    positions, sizes, states, nectar = world_arrays(engine)
+    return Snapshot(
+        frame=engine.frame_counter,
+        seconds=engine.clock.seconds,
+        events=frozenset(events),
+        complete=engine.complete,
+        waiting=engine.waiting_for_next_cycle,
+        remaining_wait=engine.remaining_wait(),
+        cycle=engine.nectar_cycle_count,
+        gold_collected=engine.movement.gold_collected,
+        max_gold_collected=engine.landscape.max_gold_collected,
+        current_nectar_total=engine.current_nectar_total,
+        positions=_frozen(positions, float).reshape(-1, 2),
+        sizes=_frozen(sizes, float),
+        states=_frozen(states, np.int8),
+        nectar=_frozen(nectar, float).reshape(-1, 2),
+        silver=_frozen(silver_positions(engine.movement), float).reshape(-1, 2),
+    )
+
+
+class SnapshotBuffer:
+    """
+    Double buffer between the simulation thread and the GUI thread.
+
+    publish() fills the back slot and swaps it to the front; the reader
+    never sees a half-written frame and the writer never waits for a
+    repaint. take() hands the consumer the front snapshot once, with the
+    events of every snapshot it skipped folded in, so one-off events such
+    as a cycle completing are not lost when the GUI falls behind. peek()
+    returns the front snapshot for secondary views without consuming it.
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._lock = threading.Lock()
+        self._events = set()  # Events published since the last take()
+        self._fresh = False
+        self.published = 0
+        self.taken = 0
+
+    def publish(self, snapshot):
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        with self._lock:
+            self._front = back
+            self._events.update(snapshot.events)
+            self._fresh = True
+            self.published += 1
+
+    def take(self):
+        """The newest snapshot if there is one the consumer has not had yet, else None"""
+        with self._lock:
+            if not self._fresh:
+                return None
+            snapshot = self._slots[self._front]
+            events = frozenset(self._events)
+            self._events.clear()
+            self._fresh = False
+            self.taken += 1
+        if events != snapshot.events:
+            snapshot = snapshot._replace(events=events)
+        return snapshot
+
+    def peek(self):
+        with self._lock:
+            return self._slots[self._front]
+
+
+class SimulationThread(threading.Thread):
+    """
+    Steps the engine on its clock in the background and publishes a
+    snapshot after every tick. Only this thread touches the engine once it
+    has started; the GUI reads the buffer.
+    """
+
+    def __init__(self, engine, buffer):
+        super().__init__(name="simulation", daemon=True)
+        self.engine = engine
+        self.buffer = buffer
+        self._stop_event = threading.Event()
+        engine.add_observer(self._publish)
+        buffer.publish(take_snapshot(engine))
+
+    def _publish(self, engine, events):
+        self.buffer.publish(take_snapshot(engine, events))
+
+    def run(self):
+        engine = self.engine
+        while not engine.complete and not self._stop_event.is_set():
+            engine.clock.wait_for_next_tick()
+            engine.step()
+            if engine.clock.unbounded:
+                time.sleep(0)  # Let the GUI thread have the GIL between ticks
+
+    def stop(self, timeout=1.0):
+        """Ask the thread to finish its tick and exit"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
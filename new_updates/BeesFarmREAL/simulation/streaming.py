@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Live frame streaming for dashboards: an asyncio TCP server on localhost that
+sends a compact binary frame per tick (bee positions, sizes and states, the
+remaining nectar, comb cell levels and the nectar counters) to every
+subscribed client.
+
+The server runs its event loop on its own thread and never blocks the
+simulation: each client has a small queue that drops its oldest frame when
+the client falls behind, and a client can ask for every Nth frame only by
+sending "every N\\n". Run this module (or beeworld.py --watch) to follow a
+stream from the command line.
+
+Every frame is a little-endian uint32 length followed by FRAME_HEADER and
+the arrays: positions (bees, 2) float32, sizes (bees,) float32, states
+(bees,) uint8, nectar (n, 2) float32 and comb (rows, cols) uint8 levels in
+1/255 steps.
+"""
+import argparse
+import asyncio
+import socket
+import struct
+import threading
+import numpy as np
+from utils.constants import COLS, ROWS
+from visualization.nectar_colors import comb_levels
+from simulation.shared_state import COMPLETE, WAITING
+from simulation.snapshots import take_snapshot
+
+# Where the server listens by default (localhost only)
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 8765
+# Frames a client may have queued before its oldest is dropped
+CLIENT_QUEUE_SIZE = 4
+# Kernel send buffer per client: small, so a slow client backs up into its
+# queue (where old frames are dropped) instead of into socket buffers
+SEND_BUFFER_BYTES = 32 * 1024
+# Seconds a client gets to receive its queued frames when the server stops
+FLUSH_TIMEOUT = 1.0
+
+FRAME_MAGIC = b"BEES"
+FRAME_VERSION = 1
+# magic, version, flags, frame, simulated seconds, cycle, nectar in hive,
+# max nectar per cycle, total nectar, bees, nectar dots, comb rows, comb cols
+FRAME_HEADER = struct.Struct("<4sHHQdIIIIIIHH")
+LENGTH = struct.Struct("<I")
+
+
+def encode_frame(snapshot, rows=ROWS, cols=COLS):
+    """Length-prefixed binary frame for a Snapshot"""
+    positions = snapshot.positions.astype('<f4')
+    nectar = snapshot.nectar.astype('<f4')
+    levels = np.clip(np.rint(comb_levels(snapshot.current_nectar_total, rows, cols) * 255), 0, 255).astype(np.uint8)
+    flags = (COMPLETE if snapshot.complete else 0) | (WAITING if snapshot.waiting else 0)
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, flags, snapshot.frame, snapshot.seconds,
+                               snapshot.cycle, snapshot.gold_collected, snapshot.max_gold_collected,
+                               snapshot.current_nectar_total, len(positions), len(nectar), rows, cols)
+    payload = b"".join((header, positions.tobytes(), snapshot.sizes.astype('<f4').tobytes(),
+                        snapshot.states.astype(np.uint8).tobytes(), nectar.tobytes(), levels.tobytes()))
+    return LENGTH.pack(len(payload)) + payload
+
+
+def decode_frame(payload):
+    """Frame dict (the keys SharedWorldReader.read() uses) from a payload without its length prefix"""
+    (magic, version, flags, frame, seconds, cycle, gold_collected, max_gold_collected, total_nectar,
+     bees, nectar_count, rows, cols) = FRAME_HEADER.unpack_from(payload)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError(f"Not a version {FRAME_VERSION} bee world frame")
+
+    offset = FRAME_HEADER.size
+
+    def take(dtype, count, shape):
+        nonlocal offset
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += array.nbytes
+        return array
+
+    return {
+        'frame': frame,
+        'seconds': seconds,
+        'cycle': cycle,
+        'gold_collected': gold_collected,
+        'max_gold_collected': max_gold_collected,
+        'total_nectar': total_nectar,
+        'complete': bool(flags & COMPLETE),
+        'waiting': bool(flags & WAITING),
+        'positions': take('<f4', bees * 2, (bees, 2)),
+        'sizes': take('<f4', bees, (bees,)),
+        'states': take(np.uint8, bees, (bees,)),
+        'nectar': take('<f4', nectar_count * 2, (nectar_count, 2)),
+        'comb': take(np.uint8, rows * cols, (rows, cols)) / 255.0,
+    }
+
+
+class _Client:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        self.every = 1  # Send every Nth frame
+
+
+class FrameServer:
+    """
+    Streams frames to TCP clients from a background event loop.
+
+    The server is an engine observer: after every tick it snapshots and
+    encodes the world once (only while someone is connected) and hands the
+    bytes to the loop thread, which queues them per client.
+    """
+
+    def __init__(self, host=STREAM_HOST, port=STREAM_PORT, queue_size=CLIENT_QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.clients = set()
+        self._handlers = set()  # Connection tasks, waited for on shutdown
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self._loop = None
+        self._stopping = None
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = None
+
+    def start(self):
+        """Start listening; returns once the port is open"""
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name="frame-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        print(f"📡 Streaming frames on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        """Close every connection and stop the loop"""
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+            self._thread.join()
+
+    def __call__(self, engine, events):
+        if self.clients:
+            self.publish(take_snapshot(engine, events))
+
+    def publish(self, snapshot):
+        """Queue a snapshot for every client (from any thread)"""
+        if not self.clients or self._loop is None:
+            return
+        data = encode_frame(snapshot)
+        self._loop.call_soon_threadsafe(self._broadcast, snapshot.frame, snapshot.complete, data)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        except OSError as e:
+            self._error = e  # Raised by start() on the caller's thread
+            self._ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]  # The real port when 0 was asked for
+        self._ready.set()
+        async with server:
+            await self._stopping.wait()
+            # Give the clients a moment to receive what is queued (the final
+            # frame at least), then hang up; abort whoever is still behind
+            flushes = [asyncio.create_task(client.queue.join()) for client in self.clients]
+            if flushes:
+                await asyncio.wait(flushes, timeout=FLUSH_TIMEOUT)
+            for client in list(self.clients):
+                client.writer.close()
+            if self._handlers:
+                await asyncio.wait(self._handlers, timeout=FLUSH_TIMEOUT)
+            for client in list(self.clients):
+                client.writer.transport.abort()
+            if self._handlers:
+                await asyncio.wait(self._handlers)
+            for flush in flushes:
+                flush.cancel()
+
+    async def _handle_client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+        # drain() waits until the frame has reached the kernel
+        writer.transport.set_write_buffer_limits(high=0)
+        client = _Client(writer, self.queue_size)
+        self.clients.add(client)
+        self._handlers.add(asyncio.current_task())
+        sender = asyncio.create_task(self._send(client))
+        try:
+            # The only command: "every N" to receive every Nth frame
+            while line := await reader.readline():
+                command = line.split()
+                if len(command) == 2 and command[0].lower() == b"every" and command[1].isdigit():
+                    client.every = max(1, int(command[1]))
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            self._handlers.discard(asyncio.current_task())
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, client):
+        while True:
+            data = await client.queue.get()
+            try:
+                client.writer.write(data)
+                await client.writer.drain()
+                self.frames_sent += 1
+            except ConnectionError:
+                return
+            finally:
+                client.queue.task_done()
+
+    def _broadcast(self, frame, complete, data):
+        for client in self.clients:
+            # The final frame goes to everyone whatever their rate
+            if frame % client.every and not complete:
+                continue
+            if client.queue.full():
+                # Slow client: drop its oldest frame rather than wait for it
+                client.queue.get_nowait()
+                client.queue.task_done()
+                self.frames_dropped += 1
+            client.queue.put_nowait(data)
+
+
+async def frames(host=STREAM_HOST, port=STREAM_PORT, every=1):
+    """Async iterator over the decoded frames of a stream, until the server closes it"""
+    reader, writer = await asyncio.open_connection(host, port)
+    if every > 1:
+        writer.write(f"every {every}\n".encode())
+        await writer.drain()
+    try:
+        while True:
+            try:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                payload = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return
+            yield decode_frame(payload)
+    finally:
+        writer.close()
+
+
+def main():
+    from simulation.viewer import status_line
+
+    parser = argparse.ArgumentParser(description="Bee World Simulation (frame stream client)")
+    parser.add_argument("--watch", action="store_true", help="Accepted for compatibility with beeworld.py")
+    parser.add_argument("address", nargs="?", default=f"{STREAM_HOST}:{STREAM_PORT}", help="host:port of the stream")
+    parser.add_argument("--every", type=int, default=30, help="Receive every Nth frame")
+
+    args = parser.parse_args()
+    host, _, port = args.address.rpartition(":")
+
+    async def watch():
+        async for frame in frames(host or STREAM_HOST, int(port), args.every):
+            print(status_line(frame))
+            if frame['complete']:
+                break
+
+    asyncio.run(watch())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep: runs many headless simulations in parallel and writes
+one CSV row per run.
+
+Scenarios come either from parameter grids on the command line or from a
+directory of batch-mode files, where every terrain file mapN.csv is paired
+with the parameters file paraN.csv.
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from simulation.input_handlers import read_para_csv, read_map_csv
+from simulation.simulation_config import MOVEMENT_BACKEND, SEED
+
+# Columns of the aggregated results table
+RESULT_FIELDS = [
+    'scenario', 'num_houses', 'num_red_dots', 'num_drone_bees', 'timesteps', 'backend',
+    'replica', 'seed', 'total_nectar', 'cycles_completed', 'mean_nectar_per_cycle',
+    'nectar_per_cycle', 'mean_cycle_duration', 'cycle_durations', 'wall_time',
+]
+
+
+def grid_scenarios(num_houses, num_red_dots, num_drone_bees, timesteps, backends=(MOVEMENT_BACKEND,)):
+    """Every combination of the given parameter lists"""
+    scenarios = []
+    for houses, bees, drones, steps, backend in itertools.product(
+            num_houses, num_red_dots, num_drone_bees, timesteps, backends):
+        scenarios.append({
+            'num_houses': houses,
+            'num_red_dots': bees,
+            'num_drone_bees': drones,
+            'timesteps': steps,
+            'backend': backend,
+        })
+    return scenarios
+
+
+def directory_scenarios(directory, backends=(MOVEMENT_BACKEND,)):
+    """One scenario per mapN.csv / paraN.csv pair in directory"""
+    scenarios = []
+    for terrain_file in sorted(glob.glob(os.path.join(directory, "map*.csv"))):
+        suffix = os.path.basename(terrain_file)[len("map"):]
+        parameters_file = os.path.join(directory, "para" + suffix)
+        if not os.path.exists(parameters_file):
+            print(f"⚠️ No parameters file for {terrain_file}, skipping")
+            continue
+        num_houses, num_red_dots = read_para_csv(parameters_file)
+        num_drone_bees, max_timesteps = read_map_csv(terrain_file)
+        for backend in backends:
+            scenarios.append({
+                'num_houses': num_houses,
+                'num_red_dots': num_red_dots,
+                'num_drone_bees': num_drone_bees,
+                'timesteps': max_timesteps,
+                'backend': backend,
+            })
+    return scenarios
+
+
+def run_task(task):
+    """Worker entry point: one headless run, returned as a results row"""
+    # Imported in the worker so the parent never builds a world
+    from simulation.headless import run_headless
+
+    scenario = task['scenario']
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        summary = run_headless(
+            scenario['num_houses'], scenario['num_red_dots'], scenario['num_drone_bees'],
+            scenario['timesteps'], scenario['backend'], seed=task['seed'], replica=task['replica'])
+
+    nectar = summary['nectar_per_cycle']
+    durations = summary['cycle_durations']
+    row = {'scenario': task['index']}
+    row.update(scenario)
+    row.update({
+        'replica': summary['replica'],
+        'seed': summary['seed'],
+        'total_nectar': summary['total_nectar'],
+        'cycles_completed': summary['cycles_completed'],
+        # Left empty when no cycle completed, even if some nectar was collected
+        'mean_nectar_per_cycle': float(np.mean(nectar)) if nectar else '',
+        'nectar_per_cycle': ";".join(str(n) for n in nectar),
+        'mean_cycle_duration': float(np.mean(durations)) if durations else '',
+        'cycle_durations': ";".join(str(d) for d in durations),
+        'wall_time': round(summary['wall_time'], 4),
+    })
+    return row
+
+
+def run_sweep(scenarios, replicas=1, seed=SEED, workers=None, output_file="sweep_results.csv"):
+    """
+    Run every scenario replicas times across a process pool and write the
+    results table to output_file. All runs share one root seed; replica k of
+    every scenario uses the same streams, so scenarios (and backends) are
+    compared run for run, while the replicas of a scenario are independent.
+    Returns the result rows in scenario/replica order.
+    """
+    # Draw the root seed once so all workers share it
+    root_seed = np.random.SeedSequence(seed).entropy
+    tasks = []
+    for index, scenario in enumerate(scenarios):
+        for replica in range(replicas):
+            tasks.append({
+                'index': index,
+                'scenario': scenario,
+                'seed': root_seed,
+                'replica': replica,
+            })
+
+    print(f"🧪 Sweep: {len(scenarios)} scenarios x {replicas} replicas = {len(tasks)} runs (seed {root_seed})")
+    start_time = time.time()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_task, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            rows.append(row)
+            print(f"✅ Run {done}/{len(tasks)}: scenario {row['scenario']} replica {row['replica']} "
+                  f"-> {row['total_nectar']} nectar in {row['cycles_completed']} cycles")
+
+    rows.sort(key=lambda row: (row['scenario'], row['replica']))
+    with open(output_file, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"📄 Wrote {len(rows)} results to {output_file} in {time.time() - start_time:.1f} seconds")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bee World Simulation (parameter sweep)")
+    parser.add_argument("--sweep", action="store_true", help="Accepted for compatibility with beeworld.py")
+    parser.add_argument("-d", "--directory", type=str, help="Directory of mapN.csv / paraN.csv scenario pairs")
+    parser.add_argument("--houses", type=int, nargs="+", default=[4], help="Values of num_houses")
+    parser.add_argument("--bees", type=int, nargs="+", default=[1], help="Values of num_red_dots")
+    parser.add_argument("--drones", type=int, nargs="+", default=[2], help="Values of num_drone_bees")
+    parser.add_argument("--timesteps", type=int, nargs="+", default=[100], help="Values of timesteps")
+    parser.add_argument("--backend", choices=["python", "vectorized"], nargs="+", default=[MOVEMENT_BACKEND],
+                        help="Worker bee movement backends")
+    parser.add_argument("-r", "--replicas", type=int, default=1, help="Runs per scenario")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=SEED, help="Root seed of the sweep")
+    parser.add_argument("-o", "--output", type=str, default="sweep_results.csv", help="Results CSV file")
+
+    args = parser.parse_args()
+
+    if args.directory:
+        scenarios = directory_scenarios(args.directory, args.backend)
+    else:
+        scenarios = grid_scenarios(args.houses, args.bees, args.drones, args.timesteps, args.backend)
+
+    if not scenarios:
+        print("No scenarios to run.")
+        return
+
+    run_sweep(scenarios, args.replicas, args.seed, args.workers, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import random
+import numpy as np
 
 # Define a function to measure distance between two points
 def distance(p1, p2):
@@ -49,6 +49,13 @@ def check_simulation_completed(frame, landscape):
     # Check if all bees are in the beehive area OR close enough to the beehive
     all_returned = True
     max_distance_threshold = 2.0  # Maximum allowed distance from beehive center
+    
+    # Array-backed movement (VectorizedMove) can answer in one operation
+    if hasattr(landscape.movement, 'bee_positions'):
+        positions = landscape.movement.bee_positions()
+        hive_x, hive_y = movement_beehive_position
+        dist_to_hive = np.hypot(positions[:, 0] - hive_x, positions[:, 1] - hive_y)
+        return bool((dist_to_hive <= max_distance_threshold).all())
         
     for i, dot in enumerate(landscape.objects.red_dots):
         x, y = dot.position
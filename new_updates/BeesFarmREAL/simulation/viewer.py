@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Follow a running simulation through its shared-memory world state
+(see simulation.shared_state). Start the simulation with --share, then run
+as many viewers as you like, each in its own process.
+"""
+import argparse
+import time
+from simulation.shared_state import SharedWorldReader, DEFAULT_SHARED_NAME, SEEKING, RETURNING, SETTLED
+from visualization.nectar_colors import darkness_level, comb_colors
+
+# Bee colors by state
+STATE_COLORS = {SEEKING: (0.85, 0.1, 0.1), RETURNING: (1.0, 0.55, 0.0), SETTLED: (0.4, 0.4, 0.4)}
+# Seconds to wait for a frame before checking the window is still open
+FRAME_TIMEOUT = 0.1
+
+
+def attach(name, timeout):
+    """Reader on the named block, waiting up to timeout seconds for the simulation to create it"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return SharedWorldReader(name)
+        except FileNotFoundError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def status_line(snapshot):
+    state = "complete" if snapshot['complete'] else "waiting" if snapshot['waiting'] else "foraging"
+    return (f"Frame {snapshot['frame']}: cycle {snapshot['cycle']} {state}, "
+            f"{len(snapshot['positions'])} bees, {len(snapshot['nectar'])} nectar left, "
+            f"nectar in hive {snapshot['gold_collected']}, total {snapshot['total_nectar']}")
+
+
+def follow_text(reader, every):
+    """Print a status line every `every` frames until the simulation closes the block"""
+    seq = -1
+    last_frame = None
+    while True:
+        reader.wait(seq)
+        snapshot = reader.read()
+        seq = snapshot['seq']
+        if last_frame is None or snapshot['frame'] - last_frame >= every or snapshot['closed']:
+            print(status_line(snapshot))
+            last_frame = snapshot['frame']
+        if snapshot['closed']:
+            return
+
+
+def follow_plot(reader):
+    """Draw bees, nectar and the comb in a matplotlib window until either side closes"""
+    import matplotlib.pyplot as plt
+
+    fig, (ax, comb_ax) = plt.subplots(1, 2, figsize=(12, 6), gridspec_kw={'width_ratios': [2, 1]})
+    size = reader.world_size
+    ax.set_xlim(0, size)
+    ax.set_ylim(0, size)
+    ax.set_aspect('equal')
+    bees = ax.scatter([], [], s=[], zorder=3)
+    nectar = ax.scatter([], [], s=30, color='gold', zorder=2)
+    title = ax.set_title("")
+    comb_ax.set_axis_off()
+    comb = None
+
+    seq = -1
+    while plt.fignum_exists(fig.number):
+        if reader.wait(seq, timeout=FRAME_TIMEOUT):
+            snapshot = reader.read()
+            seq = snapshot['seq']
+            bees.set_offsets(snapshot['positions'])
+            bees.set_sizes((snapshot['sizes'] * 100) ** 2)
+            bees.set_color([STATE_COLORS.get(int(state), STATE_COLORS[SEEKING]) for state in snapshot['states']])
+            nectar.set_offsets(snapshot['nectar'].reshape(-1, 2))
+            colors = comb_colors(snapshot['comb'], darkness_level(snapshot['total_nectar']))
+            if comb is None:
+                comb = comb_ax.imshow(colors, origin='lower')
+            else:
+                comb.set_data(colors)
+            title.set_text(status_line(snapshot))
+            if snapshot['closed']:
+                title.set_text(status_line(snapshot) + " (finished)")
+                plt.show()
+                return
+        plt.pause(0.001)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bee World Simulation (shared-memory viewer)")
+    parser.add_argument("--view", action="store_true", help="Accepted for compatibility with beeworld.py")
+    parser.add_argument("name", nargs="?", default=DEFAULT_SHARED_NAME, help="Shared state name given to --share")
+    parser.add_argument("--text", action="store_true", help="Print status lines instead of opening a window")
+    parser.add_argument("--every", type=int, default=100, help="Frames between status lines in text mode")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the simulation to start")
+
+    args = parser.parse_args()
+    reader = attach(args.name, args.timeout)
+    try:
+        if args.text:
+            follow_text(reader, args.every)
+        else:
+            follow_plot(reader)
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
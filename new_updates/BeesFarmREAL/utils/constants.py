@@ -15,4 +15,33 @@ FPS = 5  # Frames per second (determines animation interval)
 SIMULATION_SPEED = 1.0/FPS  # Seconds per frame - synchronized with FPS for real-time accuracy
 
 # Define the waiting period between nectar cycles (in seconds)
-WAIT_BETWEEN_CYCLES = 10.0  # Increased from 5 to 10 seconds 
\ No newline at end of file
+WAIT_BETWEEN_CYCLES = 10.0  # Increased from 5 to 10 seconds
+
+# Flower areas where nectar can spawn
+FLOWER_AREAS = [
+    {"position": (4, 7), "width": 3, "height": 3, "name": "Center Flowers"},  # Center flower area
+    {"position": (7, 4), "width": 3, "height": 3, "name": "Right Flowers"},   # Right flowers
+    {"position": (1, 4), "width": 3, "height": 3, "name": "Left Flowers"},    # Left flowers
+    {"position": (7, 11), "width": 3, "height": 3, "name": "Top Flowers"},    # Top flowers
+    {"position": (1, 11), "width": 3, "height": 3, "name": "Upper Left Flowers"}, # Upper left flowers
+]
+
+# Relative positions of the first worker bees inside the hive
+HIVE_PRESET_POSITIONS = [
+    # First row (4 positions)
+    (0.2, 0.2), (0.4, 0.2), (0.6, 0.2), (0.8, 0.2),
+    # Second row (3 positions)
+    (0.3, 0.5), (0.5, 0.5), (0.7, 0.5),
+    # Third row (3 positions)
+    (0.3, 0.8), (0.5, 0.8), (0.7, 0.8)
+]
+# Minimum distance between worker bees spawned beyond the preset positions
+BEE_SPAWN_SPACING = 0.2
+
+# Areas where silver power-ups spawn: (x cells, y cells)
+SILVER_AREAS = [
+    (range(1, 4), range(7, 10)),
+    (range(4, 7), range(10, 14)),  # Area 2
+    (range(7, 10), range(7, 10)),
+    (range(4, 7), range(4, 7)),    # Area 4
+]
@@ -1,25 +1,20 @@
-import random
 import math
 from entities.circle_dot import CircleDot
+from utils.rng import get_stream
 
 def ensure_gold_dots_at_spawn_points(landscape_objects):
     """
     Ensures that nectar is accessible on flowers.
     This function adds additional gold dots to flower areas if necessary to ensure bees can find nectar.
     """
+    rng = get_stream("nectar")
     # If we already have enough gold dots, don't add more
     min_required_dots = 5
     if len(landscape_objects.gold_dots) >= min_required_dots:
         return
         
     # Define flower areas where nectar can spawn
-    flower_areas = [
-        {"position": (4, 7), "width": 3, "height": 3, "name": "Center Flowers"},  # Center flower area
-        {"position": (7, 4), "width": 3, "height": 3, "name": "Right Flowers"},   # Right flowers
-        {"position": (1, 4), "width": 3, "height": 3, "name": "Left Flowers"},    # Left flowers
-        {"position": (7, 11), "width": 3, "height": 3, "name": "Top Flowers"},    # Top flowers
-        {"position": (1, 11), "width": 3, "height": 3, "name": "Upper Left Flowers"}, # Upper left flowers
-    ]
+    flower_areas = landscape_objects.flower_areas()  # Copies: shuffled below
     
     # Define forbidden zone - circular area centered at (5.5, 8.5) with radius 1.5
     forbidden_center_x = 5.5
@@ -32,7 +27,7 @@ def ensure_gold_dots_at_spawn_points(landscape_objects):
         return distance <= forbidden_radius
     
     # Shuffle the flower areas to add randomness
-    random.shuffle(flower_areas)
+    rng.shuffle(flower_areas)
     
     # Count how many more dots we need
     dots_to_add = min_required_dots - len(landscape_objects.gold_dots)
@@ -49,8 +44,8 @@ def ensure_gold_dots_at_spawn_points(landscape_objects):
         max_attempts = 10
         for attempt in range(max_attempts):
             # Generate a random position within the flower area
-            dot_x = x0 + random.randint(0, width-1) + 0.5
-            dot_y = y0 + random.randint(0, height-1) + 0.5
+            dot_x = x0 + rng.randint(0, width-1) + 0.5
+            dot_y = y0 + rng.randint(0, height-1) + 0.5
             
             # Check if this position is in the forbidden zone
             if not is_in_forbidden_zone(dot_x, dot_y):
@@ -68,6 +63,7 @@ def regenerate_nectar(landscape, cycle_count, total_nectar):
     """
     Regenerate nectar for the next collection cycle
     """
+    rng = get_stream("nectar")
     # Clear existing gold dots and reset the counter
     landscape.objects.gold_dots = []
     landscape.movement.gold_dots = []
@@ -80,7 +76,7 @@ def regenerate_nectar(landscape, cycle_count, total_nectar):
     landscape.movement.reset_for_new_cycle()
     
     # Generate new gold dots - increase count for more variety (8-12 dots)
-    nectar_count = random.randint(8, 12)
+    nectar_count = rng.randint(8, 12)
     landscape.objects.add_gold_dots(count=nectar_count)
     
     # Generate new silver dots for this cycle
@@ -106,26 +102,31 @@ def reset_bee_positions(landscape, reset_attributes=False):
     Reset bee positions to near the hive to start a new collection cycle
     If reset_attributes is True, also reset bee size and speed to normal
     """
-    hive_x, hive_y = landscape.objects.beehive["position"]
-    hive_width = landscape.objects.beehive["width"]
-    hive_height = landscape.objects.beehive["height"]
+    reset_bees_around_hive(landscape.objects.red_dots, landscape.objects.beehive, get_stream("placement"),
+                           reset_attributes)
+
+def reset_bees_around_hive(bees, hive, rng, reset_attributes=False):
+    """Line bees up just outside one hive (see reset_bee_positions)"""
+    hive_x, hive_y = hive["position"]
+    hive_width = hive["width"]
+    hive_height = hive["height"]
     
-    for i, bee in enumerate(landscape.objects.red_dots):
+    for i, bee in enumerate(bees):
         # Position just outside the hive with some randomness
-        x_offset = random.uniform(0.5, 1.5)
-        y_offset = random.uniform(0.5, 1.5)
+        x_offset = rng.uniform(0.5, 1.5)
+        y_offset = rng.uniform(0.5, 1.5)
         
         # Position around the hive
         position_side = i % 4  # 0: right, 1: top, 2: left, 3: bottom
         
         if position_side == 0:  # right side
-            bee.position = [hive_x + hive_width + x_offset, hive_y + random.uniform(0, hive_height)]
+            bee.position = [hive_x + hive_width + x_offset, hive_y + rng.uniform(0, hive_height)]
         elif position_side == 1:  # top
-            bee.position = [hive_x + random.uniform(0, hive_width), hive_y + hive_height + y_offset]
+            bee.position = [hive_x + rng.uniform(0, hive_width), hive_y + hive_height + y_offset]
         elif position_side == 2:  # left side
-            bee.position = [hive_x - x_offset, hive_y + random.uniform(0, hive_height)]
+            bee.position = [hive_x - x_offset, hive_y + rng.uniform(0, hive_height)]
         else:  # bottom
-            bee.position = [hive_x + random.uniform(0, hive_width), hive_y - y_offset]
+            bee.position = [hive_x + rng.uniform(0, hive_width), hive_y - y_offset]
             
         # Reset bee attributes if requested
         if reset_attributes and hasattr(bee, 'original_size'):
@@ -136,4 +137,4 @@ def reset_bee_positions(landscape, reset_attributes=False):
             # Reset silver interaction counter to allow growth in the new cycle
             bee.silver_interactions = 0
             
-            print(f"Reset bee #{i+1} attributes to normal (size: {bee.current_size}, speed: {bee.speed_modifier})") 
\ No newline at end of file
+            print(f"Reset bee #{i+1} attributes to normal (size: {bee.current_size}, speed: {bee.speed_modifier})") 
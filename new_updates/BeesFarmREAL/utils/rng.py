@@ -0,0 +1,135 @@
+import zlib
+import numpy as np
+
+# Uniform numbers drawn ahead of time per stream for the scalar hot paths
+BLOCK_SIZE = 1024
+
+
+class RandomStream:
+    """
+    One independent random stream with the subset of the `random` module API
+    the simulation uses (random, uniform, randint, choice, shuffle).
+
+    Scalar draws come from a block of uniforms pre-generated by the
+    underlying numpy Generator, so a Python-level draw is a list pop instead
+    of a Generator call. Vectorized kernels use .generator directly.
+    """
+
+    def __init__(self, generator, block_size=BLOCK_SIZE):
+        self.generator = generator
+        self.block_size = block_size
+        self._block = []
+        self._block_start = None  # Bit generator state the block was drawn from
+
+    def _draw_block(self):
+        self._block_start = self.generator.bit_generator.state
+        # Reversed so pop() hands the numbers out in generation order
+        self._block = self.generator.random(self.block_size).tolist()[::-1]
+
+    def random(self):
+        """Uniform float in [0, 1)"""
+        if not self._block:
+            self._draw_block()
+        return self._block.pop()
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Random integer in [a, b], both included"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, items):
+        """Shuffle a list in place (Fisher-Yates)"""
+        for i in range(len(items) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            items[i], items[j] = items[j], items[i]
+
+    def get_state(self):
+        """
+        JSON-friendly state: the bit generator, plus where the pre-drawn
+        block came from and how much of it is used (the block itself is
+        drawn again on restore)
+        """
+        state = {'bit_generator': self.generator.bit_generator.state}
+        if self._block:
+            state['block_start'] = self._block_start
+            state['block_used'] = self.block_size - len(self._block)
+        return state
+
+    def set_state(self, state):
+        """Continue exactly where get_state() left off (the generator object is kept)"""
+        self._block = []
+        if 'block_start' in state:
+            self.generator.bit_generator.state = state['block_start']
+            self._draw_block()
+            del self._block[len(self._block) - state['block_used']:]
+        self.generator.bit_generator.state = state['bit_generator']
+
+
+class RNGService:
+    """
+    Central source of randomness for one simulation run.
+
+    Every subsystem asks for a named stream ("movement", "placement", ...).
+    Streams are derived from one root SeedSequence with a spawn key made of
+    the replica number and the stream name, so they are independent of each
+    other and of the order in which they are first used, and the same seed
+    always reproduces the same run. Replicas of an ensemble or workers of a
+    sweep each get their own service from spawn_replica().
+    """
+
+    def __init__(self, seed=None, replica=0, block_size=BLOCK_SIZE):
+        root = np.random.SeedSequence(seed)
+        self.entropy = root.entropy  # Pass back as seed to reproduce the run
+        self.replica = replica
+        self.block_size = block_size
+        self.streams = {}
+
+    def stream(self, name):
+        """The RandomStream for a subsystem, created on first use"""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = RandomStream(self.generator_for(name), self.block_size)
+            self.streams[name] = stream
+        return stream
+
+    def generator_for(self, name):
+        """A fresh numpy Generator for (this replica, name)"""
+        sequence = np.random.SeedSequence(self.entropy, spawn_key=(self.replica, zlib.crc32(name.encode())))
+        return np.random.default_rng(sequence)
+
+    def get_state(self):
+        """State of every stream used so far, by name"""
+        return {name: stream.get_state() for name, stream in self.streams.items()}
+
+    def set_state(self, state):
+        """Restore get_state(); streams are created as needed"""
+        for name, stream_state in state.items():
+            self.stream(name).set_state(stream_state)
+
+    def spawn_replica(self, replica):
+        """Service with the same seed but independent streams for another replica"""
+        return RNGService(self.entropy, replica=replica, block_size=self.block_size)
+
+
+_service = RNGService()
+
+
+def seed_all(seed=None, replica=0):
+    """Replace the process-wide service; returns it (see RNGService.entropy)"""
+    global _service
+    _service = RNGService(seed, replica=replica)
+    return _service
+
+
+def get_rng_service():
+    return _service
+
+
+def get_stream(name):
+    """Named stream of the process-wide service"""
+    return _service.stream(name)
@@ -0,0 +1,105 @@
+"""
+Change-driven blitting for the beehive view.
+
+FuncAnimation with blit=True restores and redraws every artist the update
+function returns, every frame, whether or not anything moved; an empty
+return makes it fall back to a full figure redraw. BlitManager keeps the
+registered artists in a set per axes and uses matplotlib's own `stale`
+flag, which every setter (position, visibility, color, radius, text) raises,
+to find the axes that changed since the last frame. Only those axes are
+restored from their background, redrawn and blitted; a frame where nothing
+changed costs nothing. The backgrounds are captured on every full draw.
+"""
+
+
+class BlitManager:
+    """
+    Draws registered (animated) artists on top of cached axes backgrounds.
+    add() artists once, change them freely, then call update() at the end
+    of each frame; start() runs a frame callback from a canvas timer.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._artists = {}  # axes -> artists in drawing (zorder) order
+        self._members = set()
+        self._backgrounds = {}
+        self._timer = None
+        self.frame = 0
+        # Counters for profiling: axes redrawn / frames with nothing to redraw / texts left as they were
+        self.redraws = 0
+        self.frames_skipped = 0
+        self.texts_skipped = 0
+        self._draw_id = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add(self, artist):
+        """Register an artist; adding one that is already registered does nothing"""
+        if artist in self._members:
+            return
+        self._members.add(artist)
+        artist.set_animated(True)  # Left out of full draws, so it is not baked into the background
+        artists = self._artists.setdefault(artist.axes, [])
+        artists.append(artist)
+        artists.sort(key=lambda a: a.get_zorder())  # Stable: equal zorders keep the order they were added in
+        artist.stale = True
+
+    def __contains__(self, artist):
+        return artist in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def set_text(self, text, value):
+        """text.set_text(value) unless it already shows value; returns whether it changed"""
+        if text.get_text() == value:
+            self.texts_skipped += 1
+            return False
+        text.set_text(value)
+        return True
+
+    def _on_draw(self, event):
+        # A full draw (first show, resize, redraw after a layout change) left
+        # the animated artists out: keep the clean backgrounds, then draw them
+        if event is not None and event.canvas is not self.canvas:
+            return
+        for ax, artists in self._artists.items():
+            self._backgrounds[ax] = self.canvas.copy_from_bbox(ax.bbox)
+            self._draw(artists)
+
+    def _draw(self, artists):
+        for artist in artists:
+            artist.axes.draw_artist(artist)
+            # Hidden artists are not drawn, so their flag is cleared here
+            artist.stale = False
+
+    def update(self):
+        """Redraw and blit each axes with a changed artist; returns the artists drawn"""
+        drawn = []
+        for ax, artists in self._artists.items():
+            background = self._backgrounds.get(ax)
+            if background is None or not any(artist.stale for artist in artists):
+                continue
+            self.canvas.restore_region(background)
+            self._draw(artists)
+            self.canvas.blit(ax.bbox)
+            drawn.extend(artists)
+            self.redraws += 1
+        if not drawn:
+            self.frames_skipped += 1
+        return drawn
+
+    def start(self, callback, interval):
+        """Call callback(frame) every interval milliseconds (the callback calls update())"""
+        def step():
+            callback(self.frame)
+            self.frame += 1
+
+        self._timer = self.canvas.new_timer(interval=int(interval))
+        self._timer.add_callback(step)
+        self._timer.start()
+        return self._timer
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
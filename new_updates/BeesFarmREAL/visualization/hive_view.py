@@ -1,16 +1,17 @@
 import matplotlib.pyplot as plt
-import random
 import numpy as np
-from comb.Classhive import CircleMarker, hexagon
+from comb.Classhive import CircleMarker
 from comb import QueenBeeDot, DroneDot
 from utils.constants import HEX_SIZE, COLS, ROWS, OFFSET_X, OFFSET_Y
+from visualization import nectar_colors
+from visualization.honeycomb import HoneycombGrid
+from utils.rng import get_stream
 from construction.construction_phase import initialize_comb_construction, update_comb_construction
 
 # Re-export construction phase functions
 __all__ = [
     'create_beehive_view', 
     'update_nectar_level', 
-    'update_queen_drone_simulation',
     'initialize_comb_construction',
     'update_comb_construction'
 ]
@@ -120,32 +121,16 @@ def create_beehive_visualization(worker_bees=3, drone_bees=3, max_nectar=20, fig
                        color='red', fontweight='bold', fontsize=13,
                        horizontalalignment='center', bbox=dict(facecolor='white', alpha=0.7, pad=3))
     
-    # Draw hexagons to form the honeycomb - starting with very light color
-    # to show absence of nectar
-    hexagon_grid = []
-    for row in range(ROWS):
-        row_hexagons = []
-        for col in range(COLS):
-            x = col * OFFSET_X
-            y = row * OFFSET_Y
-            
-            # Stagger odd columns
-            if col % 2 == 1:
-                y += OFFSET_Y / 2
-                
-            x_hexagon, y_hexagon = hexagon(x, y, HEX_SIZE)
-            # Starting color: extremely light - almost white with just a hint of honey
-            patch = ax.fill(x_hexagon, y_hexagon, edgecolor="black", 
-                          facecolor=(1.0, 0.99, 0.95, 0.4), lw=1)[0]
-            row_hexagons.append(patch)
-        hexagon_grid.append(row_hexagons)
+    # Draw the honeycomb as one collection - starting with very light color
+    # to show absence of nectar: extremely light, almost white with a hint of honey
+    hexagon_grid = HoneycombGrid(ax, facecolor=(1.0, 0.99, 0.95, 0.4))
     
     # Create bee markers (initial positions don't matter - will be updated)
     circle_markers = []
     for _ in range(worker_bees):
         # Random initial position near edge of comb
-        x = random.uniform(0, max_x)
-        y = random.uniform(0, max_y/4)  # Start at bottom quarter
+        x = get_stream("hive").uniform(0, max_x)
+        y = get_stream("hive").uniform(0, max_y/4)  # Start at bottom quarter
         
         # Create a marker representing a bee
         circle_marker = CircleMarker(x, y, radius=0.1, color='red')  # Match original radius
@@ -166,8 +151,8 @@ def create_beehive_visualization(worker_bees=3, drone_bees=3, max_nectar=20, fig
         queen_bee = QueenBeeDot()
         
         # Position queen in center of hive (around 7.5, 7.5 in QueenBeeDot coordinates)
-        queen_bee.position_x = 7.5 + random.uniform(-1.0, 1.0)  # Center with small variation
-        queen_bee.position_y = 7.5 + random.uniform(-1.0, 1.0)
+        queen_bee.position_x = 7.5 + get_stream("hive").uniform(-1.0, 1.0)  # Center with small variation
+        queen_bee.position_y = 7.5 + get_stream("hive").uniform(-1.0, 1.0)
         
         # Map to beehive coordinates
         qx, qy = map_to_beehive(queen_bee.position_x, queen_bee.position_y, max_x, max_y)
@@ -190,8 +175,8 @@ def create_beehive_visualization(worker_bees=3, drone_bees=3, max_nectar=20, fig
             drone = DroneDot()
             
             # Position drones around center too, but slightly more spread out than queen
-            drone.position_x = 7.5 + random.uniform(-2.0, 2.0)
-            drone.position_y = 7.5 + random.uniform(-2.0, 2.0)
+            drone.position_x = 7.5 + get_stream("hive").uniform(-2.0, 2.0)
+            drone.position_y = 7.5 + get_stream("hive").uniform(-2.0, 2.0)
             
             drones.append(drone)
             
@@ -230,22 +215,6 @@ def map_to_beehive(x, y, max_x, max_y):
     mapped_y = (y / 20) * max_y
     return mapped_x, mapped_y
 
-def update_queen_drone_simulation():
-    """Update the simulation of queen, drone, and baby bees in the hive"""
-    # Note: If this function is imported at the top level, frame_counter stays in memory between calls
-    if not hasattr(update_queen_drone_simulation, 'frame_counter'):
-        update_queen_drone_simulation.frame_counter = 0
-        update_queen_drone_simulation.max_timesteps = 100  # Default max timesteps
-        update_queen_drone_simulation.target_timesteps = 100  # For display
-    
-    # Just increment the counter each time this function is called
-    update_queen_drone_simulation.frame_counter += 1
-    
-    if update_queen_drone_simulation.frame_counter >= update_queen_drone_simulation.max_timesteps:
-        return True  # Simulation complete
-    
-    return False  # Simulation continues
-
 def distance_between(p1, p2):
     """Calculate Euclidean distance between two points"""
     return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
@@ -256,7 +225,7 @@ def update_nectar_level(hexagon_grid, current_nectar, max_nectar_per_cycle, tota
     The color darkens progressively using an exponential function for faster darkening.
     
     Parameters:
-    - hexagon_grid: The grid of hexagon patches
+    - hexagon_grid: The HoneycombGrid of the comb
     - current_nectar: Current nectar amount collected in this cycle
     - max_nectar_per_cycle: Maximum nectar that can be collected in one cycle
     - total_nectar: Total nectar collected across all cycles
@@ -266,15 +235,8 @@ def update_nectar_level(hexagon_grid, current_nectar, max_nectar_per_cycle, tota
     # Update the nectar status text to show current cycle info
     nectar_status.set_text(f"Nectar in Hive: {current_nectar}/{max_nectar_per_cycle} (Cycle {cycle_count})")
     
-    # For color calculation, reduce max_expected_nectar to see changes sooner
-    # With 20 nectar per cycle, we'll see significant darkening after just 1 cycle
-    max_expected_nectar = 30  # Lower threshold for faster visual feedback
-    
-    # Calculate the darkness level (0 to 1) using an exponential function
-    # This will make the darkness increase more dramatically at first
-    linear_ratio = min(1.0, total_nectar / max_expected_nectar)
-    exponent = 2.5  # Increased from 2.0 for even faster darkening
-    darkness_level = 1.0 - (1.0 - linear_ratio) ** exponent
+    # Darkness (0 to 1) grows exponentially with the total, so the comb darkens fast at first
+    darkness_level = nectar_colors.darkness_level(total_nectar)
     
     # Only print debug info very occasionally to reduce noise
     # Use a static variable to track when we last printed
@@ -289,50 +251,9 @@ def update_nectar_level(hexagon_grid, current_nectar, max_nectar_per_cycle, tota
         print(f"[NECTAR] Total: {total_nectar}, Darkness: {darkness_level:.2f}, Exponential function applied")
         update_nectar_level._last_printed_nectar = total_nectar
     
-    # Calculate color based on nectar level - MUCH more dramatic shift from light to dark gold
-    # Start with a very light color (r=1.0, g=0.98, b=0.9)
-    # End with rich golden amber (r=1.0, g=0.55, b=0.0)
-    r = 1.0  # Red stays at max for golden appearance
-    g = 0.98 - (0.43 * darkness_level)  # Green decreases more dramatically for richer gold
-    b = 0.9 - (0.9 * darkness_level)    # Blue decreases to zero completely
-    
-    # Add some alpha to make it look richer when filled
-    alpha = 0.75 + (0.25 * darkness_level)  # Slightly higher base alpha for richer appearance
-    
-    # Center coordinates for radial gradient
-    center_col = COLS / 2
-    center_row = ROWS / 2
-    
-    # Maximum distance from center for normalization
-    max_distance = ((COLS/2)**2 + (ROWS/2)**2)**0.5
-    
-    # Apply different darkness levels based on row position and distance from center
-    for row_idx in range(ROWS):
-        row = hexagon_grid[row_idx]
-        
-        # Apply gradient effect - bottom rows and center cells darker
-        # Apply exponential gradient from bottom to top
-        row_factor = 1.0 - (row_idx / ROWS) ** 1.5  # Steeper gradient (1.0 to ~0.2)
-        
-        for col_idx, hex_patch in enumerate(row):
-            # Calculate distance from center
-            dist_from_center = ((col_idx - center_col)**2 + (row_idx - center_row)**2)**0.5
-            # Normalize to 0-1 range and invert (center = 1, edges = 0)
-            center_factor = 1.0 - (dist_from_center / max_distance) ** 1.2  # Exponential falloff from center
-            
-            # Combine row gradient and center gradient
-            # Weight the center gradient more (60% center, 40% row gradient)
-            combined_factor = 0.4 * row_factor + 0.6 * center_factor
-            
-            # Apply the combined factor to the darkness
-            cell_darkness = darkness_level * combined_factor
-            
-            # Cell-specific color with dramatic contrast
-            cell_g = 0.98 - (0.43 * cell_darkness)  # Green decreases
-            cell_b = 0.9 - (0.9 * cell_darkness)   # Blue decreases completely
-            
-            # Set color for this hexagon
-            hex_patch.set_facecolor((r, cell_g, cell_b, alpha))
+    # Bottom rows and center cells darker, from light cream to rich golden amber
+    # (precomputed per darkness step; the comb is only touched when the step changes)
+    hexagon_grid.set_nectar_level(nectar_colors.darkness_index(total_nectar))
 
 def save_image(fig, filename):
     """Save the current figure as an image"""
@@ -0,0 +1,117 @@
+"""
+The honeycomb as a single PolyCollection.
+
+All cells are one artist with a (rows * cols, 4) facecolor array, so the
+comb draws in one call and a full recolor is one array assignment. The
+grid still indexes like the old list of patches, hexagon_grid[row][col],
+returning a lightweight cell whose set_facecolor() writes its own row of
+the color array; code that colors a few cells at a time keeps working.
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from utils.constants import HEX_SIZE, COLS, ROWS, OFFSET_X, OFFSET_Y
+from visualization.nectar_colors import color_table
+
+# Corners of a unit hexagon, closed (the same points hexagon() draws)
+_UNIT_HEXAGON = np.column_stack([np.cos(np.linspace(0, 2 * np.pi, 7)), np.sin(np.linspace(0, 2 * np.pi, 7))])
+
+
+def cell_centers(rows=ROWS, cols=COLS):
+    """(rows, cols, 2) centers of the comb cells; odd columns are staggered up half a cell"""
+    row_idx, col_idx = np.mgrid[0:rows, 0:cols].astype(float)
+    x = col_idx * OFFSET_X
+    y = row_idx * OFFSET_Y + (col_idx % 2) * (OFFSET_Y / 2)
+    return np.stack([x, y], axis=-1)
+
+
+def cell_vertices(rows=ROWS, cols=COLS, size=HEX_SIZE):
+    """(rows * cols, 7, 2) hexagon outlines of every cell, row by row"""
+    return cell_centers(rows, cols).reshape(-1, 1, 2) + size * _UNIT_HEXAGON
+
+
+class _CombCell:
+    """One cell of a HoneycombGrid, standing in for its old polygon patch"""
+
+    def __init__(self, grid, index):
+        self._grid = grid
+        self._index = index
+
+    def set_facecolor(self, color):
+        self._grid.colors[self._index] = to_rgba(color)
+        self._grid.nectar_level = None
+        self._grid.apply()
+
+    def get_facecolor(self):
+        return tuple(self._grid.colors[self._index])
+
+
+class _CombRow:
+    def __init__(self, grid, row):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self):
+        return self._grid.cols
+
+    def __getitem__(self, col):
+        col = range(self._grid.cols)[col]  # Negative indices and IndexError as for a list
+        return _CombCell(self._grid, self._row * self._grid.cols + col)
+
+    def __iter__(self):
+        return (self[col] for col in range(self._grid.cols))
+
+
+class HoneycombGrid:
+    """
+    Comb cells drawn as one PolyCollection on ax. Index it as
+    grid[row][col] for single cells, or pass a (rows, cols, 4) array to
+    set_facecolors() to recolor the whole comb at once.
+
+    set_nectar_level() colors the comb from the quantized color table and
+    leaves the artist alone when the level has not changed; the
+    recolors/recolors_skipped counters show how often that happens.
+    """
+
+    def __init__(self, ax, facecolor, rows=ROWS, cols=COLS, size=HEX_SIZE, edgecolor="black", lw=1):
+        self.rows = rows
+        self.cols = cols
+        # One RGBA row per cell, even while they are all the same
+        self.colors = np.tile(to_rgba(facecolor), (rows * cols, 1))
+        self.collection = PolyCollection(cell_vertices(rows, cols, size), facecolors=self.colors,
+                                         edgecolors=edgecolor, linewidths=lw)
+        ax.add_collection(self.collection)
+        ax.autoscale_view()
+        self.nectar_level = None  # Color table row on display, None once cells are colored by hand
+        self.recolors = 0
+        self.recolors_skipped = 0
+
+    def set_nectar_level(self, index):
+        """Show row index of the nectar color table; returns whether the comb changed"""
+        if index == self.nectar_level:
+            self.recolors_skipped += 1
+            return False
+        self.set_facecolors(color_table(self.rows, self.cols)[index])
+        self.nectar_level = index
+        self.recolors += 1
+        return True
+
+    def set_facecolors(self, colors):
+        """Recolor every cell from a (rows, cols, 4) or (rows * cols, 4) RGBA array"""
+        self.colors[...] = np.reshape(colors, (-1, 4))
+        self.nectar_level = None
+        self.apply()
+
+    def apply(self):
+        """Hand the color array to the collection after changing it"""
+        self.collection.set_facecolor(self.colors)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        row = range(self.rows)[row]
+        return _CombRow(self, row)
+
+    def __iter__(self):
+        return (self[row] for row in range(self.rows))
@@ -0,0 +1,73 @@
+from functools import lru_cache
+import numpy as np
+from utils.constants import COLS, ROWS
+
+# Total nectar at which the comb is drawn fully dark (low for quick visual feedback)
+MAX_EXPECTED_NECTAR = 30
+# Exponent of the darkening curve: higher darkens faster at first
+DARKNESS_EXPONENT = 2.5
+# Distinct darkness steps the comb is drawn with (the color table has one more, for empty)
+DARKNESS_STEPS = 64
+
+
+def darkness_level(total_nectar):
+    """Overall comb darkness (0 to 1) for the total nectar collected"""
+    linear_ratio = min(1.0, total_nectar / MAX_EXPECTED_NECTAR)
+    return 1.0 - (1.0 - linear_ratio) ** DARKNESS_EXPONENT
+
+
+@lru_cache(maxsize=None)
+def darkness_index(total_nectar, steps=DARKNESS_STEPS):
+    """darkness_level() quantized to a row of color_table()"""
+    return int(round(darkness_level(total_nectar) * steps))
+
+
+@lru_cache(maxsize=None)
+def cell_factors(rows=ROWS, cols=COLS):
+    """
+    Share of the overall darkness each comb cell gets, as a (rows, cols)
+    array: bottom rows and cells near the center fill first. Computed once
+    per comb size; the array is shared, so it is read-only.
+    """
+    row_idx, col_idx = np.mgrid[0:rows, 0:cols].astype(float)
+    row_factor = 1.0 - (row_idx / rows) ** 1.5
+    max_distance = ((cols / 2) ** 2 + (rows / 2) ** 2) ** 0.5
+    dist_from_center = np.hypot(col_idx - cols / 2, row_idx - rows / 2)
+    center_factor = 1.0 - (dist_from_center / max_distance) ** 1.2
+    # 60% center gradient, 40% row gradient
+    factors = 0.4 * row_factor + 0.6 * center_factor
+    factors.flags.writeable = False
+    return factors
+
+
+def comb_levels(total_nectar, rows=ROWS, cols=COLS):
+    """Fill level (0 to 1) of every comb cell, as a (rows, cols) float array"""
+    return darkness_level(total_nectar) * cell_factors(rows, cols)
+
+
+def comb_colors(levels, darkness):
+    """
+    RGBA colors (rows, cols, 4) for cell levels: very light cream
+    (1.0, 0.98, 0.9) when empty to golden amber (1.0, 0.55, 0.0) when full,
+    more opaque as the whole comb darkens.
+    """
+    levels = np.asarray(levels, dtype=float)
+    colors = np.empty(levels.shape + (4,))
+    colors[..., 0] = 1.0
+    colors[..., 1] = 0.98 - 0.43 * levels
+    colors[..., 2] = 0.9 - 0.9 * levels
+    colors[..., 3] = 0.75 + 0.25 * darkness
+    return colors
+
+
+@lru_cache(maxsize=None)
+def color_table(rows=ROWS, cols=COLS, steps=DARKNESS_STEPS):
+    """
+    Read-only (steps + 1, rows, cols, 4) RGBA lookup table: row i holds the
+    colors of every cell at darkness i / steps, so a recolor is one lookup.
+    """
+    darkness = np.linspace(0.0, 1.0, steps + 1)
+    levels = darkness[:, None, None] * cell_factors(rows, cols)
+    table = comb_colors(levels, darkness[:, None, None])
+    table.flags.writeable = False
+    return table